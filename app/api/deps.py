@@ -1,19 +1,67 @@
 import uuid
 
-from fastapi import Depends, Query
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Depends, Header, Query
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.db import get_session
-from app.core.errors import NotFound
+from app.core.db import get_session, get_session_factory
+from app.core.errors import Forbidden, NotFound, Unauthorized
+from app.core.settings import settings
+from app.core.tokens import Principal, decode_token, principal_from_claims
 from app.models.user import User
-from app.repositories.users import get_user_by_id
+from app.services.tokens import is_token_revoked
+from app.services.user_identity import user_identity_cache
+
+
+def bearer_token(authorization: str | None) -> str | None:
+    if authorization is None:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        raise Unauthorized("AUTH_TOKEN_INVALID", "Invalid token")
+    return token.strip()
+
+
+async def get_principal(
+    user_id: uuid.UUID | None = Query(None),
+    authorization: str | None = Header(None),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+) -> Principal:
+    """Resolve the caller from a bearer access token without touching the database.
+
+    Only when ``ALLOW_USER_ID_AUTH`` is on (local development, tests) do requests without a token fall
+    back to the unauthenticated ``user_id`` query parameter, resolved through the per-process user
+    identity cache. Any lookup uses its own short-lived session, so long-lived responses (SSE) do not
+    pin a pooled connection.
+    """
+    token = bearer_token(authorization)
+    if token is not None:
+        claims = decode_token(token, "access")
+        if settings.TOKEN_REVOCATION_CHECK:
+            async with session_factory() as session:
+                revoked = await is_token_revoked(session, claims["jti"])
+            if revoked:
+                raise Unauthorized("AUTH_TOKEN_REVOKED", "Token revoked")
+        principal = principal_from_claims(claims)
+        if user_id is not None and user_id != principal.id:
+            raise Forbidden("AUTH_USER_MISMATCH", "user_id does not match the access token")
+        return principal
+
+    if not settings.ALLOW_USER_ID_AUTH:
+        raise Unauthorized("UNAUTHORIZED", "Missing access token")
+    if user_id is None:
+        raise Unauthorized("UNAUTHORIZED", "Missing access token or user_id")
+    async with session_factory() as session:
+        identity = await user_identity_cache.get(session, user_id)
+    if not identity:
+        raise NotFound("USER_NOT_FOUND", "User not found")
+    return Principal(id=identity.id, user_type=identity.user_type)
 
 
 async def get_user_by_id_param(
-    user_id: uuid.UUID = Query(...),
+    principal: Principal = Depends(get_principal),
     session: AsyncSession = Depends(get_session),
 ) -> User:
-    user = await get_user_by_id(session, user_id)
+    user = await session.get(User, principal.id)
     if not user:
         raise NotFound("USER_NOT_FOUND", "User not found")
     return user
@@ -1,12 +1,14 @@
 from app.api.routers import (
     admin_jobs,
     auth,
+    calendar,
     dashboard,
     device_tokens,
     groups,
     lessons,
     managers,
     materials,
+    metrics,
     notifications,
     payments,
     students,
@@ -24,4 +26,6 @@ __all__ = [
     "device_tokens",
     "managers",
     "admin_jobs",
+    "metrics",
+    "calendar",
 ]
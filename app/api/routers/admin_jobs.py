@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_session
-from app.services.lessons import generate_lessons
+from app.services.daily_metrics import refresh_daily_metrics
+from app.services.lessons import generate_lessons_report
 from app.services.notifications import enqueue_lesson_reminders
 
 router = APIRouter(tags=["admin_jobs"])
@@ -11,10 +12,10 @@ router = APIRouter(tags=["admin_jobs"])
 @router.post("/admin/jobs/generate-lessons")
 async def generate_lessons_job(
     days: int = 30,
+    method: str = "values",
     session: AsyncSession = Depends(get_session),
 ):
-    created = await generate_lessons(session, days=days, actor_user_id=None)
-    return {"created": created}
+    return await generate_lessons_report(session, days=days, method=method)
 
 
 @router.post("/admin/jobs/enqueue-reminders")
@@ -23,3 +24,13 @@ async def enqueue_reminders_job(
 ):
     created = await enqueue_lesson_reminders(session)
     return {"created": created}
+
+
+@router.post("/admin/jobs/refresh-dashboard-rollups")
+async def refresh_dashboard_rollups_job(
+    timezone: str | None = None,
+    full: bool = False,
+    session: AsyncSession = Depends(get_session),
+):
+    updated = await refresh_daily_metrics(session, tz_name=timezone, full=full)
+    return {"updated": updated}
@@ -1,13 +1,22 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_user_by_id_param
+from app.api.deps import bearer_token, get_principal, get_user_by_id_param
 from app.core.db import get_session
-from app.schemas.auth import CheckUserRequest, CheckUserResponse, LoginRequest, RegisterParentRequest
+from app.schemas.auth import (
+    CheckUserRequest,
+    CheckUserResponse,
+    LoginRequest,
+    LoginResponse,
+    RefreshRequest,
+    RegisterParentRequest,
+    TokenPairOut,
+)
 from app.schemas.course import UserCourseOut
 from app.schemas.user import UserMeResponse
 from app.services.auth import check_user_exists, login, register_parent
 from app.services.groups import list_user_courses
+from app.services.tokens import issue_tokens, refresh_tokens, revoke_tokens
 
 router = APIRouter(tags=["auth"])
 
@@ -47,7 +56,7 @@ async def register(payload: RegisterParentRequest, session: AsyncSession = Depen
     )
 
 
-@router.post("/auth/login", response_model=UserMeResponse)
+@router.post("/auth/login", response_model=LoginResponse)
 async def login_route(payload: LoginRequest, session: AsyncSession = Depends(get_session)):
     user = await login(
         session,
@@ -55,7 +64,8 @@ async def login_route(payload: LoginRequest, session: AsyncSession = Depends(get
         phone=payload.phone,
         password=payload.password,
     )
-    return UserMeResponse(
+    return LoginResponse(
+        **issue_tokens(user.id, user.user_type),
         id=user.id,
         email=user.email,
         phone=user.phone,
@@ -72,6 +82,21 @@ async def login_route(payload: LoginRequest, session: AsyncSession = Depends(get
     )
 
 
+@router.post("/auth/refresh", response_model=TokenPairOut)
+async def refresh_route(payload: RefreshRequest, session: AsyncSession = Depends(get_session)):
+    return TokenPairOut(**await refresh_tokens(session, payload.refresh_token))
+
+
+@router.post("/auth/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_route(
+    payload: RefreshRequest,
+    authorization: str | None = Header(None),
+    session: AsyncSession = Depends(get_session),
+):
+    await revoke_tokens(session, payload.refresh_token, bearer_token(authorization))
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
 @router.post("/auth/check-user", response_model=CheckUserResponse)
 async def check_user_route(payload: CheckUserRequest, session: AsyncSession = Depends(get_session)):
     user = await check_user_exists(session, payload.email, payload.phone)
@@ -104,5 +129,5 @@ async def me(user=Depends(get_user_by_id_param)):
 
 
 @router.get("/me/courses", response_model=list[UserCourseOut])
-async def my_courses(user=Depends(get_user_by_id_param), session: AsyncSession = Depends(get_session)):
+async def my_courses(user=Depends(get_principal), session: AsyncSession = Depends(get_session)):
     return await list_user_courses(session, user)
@@ -0,0 +1,82 @@
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.deps import get_principal, get_user_by_id_param
+from app.core.db import get_session, get_session_factory
+from app.core.settings import settings
+from app.core.tokens import Principal
+from app.schemas.calendar import CalendarMonthOut, CalendarTokenOut
+from app.services.calendar import (
+    calendar_feed_validators,
+    get_calendar_feed_user,
+    get_month_calendar,
+    issue_calendar_token,
+    iter_calendar_ics,
+)
+from app.utils.time import now_tz
+
+router = APIRouter(tags=["calendar"])
+
+
+@router.get("/calendar/month", response_model=CalendarMonthOut)
+async def calendar_month(
+    year: int | None = None,
+    month: int | None = None,
+    user=Depends(get_principal),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+):
+    now = now_tz()
+    year = year if year is not None else now.year
+    month = month if month is not None else now.month
+    lessons = await get_month_calendar(session_factory, user, year, month)
+    return CalendarMonthOut(year=year, month=month, timezone=settings.TIMEZONE, lessons=lessons)
+
+
+@router.post("/calendar/token", response_model=CalendarTokenOut)
+async def issue_calendar_token_route(
+    user=Depends(get_user_by_id_param),
+    session: AsyncSession = Depends(get_session),
+):
+    token = await issue_calendar_token(session, user)
+    return CalendarTokenOut(token=token, path=f"{settings.API_PREFIX}/calendar/{token}.ics")
+
+
+def _not_modified(request: Request, etag: str, last_modified) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag in {tag.strip() for tag in if_none_match.split(",")} or if_none_match.strip() == "*"
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+@router.get("/calendar/{token}.ics")
+async def calendar_ics(
+    token: str,
+    request: Request,
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+):
+    async with session_factory() as session:
+        user = await get_calendar_feed_user(session, token)
+        etag, last_modified = await calendar_feed_validators(session, user)
+
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified.astimezone(timezone.utc), usegmt=True),
+        "Cache-Control": "private, no-cache",
+    }
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    return StreamingResponse(
+        iter_calendar_ics(session_factory, Principal(id=user.id, user_type=user.user_type)),
+        media_type="text/calendar; charset=utf-8",
+        headers=headers,
+    )
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
 from fastapi.responses import HTMLResponse
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.db import get_session
-from app.schemas.dashboard import DashboardResponse
-from app.services.dashboard import build_weekly_dashboard
+from app.core.db import get_session, get_session_factory
+from app.schemas.dashboard import DashboardRangeResponse, DashboardResponse
+from app.services.dashboard import build_range_dashboard, get_weekly_dashboard
 
 router = APIRouter(tags=["dashboard"])
 
@@ -671,8 +673,23 @@ _DASHBOARD_HTML = """<!doctype html>
 
 
 @router.get("/dashboard/weekly", response_model=DashboardResponse)
-async def weekly_dashboard(session: AsyncSession = Depends(get_session)):
-    return await build_weekly_dashboard(session)
+async def weekly_dashboard(
+    days: int = Query(7, ge=1, le=31),
+    approximate: bool = False,
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+):
+    return await get_weekly_dashboard(session_factory, days=days, approximate=approximate)
+
+
+@router.get("/dashboard/range", response_model=DashboardRangeResponse)
+async def range_dashboard(
+    from_date: date = Query(alias="from"),
+    to_date: date = Query(alias="to"),
+    granularity: str = "day",
+    tz: str | None = None,
+    session: AsyncSession = Depends(get_session),
+):
+    return await build_range_dashboard(session, from_date, to_date, granularity=granularity, tz_name=tz)
 
 
 @router.get("/dashboard", response_class=HTMLResponse)
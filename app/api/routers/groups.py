@@ -4,8 +4,8 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_session
-from app.schemas.group import GroupCreate, GroupOut, GroupUpdate
-from app.services.groups import create_group, list_groups, update_group
+from app.schemas.group import GroupCreate, GroupOut, GroupUpdate, SchedulePreviewOut, SchedulePreviewRequest
+from app.services.groups import create_group, list_groups, preview_schedule_changes, update_group
 
 router = APIRouter(tags=["groups"])
 
@@ -49,3 +49,12 @@ async def update_group_route(
         payload.is_active,
         payload.schedule_json,
     )
+
+
+@router.post("/groups/{group_id}/schedule-preview", response_model=SchedulePreviewOut)
+async def preview_group_schedule_route(
+    group_id: uuid.UUID,
+    payload: SchedulePreviewRequest,
+    session: AsyncSession = Depends(get_session),
+):
+    return await preview_schedule_changes(session, group_id, payload.schedule_json, payload.default_teacher_name)
@@ -3,20 +3,27 @@ import uuid
 from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.api.deps import get_user_by_id_param
-from app.core.db import get_session
+from app.api.deps import get_principal
+from app.core.db import get_session, get_session_factory
 from app.core.errors import BadRequest
 from app.core.settings import settings
 from app.schemas.lesson import (
+    LessonBulkCreate,
+    LessonBulkResponse,
+    LessonBulkUpdate,
     LessonCreate,
     LessonDetailOut,
     LessonListPage,
     LessonOut,
     LessonUpdate,
+    WillGoBatchRequest,
+    WillGoBatchResponse,
     WillGoRequest,
 )
+from app.services.calendar import list_month_lessons
+from app.services.lesson_bulk import bulk_create_lessons, bulk_update_lessons
 from app.services.lessons import (
     create_lesson,
     get_lesson_for_user,
@@ -24,6 +31,7 @@ from app.services.lessons import (
     list_lessons_in_range,
     update_lesson,
     upsert_will_go,
+    upsert_will_go_batch,
 )
 from app.utils.time import now_tz
 
@@ -34,7 +42,7 @@ router = APIRouter(tags=["lessons"])
 async def list_lessons(
     limit: int = 20,
     cursor: str | None = None,
-    user=Depends(get_user_by_id_param),
+    user=Depends(get_principal),
     session: AsyncSession = Depends(get_session),
 ):
     items, next_cursor = await list_lessons_for_user(session, user, limit, cursor)
@@ -56,39 +64,45 @@ async def create_lesson_route(payload: LessonCreate, session: AsyncSession = Dep
     )
 
 
+# Registered before /lessons/{lesson_id} so "bulk" is not parsed as a lesson id.
+@router.post("/lessons/bulk", response_model=LessonBulkResponse)
+async def bulk_create_lessons_route(payload: LessonBulkCreate, session: AsyncSession = Depends(get_session)):
+    items = await bulk_create_lessons(session, [item.model_dump() for item in payload.items])
+    return LessonBulkResponse(items=items)
+
+
+@router.patch("/lessons/bulk", response_model=LessonBulkResponse)
+async def bulk_update_lessons_route(payload: LessonBulkUpdate, session: AsyncSession = Depends(get_session)):
+    items = await bulk_update_lessons(session, [item.model_dump(exclude_unset=True) for item in payload.items])
+    return LessonBulkResponse(items=items)
+
+
+@router.post("/lessons/will-go/batch", response_model=WillGoBatchResponse)
+async def will_go_batch(
+    payload: WillGoBatchRequest,
+    user=Depends(get_principal),
+    session: AsyncSession = Depends(get_session),
+):
+    items = await upsert_will_go_batch(session, user.id, [item.model_dump() for item in payload.items])
+    return WillGoBatchResponse(items=items)
+
+
 @router.get("/lessons/month", response_model=LessonListPage)
 async def list_lessons_month(
     year: int | None = None,
     month: int | None = None,
     limit: int = 100,
     cursor: str | None = None,
-    user=Depends(get_user_by_id_param),
-    session: AsyncSession = Depends(get_session),
+    user=Depends(get_principal),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
 ):
     now = now_tz()
     if year is None:
         year = now.year
     if month is None:
         month = now.month
-    if month < 1 or month > 12:
-        raise BadRequest("MONTH_INVALID", "Invalid month")
 
-    tz = now.tzinfo or ZoneInfo(settings.TIMEZONE)
-    start_at = datetime(year, month, 1, tzinfo=tz)
-    if month == 12:
-        end_at = datetime(year + 1, 1, 1, tzinfo=tz)
-    else:
-        end_at = datetime(year, month + 1, 1, tzinfo=tz)
-
-    items, next_cursor = await list_lessons_in_range(
-        session,
-        user,
-        start_at,
-        end_at,
-        limit,
-        cursor,
-        max_limit=100,
-    )
+    items, next_cursor = await list_month_lessons(session_factory, user, year, month, limit, cursor)
     return LessonListPage(items=items, next_cursor=next_cursor)
 
 
@@ -98,7 +112,7 @@ async def list_lessons_range(
     to_date: date = Query(alias="to"),
     limit: int = 50,
     cursor: str | None = None,
-    user=Depends(get_user_by_id_param),
+    user=Depends(get_principal),
     session: AsyncSession = Depends(get_session),
 ):
     if from_date > to_date:
@@ -133,7 +147,7 @@ async def update_lesson_route(
 @router.get("/lessons/{lesson_id}", response_model=LessonDetailOut)
 async def get_lesson(
     lesson_id: uuid.UUID,
-    user=Depends(get_user_by_id_param),
+    user=Depends(get_principal),
     session: AsyncSession = Depends(get_session),
 ):
     lesson = await get_lesson_for_user(session, user, lesson_id)
@@ -153,7 +167,7 @@ async def get_lesson(
 async def will_go(
     lesson_id: uuid.UUID,
     payload: WillGoRequest,
-    user=Depends(get_user_by_id_param),
+    user=Depends(get_principal),
     session: AsyncSession = Depends(get_session),
 ):
     part = await upsert_will_go(session, user.id, lesson_id, payload.student_id, payload.will_go)
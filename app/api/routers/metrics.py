@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+
+from app.core.passwords import password_hasher
+from app.services.dashboard import weekly_dashboard_cache
+from app.services.notification_stream import notification_broker
+from app.services.parent_scope import parent_memberships
+from app.services.user_identity import user_identity_cache
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics")
+async def metrics() -> dict:
+    return {
+        "dashboard_cache": weekly_dashboard_cache.stats(),
+        "notification_stream": notification_broker.stats(),
+        "parent_memberships": parent_memberships.stats(),
+        "password_hasher": password_hasher.stats(),
+        "user_identity_cache": user_identity_cache.stats(),
+    }
@@ -1,13 +1,15 @@
 import uuid
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.api.deps import get_user_by_id_param
-from app.core.db import get_session
+from app.api.deps import get_principal
+from app.core.db import get_session, get_session_factory
 from app.core.errors import NotFound
-from app.schemas.notification import NotificationOut, NotificationsPage
-from app.services.notifications import list_notifications, mark_read
+from app.schemas.notification import MarkAllReadOut, NotificationOut, NotificationsPage, UnreadCountOut
+from app.services.notification_stream import notification_broker, stream_notifications
+from app.services.notifications import get_unread_count, list_notifications, mark_all_read, mark_read
 
 router = APIRouter(tags=["notifications"])
 
@@ -16,17 +18,47 @@ router = APIRouter(tags=["notifications"])
 async def list_notifications_route(
     limit: int = 20,
     cursor: str | None = None,
-    user=Depends(get_user_by_id_param),
+    user=Depends(get_principal),
     session: AsyncSession = Depends(get_session),
 ):
     items, next_cursor = await list_notifications(session, user.id, limit, cursor)
     return NotificationsPage(items=items, next_cursor=next_cursor)
 
 
+@router.get("/notifications/unread-count", response_model=UnreadCountOut)
+async def unread_count_route(
+    user=Depends(get_principal),
+    session: AsyncSession = Depends(get_session),
+):
+    return UnreadCountOut(unread=await get_unread_count(session, user.id))
+
+
+@router.get("/notifications/stream")
+async def notifications_stream_route(
+    last_event_id: uuid.UUID | None = Header(None, alias="Last-Event-ID"),
+    user=Depends(get_principal),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+):
+    return StreamingResponse(
+        stream_notifications(session_factory, user.id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/notifications/read-all", response_model=MarkAllReadOut)
+async def mark_all_read_route(
+    user=Depends(get_principal),
+    session: AsyncSession = Depends(get_session),
+):
+    marked = await mark_all_read(session, user.id)
+    return MarkAllReadOut(marked=marked, unread=await get_unread_count(session, user.id))
+
+
 @router.post("/notifications/{notification_id}/read", response_model=NotificationOut)
 async def mark_notification_read(
     notification_id: uuid.UUID,
-    user=Depends(get_user_by_id_param),
+    user=Depends(get_principal),
     session: AsyncSession = Depends(get_session),
 ):
     notification = await mark_read(session, user.id, notification_id)
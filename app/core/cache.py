@@ -0,0 +1,210 @@
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+import logging
+import time
+from typing import Any
+
+from app.core.listener import PgListener
+
+logger = logging.getLogger("cache")
+
+
+class TTLCache:
+    """In-process cache with single-flight loading and stale-while-revalidate.
+
+    Fresh entries are served directly. Entries older than ``ttl_seconds`` but younger than
+    ``ttl_seconds + stale_seconds`` are served immediately while one background task reloads them.
+    Concurrent misses for the same key share a single load.
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, stale_seconds: float = 0) -> None:
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.load_errors = 0
+
+    async def get(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            age = time.monotonic() - stored_at
+            if age < self.ttl_seconds:
+                self.hits += 1
+                return value
+            if age < self.ttl_seconds + self.stale_seconds:
+                self.stale_hits += 1
+                self._load(key, load)
+                return value
+
+        self.misses += 1
+        # Shield the shared load so one cancelled caller does not cancel it for everyone else.
+        return await asyncio.shield(self._load(key, load))
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "loads": self.loads,
+            "load_errors": self.load_errors,
+            "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+        }
+
+    def _load(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run_load(key, load))
+            self._inflight[key] = task
+            task.add_done_callback(self._log_failure)
+        return task
+
+    async def _run_load(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            self.loads += 1
+            value = await load()
+            self._entries[key] = (time.monotonic(), value)
+            return value
+        except Exception:
+            self.load_errors += 1
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def _log_failure(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            logger.warning("cache load failed", extra={"cache": self.name, "error": repr(exc)})
+
+
+class LRUCache:
+    """Size-bounded in-process map that evicts the least recently used entry and expires entries after a TTL."""
+
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float) -> None:
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            if time.monotonic() - stored_at < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        self.invalidations += 1
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class NotifyLRUCache:
+    """LRUCache kept coherent across processes by NOTIFY events whose payload is the changed key.
+
+    Subscribes lazily on the first load. The whole cache is cleared whenever the listener (re)connects,
+    since events may have been missed while it was down.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        listener: PgListener,
+        channel: str,
+        parse_key: Callable[[str], Hashable],
+        max_entries: int,
+        ttl_seconds: float,
+    ) -> None:
+        self.listener = listener
+        self.channel = channel
+        self.parse_key = parse_key
+        self.cache = LRUCache(name, max_entries, ttl_seconds)
+        self._listening = False
+        self._listen_lock = asyncio.Lock()
+        # Bumped on every invalidation so a load that raced with one does not store what it read.
+        self._generation = 0
+
+    async def get_or_load(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any | None:
+        value = self.cache.get(key)
+        if value is not None:
+            return value
+
+        await self._listen()
+        generation = self._generation
+        value = await load()
+        if value is not None and generation == self._generation:
+            self.cache.set(key, value)
+        return value
+
+    async def _listen(self) -> None:
+        # Only marked as listening once add() returned, so a failed subscribe is retried on the next load.
+        if self._listening:
+            return
+        async with self._listen_lock:
+            if not self._listening:
+                await self.listener.add(self.channel, self._on_notify)
+                self._listening = True
+
+    def close(self) -> None:
+        """Drop the listener callback and every entry; the next load subscribes again."""
+        if self._listening:
+            self.listener.remove(self.channel, self._on_notify)
+            self._listening = False
+        self.invalidate()
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        self._generation += 1
+        self.cache.invalidate(key)
+
+    def stats(self) -> dict:
+        return {**self.cache.stats(), "listener": self.listener.stats()}
+
+    def _on_notify(self, payload: str | None) -> None:
+        self.invalidate(self.parse_key(payload) if payload else None)
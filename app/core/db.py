@@ -18,6 +18,10 @@ def get_async_engine() -> AsyncEngine:
     return engine
 
 
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    return AsyncSessionLocal
+
+
 async def get_session() -> AsyncIterator[AsyncSession]:
     async with AsyncSessionLocal() as session:
         yield session
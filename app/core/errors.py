@@ -44,6 +44,11 @@ class Conflict(AppError):
         super().__init__(code, message, status.HTTP_409_CONFLICT)
 
 
+class ServiceUnavailable(AppError):
+    def __init__(self, code: str = "SERVICE_UNAVAILABLE", message: str = "Service unavailable") -> None:
+        super().__init__(code, message, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
 def _trace_id(request: Request) -> str | None:
     return getattr(request.state, "trace_id", None) or trace_id_ctx.get()
 
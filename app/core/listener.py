@@ -0,0 +1,120 @@
+import asyncio
+from collections.abc import Callable
+import logging
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.core.settings import settings
+
+logger = logging.getLogger("listener")
+
+# Called with the NOTIFY payload, or with None after (re)connecting when earlier events may have been missed.
+ListenCallback = Callable[[str | None], None]
+
+
+class PgListener:
+    """One dedicated LISTEN connection per process, shared by every in-process consumer.
+
+    The connection is opened lazily on the first ``add`` and re-established with backoff if it drops.
+    Callbacks run on the event loop and must not block.
+    """
+
+    def __init__(self, health_check_seconds: float = 30, max_backoff_seconds: float = 30) -> None:
+        self.health_check_seconds = health_check_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._callbacks: dict[str, list[ListenCallback]] = {}
+        self._conn: asyncpg.Connection | None = None
+        # Channels LISTENed on the current connection. Guarded by _lock together with _conn so a channel
+        # added while _run is subscribing is never skipped by both sides.
+        self._listened: set[str] = set()
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self.connected = asyncio.Event()
+        self.reconnects = 0
+        self.received = 0
+
+    async def add(self, channel: str, callback: ListenCallback) -> None:
+        self._callbacks.setdefault(channel, []).append(callback)
+        async with self._lock:
+            if self._conn is not None and channel not in self._listened:
+                try:
+                    await self._conn.add_listener(channel, self._dispatch)
+                    self._listened.add(channel)
+                except Exception as exc:
+                    # The connection is going away; _run LISTENs on every registered channel after reconnecting.
+                    logger.warning("listen failed", extra={"channel": channel, "error": repr(exc)})
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def remove(self, channel: str, callback: ListenCallback) -> None:
+        callbacks = self._callbacks.get(channel, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "connected": self.connected.is_set(),
+            "channels": sorted(self._callbacks),
+            "reconnects": self.reconnects,
+            "received": self.received,
+        }
+
+    def _dispatch(self, _conn, _pid, channel: str, payload: str | None) -> None:
+        self.received += 1
+        for callback in list(self._callbacks.get(channel, [])):
+            try:
+                callback(payload)
+            except Exception:
+                logger.exception("listen callback failed", extra={"channel": channel})
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            conn = None
+            try:
+                dsn = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+                conn = await asyncpg.connect(dsn.render_as_string(hide_password=False))
+                lost = asyncio.Event()
+                conn.add_termination_listener(lambda _conn: lost.set())
+                async with self._lock:
+                    for channel in list(self._callbacks):
+                        await conn.add_listener(channel, self._dispatch)
+                        self._listened.add(channel)
+                    self._conn = conn
+                self.connected.set()
+                backoff = 1.0
+                for channel in list(self._callbacks):
+                    self._dispatch(conn, None, channel, None)
+
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), timeout=self.health_check_seconds)
+                    except asyncio.TimeoutError:
+                        await conn.fetchval("SELECT 1")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("listen connection lost", extra={"error": repr(exc)})
+            finally:
+                self.connected.clear()
+                self._conn = None
+                self._listened.clear()
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+
+            self.reconnects += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff_seconds)
+
+
+pg_listener = PgListener()
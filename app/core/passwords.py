@@ -0,0 +1,76 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from app.core.errors import ServiceUnavailable
+from app.core.security import hash_password, verify_and_update_password, verify_password
+from app.core.settings import settings
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """Runs password hashing on a bounded thread pool so it never blocks the event loop.
+
+    The pbkdf2 and bcrypt backends release the GIL while hashing, so worker threads hash in parallel.
+    At most ``workers + queue_size`` calls are admitted at once; further callers get a 503 instead of
+    piling up behind a login storm.
+    """
+
+    def __init__(self, workers: int, queue_size: int) -> None:
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor: ThreadPoolExecutor | None = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def hash(self, password: str) -> str:
+        return await self.run(hash_password, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self.run(verify_password, password, password_hash)
+
+    async def verify_and_update(self, password: str, password_hash: str) -> tuple[bool, str | None]:
+        return await self.run(verify_and_update_password, password, password_hash)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.in_flight >= self.workers + self.queue_size:
+            self.rejected += 1
+            raise ServiceUnavailable("AUTH_BUSY", "Too many concurrent sign-ins, retry shortly")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+
+        loop = asyncio.get_running_loop()
+        future = self._executor.submit(fn, *args)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        # Release the slot when the thread finishes, not when the caller stops waiting: a cancelled
+        # request still occupies a worker until its hash completes.
+        future.add_done_callback(lambda _future: loop.call_soon_threadsafe(self._release))
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "in_flight": self.in_flight,
+            "queued": max(0, self.in_flight - self.workers),
+            "peak_in_flight": self.peak_in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        self.completed += 1
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_SIZE)
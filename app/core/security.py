@@ -1,8 +1,32 @@
 import hashlib
 from passlib.context import CryptContext
 
-# Use pbkdf2_sha256 for new hashes, but keep bcrypt for existing users
-pwd_context = CryptContext(schemes=["pbkdf2_sha256", "bcrypt_sha256", "bcrypt"], deprecated="auto")
+from app.core.settings import settings
+
+# pbkdf2_sha256 rounds per cost profile. Measure candidates with scripts/bench_password_hashing.py.
+PASSWORD_PROFILES: dict[str, int] = {
+    "fast": 29_000,
+    "balanced": 210_000,
+    "strong": 600_000,
+}
+
+
+def build_password_context(profile: str) -> CryptContext:
+    if profile not in PASSWORD_PROFILES:
+        raise ValueError(f"Unknown password profile {profile!r}, expected one of {sorted(PASSWORD_PROFILES)}")
+    rounds = PASSWORD_PROFILES[profile]
+    # Use pbkdf2_sha256 for new hashes, but keep bcrypt for existing users. Pinning min == max rounds
+    # makes needs_update() flag pbkdf2 hashes made under any other profile.
+    return CryptContext(
+        schemes=["pbkdf2_sha256", "bcrypt_sha256", "bcrypt"],
+        deprecated="auto",
+        pbkdf2_sha256__default_rounds=rounds,
+        pbkdf2_sha256__min_rounds=rounds,
+        pbkdf2_sha256__max_rounds=rounds,
+    )
+
+
+pwd_context = build_password_context(settings.PASSWORD_PROFILE)
 
 
 def hash_password(password: str) -> str:
@@ -13,6 +37,11 @@ def verify_password(password: str, password_hash: str) -> bool:
     return pwd_context.verify(password, password_hash)
 
 
+def verify_and_update_password(password: str, password_hash: str) -> tuple[bool, str | None]:
+    """Verify a password and return a replacement hash when the stored one uses another scheme or cost."""
+    return pwd_context.verify_and_update(password, password_hash)
+
+
 def password_algo() -> str:
     return "pbkdf2_sha256"
 
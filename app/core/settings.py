@@ -19,7 +19,50 @@ class Settings(BaseSettings):
 
     ALLOWED_ORIGINS: list[str] = ["*"]
 
+    USER_CACHE_MAX_ENTRIES: int = 10_000
+    USER_CACHE_TTL_SECONDS: float = 300
+    PARENT_CACHE_MAX_ENTRIES: int = 10_000
+    PARENT_CACHE_TTL_SECONDS: float = 300
+
+    # Must be set to a random value: the app refuses to start with the default or an empty secret
+    # unless ENV=test.
+    JWT_SECRET: str = "change-me"
+    ACCESS_TTL: int = 1800
+    REFRESH_TTL: int = 2_592_000
+    # Also look access tokens up in revoked_tokens on every request (refresh tokens always are).
+    TOKEN_REVOCATION_CHECK: bool = False
+    # Accept an unauthenticated ``user_id`` query parameter in place of a bearer token (local development
+    # and tests only).
+    ALLOW_USER_ID_AUTH: bool = False
+
+    # Cost profile for new password hashes (see app.core.security.PASSWORD_PROFILES); older hashes are
+    # upgraded on the next successful login.
+    PASSWORD_PROFILE: str = "fast"
+    # Password hashing threads per worker process and how many more calls may wait before a 503.
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 64
+
     NOTIFICATION_REMINDER_WINDOW_HOURS: int = 24
+    LESSON_COPY_CHUNK_ROWS: int = 5000
+    CALENDAR_CACHE_TTL_SECONDS: int = 3600
+    NOTIFICATION_DISPATCH_BATCH_SIZE: int = 100
+    NOTIFICATION_DISPATCH_POLL_SECONDS: float = 5
+    # After a push backend error a row waits RETRY_SECONDS * 2**attempts before it is claimed again.
+    NOTIFICATION_DISPATCH_MAX_ATTEMPTS: int = 5
+    NOTIFICATION_DISPATCH_RETRY_SECONDS: float = 30
+    PUSH_BACKEND: str = "log"
+    NOTIFICATION_STREAM_KEEPALIVE_SECONDS: float = 15
+    NOTIFICATION_STREAM_QUEUE_SIZE: int = 100
+    NOTIFICATION_STREAM_RETRY_MS: int = 5000
+
+    DASHBOARD_QUERY_MODE: str = "single_query"
+    DASHBOARD_ROLLUP_OVERLAP_SECONDS: int = 300
+    DASHBOARD_CACHE_TTL_SECONDS: float = 30
+    DASHBOARD_CACHE_STALE_SECONDS: float = 300
+    DASHBOARD_APPROX_MIN_ROWS: int = 100_000
+    # Connections one worker may use for mode=parallel; keep below the engine pool size (5).
+    DASHBOARD_MAX_CONCURRENCY: int = 4
+    DASHBOARD_RANGE_MAX_BUCKETS: int = 400
 
 
 settings = Settings()
@@ -0,0 +1,85 @@
+import base64
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import hashlib
+import hmac
+import json
+import uuid
+
+from app.core.errors import Unauthorized
+from app.core.settings import settings
+
+_HEADER = {"alg": "HS256", "typ": "JWT"}
+# Secrets anyone can read in this repository; tokens signed with them are forgeable.
+_PUBLIC_SECRETS = {"", "change-me"}
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """The caller's identity as asserted by a verified access token (or looked up for ``user_id``)."""
+
+    id: uuid.UUID
+    user_type: str
+
+
+def check_signing_secret() -> None:
+    """Refuse to run with a known or empty JWT_SECRET outside tests."""
+    if settings.ENV != "test" and settings.JWT_SECRET.strip() in _PUBLIC_SECRETS:
+        raise RuntimeError("JWT_SECRET is empty or the public default; set it to a random value")
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(signing_input: bytes) -> bytes:
+    return hmac.new(settings.JWT_SECRET.encode("utf-8"), signing_input, hashlib.sha256).digest()
+
+
+def encode_token(claims: dict) -> str:
+    header = _b64encode(json.dumps(_HEADER, separators=(",", ":")).encode("utf-8"))
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    signing_input = f"{header}.{payload}".encode("ascii")
+    return f"{header}.{payload}.{_b64encode(_sign(signing_input))}"
+
+
+def decode_token(token: str, token_type: str) -> dict:
+    """Verify an HS256 token's signature, expiry and ``typ`` claim and return its claims."""
+    try:
+        header, payload, signature = token.split(".")
+        expected = _sign(f"{header}.{payload}".encode("ascii"))
+        if not hmac.compare_digest(_b64decode(signature), expected):
+            raise ValueError("bad signature")
+        if json.loads(_b64decode(header)).get("alg") != _HEADER["alg"]:
+            raise ValueError("unexpected algorithm")
+        claims = json.loads(_b64decode(payload))
+        uuid.UUID(claims["sub"])
+    except (ValueError, KeyError, TypeError, AttributeError) as exc:
+        raise Unauthorized("AUTH_TOKEN_INVALID", "Invalid token") from exc
+
+    if claims.get("typ") != token_type:
+        raise Unauthorized("AUTH_TOKEN_INVALID", "Invalid token")
+    if not isinstance(claims.get("exp"), int) or claims["exp"] <= int(datetime.now(timezone.utc).timestamp()):
+        raise Unauthorized("AUTH_TOKEN_EXPIRED", "Token expired")
+    return claims
+
+
+def create_token(user_id: uuid.UUID, user_type: str, token_type: str, ttl_seconds: int) -> tuple[str, dict]:
+    issued_at = datetime.now(timezone.utc)
+    claims = {
+        "sub": str(user_id),
+        "user_type": user_type,
+        "typ": token_type,
+        "jti": uuid.uuid4().hex,
+        "iat": int(issued_at.timestamp()),
+        "exp": int((issued_at + timedelta(seconds=ttl_seconds)).timestamp()),
+    }
+    return encode_token(claims), claims
+
+
+def principal_from_claims(claims: dict) -> Principal:
+    return Principal(id=uuid.UUID(claims["sub"]), user_type=claims["user_type"])
@@ -1,26 +1,47 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routers import (
     admin_jobs,
     auth,
+    calendar,
     dashboard,
     device_tokens,
     groups,
     lessons,
     managers,
     materials,
+    metrics,
     notifications,
     payments,
     students,
 )
 from app.core.errors import register_exception_handlers
+from app.core.listener import pg_listener
+from app.core.passwords import password_hasher
 from app.core.logging import RequestLogMiddleware, configure_logging
 from app.core.settings import settings
+from app.core.tokens import check_signing_secret
 from app.core.trace import TraceIdMiddleware
+from app.services.notification_stream import notification_broker
+from app.services.parent_scope import parent_memberships
+from app.services.user_identity import user_identity_cache
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    yield
+    # Unregister consumers before the listener goes so a restarted app in the same process subscribes afresh.
+    for consumer in (notification_broker, user_identity_cache, parent_memberships):
+        consumer.close()
+    await pg_listener.close()
+    password_hasher.close()
 
 
 def create_app() -> FastAPI:
     configure_logging()
+    check_signing_secret()
 
     openapi_url = "/openapi.json"
     docs_url = "/docs"
@@ -36,6 +57,7 @@ def create_app() -> FastAPI:
         openapi_url=openapi_url,
         docs_url=docs_url,
         redoc_url=redoc_url,
+        lifespan=lifespan,
     )
 
     app.add_middleware(TraceIdMiddleware)
@@ -56,12 +78,14 @@ def create_app() -> FastAPI:
     app.include_router(students.router, prefix=settings.API_PREFIX)
     app.include_router(groups.router, prefix=settings.API_PREFIX)
     app.include_router(lessons.router, prefix=settings.API_PREFIX)
+    app.include_router(calendar.router, prefix=settings.API_PREFIX)
     app.include_router(materials.router, prefix=settings.API_PREFIX)
     app.include_router(notifications.router, prefix=settings.API_PREFIX)
     app.include_router(payments.router, prefix=settings.API_PREFIX)
     app.include_router(device_tokens.router, prefix=settings.API_PREFIX)
     app.include_router(managers.router, prefix=settings.API_PREFIX)
     app.include_router(admin_jobs.router, prefix=settings.API_PREFIX)
+    app.include_router(metrics.router, prefix=settings.API_PREFIX)
 
     @app.get("/health")
     async def health() -> dict:
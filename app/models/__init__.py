@@ -5,10 +5,14 @@ from app.models.student import Student
 from app.models.group import Group
 from app.models.lesson import Lesson, LessonParticipation
 from app.models.material import Material
-from app.models.notification import Notification
+from app.models.notification import Notification, NotificationCounter
 from app.models.payment import Payment
 from app.models.manager import Manager
 from app.models.device_token import DeviceToken
+from app.models.daily_metric import DailyMetric, DailyMetricMove, DailyMetricWatermark
+from app.models.parent_lesson_feed import ParentLessonFeedItem
+from app.models.calendar_month import CalendarMonth
+from app.models.revoked_token import RevokedToken
 
 __all__ = [
     "Base",
@@ -24,7 +28,14 @@ __all__ = [
     "LessonParticipation",
     "Material",
     "Notification",
+    "NotificationCounter",
     "Payment",
     "Manager",
     "DeviceToken",
+    "DailyMetric",
+    "DailyMetricMove",
+    "DailyMetricWatermark",
+    "ParentLessonFeedItem",
+    "CalendarMonth",
+    "RevokedToken",
 ]
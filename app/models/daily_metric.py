@@ -0,0 +1,41 @@
+from datetime import date, datetime
+
+from sqlalchemy import BigInteger, Date, DateTime, Identity, Index, String, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class DailyMetric(Base):
+    __tablename__ = "daily_metrics"
+    __table_args__ = (Index("ix_daily_metrics_timezone_day", "timezone", "day"),)
+
+    metric: Mapped[str] = mapped_column(String(100), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    timezone: Mapped[str] = mapped_column(String(50), primary_key=True)
+    value: Mapped[int] = mapped_column(BigInteger, server_default=text("0"), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=text("now()"), nullable=False)
+
+
+class DailyMetricWatermark(Base):
+    __tablename__ = "daily_metric_watermarks"
+
+    source: Mapped[str] = mapped_column(String(100), primary_key=True)
+    timezone: Mapped[str] = mapped_column(String(50), primary_key=True)
+    processed_until: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class DailyMetricMove(Base):
+    """Bucket timestamp of a row that was deleted, or whose bucket or aggregated columns changed.
+
+    Written by triggers on every rollup source table so an incremental refresh also recomputes the day
+    a row left (and the day it moved into when the watermark columns were not touched).
+    """
+
+    __tablename__ = "daily_metric_moves"
+    __table_args__ = (Index("ix_daily_metric_moves_source_recorded_at", "source", "recorded_at"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    source: Mapped[str] = mapped_column(String(100), nullable=False)
+    bucket_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    recorded_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=text("now()"), nullable=False)
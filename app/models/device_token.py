@@ -1,7 +1,7 @@
 from datetime import datetime
 import uuid
 
-from sqlalchemy import DateTime, ForeignKey, String, UniqueConstraint
+from sqlalchemy import DateTime, ForeignKey, Index, String, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -10,7 +10,10 @@ from app.models.base import Base, CreatedAtMixin, UUIDMixin
 
 class DeviceToken(Base, UUIDMixin, CreatedAtMixin):
     __tablename__ = "device_tokens"
-    __table_args__ = (UniqueConstraint("user_id", "token", name="uq_device_tokens_user_token"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "token", name="uq_device_tokens_user_token"),
+        Index("ix_device_tokens_created_at", "created_at"),
+    )
 
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     token: Mapped[str] = mapped_column(String(500), nullable=False)
@@ -16,6 +16,8 @@ class NotificationStatus(str, Enum):
     queued = "queued"
     sent = "sent"
     failed = "failed"
+    # Not pushed because the user turned push notifications off; still listed in the app.
+    skipped = "skipped"
     read = "read"
 
 
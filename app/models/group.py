@@ -1,4 +1,6 @@
-from sqlalchemy import Boolean, Integer, String, text
+from datetime import date
+
+from sqlalchemy import Boolean, Date, Index, Integer, String, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -7,6 +9,7 @@ from app.models.base import Base, TimestampMixin, UUIDMixin
 
 class Group(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "groups"
+    __table_args__ = (Index("ix_groups_created_at", "created_at"),)
 
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     course_title: Mapped[str | None] = mapped_column(String(200), nullable=True)
@@ -15,3 +18,6 @@ class Group(Base, UUIDMixin, TimestampMixin):
     capacity: Mapped[int | None] = mapped_column(Integer, nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, server_default=text("true"), nullable=False)
     schedule_json: Mapped[list[dict]] = mapped_column(JSONB, server_default=text("'[]'::jsonb"), nullable=False)
+    # Last local date generate_lessons materialized, and the schedule it was generated from.
+    lessons_generated_until: Mapped[date | None] = mapped_column(Date, nullable=True)
+    schedule_fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)
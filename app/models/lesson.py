@@ -1,7 +1,7 @@
 from datetime import datetime
 import uuid
 
-from sqlalchemy import CheckConstraint, DateTime, ForeignKey, String, Text, UniqueConstraint, text, func
+from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, String, Text, UniqueConstraint, text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -13,6 +13,10 @@ class Lesson(Base, UUIDMixin, TimestampMixin):
     __table_args__ = (
         CheckConstraint("ends_at > starts_at", name="ck_lessons_time"),
         UniqueConstraint("group_id", "starts_at", name="uq_lessons_group_starts_at"),
+        Index("ix_lessons_group_starts_at", "group_id", "starts_at"),
+        Index("ix_lessons_starts_at_id", "starts_at", "id"),
+        Index("ix_lessons_created_at", "created_at"),
+        Index("ix_lessons_updated_at", "updated_at"),
     )
 
     group_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("groups.id"), nullable=False)
@@ -27,6 +31,7 @@ class Lesson(Base, UUIDMixin, TimestampMixin):
 
 class LessonParticipation(Base):
     __tablename__ = "lesson_participation"
+    __table_args__ = (Index("ix_lesson_participation_updated_at", "updated_at"),)
 
     lesson_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("lessons.id"), primary_key=True)
     student_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("students.id"), primary_key=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base, CreatedAtMixin, UUIDMixin
@@ -6,6 +6,7 @@ from app.models.base import Base, CreatedAtMixin, UUIDMixin
 
 class Manager(Base, UUIDMixin, CreatedAtMixin):
     __tablename__ = "managers"
+    __table_args__ = (Index("ix_managers_created_at", "created_at"),)
 
     first_name: Mapped[str] = mapped_column(String(100), nullable=False)
     last_name: Mapped[str] = mapped_column(String(100), nullable=False)
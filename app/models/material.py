@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Boolean, ForeignKey, String, Text, text
+from sqlalchemy import Boolean, ForeignKey, Index, String, Text, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -9,6 +9,7 @@ from app.models.base import Base, TimestampMixin, UUIDMixin
 
 class Material(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "materials"
+    __table_args__ = (Index("ix_materials_created_at", "created_at"),)
 
     group_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("groups.id"), nullable=False)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -1,7 +1,7 @@
 from datetime import datetime
 import uuid
 
-from sqlalchemy import DateTime, ForeignKey, String, text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -10,6 +10,19 @@ from app.models.base import Base, CreatedAtMixin, UUIDMixin
 
 class Notification(Base, UUIDMixin, CreatedAtMixin):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index(
+            "uq_notifications_user_type_dedup_key",
+            "user_id",
+            "type",
+            "dedup_key",
+            unique=True,
+            postgresql_where=text("dedup_key IS NOT NULL"),
+        ),
+        Index("ix_notifications_user_created_at", "user_id", "created_at"),
+        Index("ix_notifications_status_scheduled_at", "status", "scheduled_at"),
+        Index("ix_notifications_created_at", "created_at"),
+    )
 
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     type: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -20,3 +33,16 @@ class Notification(Base, UUIDMixin, CreatedAtMixin):
     scheduled_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     read_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Push deliveries that failed on a backend error; the row is retried with backoff until the limit.
+    attempts: Mapped[int] = mapped_column(Integer, server_default=text("0"), nullable=False)
+    # Producer-defined idempotency key, unique per (user_id, type) when set.
+    dedup_key: Mapped[str | None] = mapped_column(String(200), nullable=True)
+
+
+class NotificationCounter(Base):
+    """Per-user unread badge count, kept in step with notifications whose status is not 'read'."""
+
+    __tablename__ = "notification_counters"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    unread: Mapped[int] = mapped_column(Integer, server_default=text("0"), nullable=False)
@@ -0,0 +1,30 @@
+from datetime import datetime
+import uuid
+
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ParentLessonFeedItem(Base):
+    """One row per (parent, lesson) with the parent's children and their will_go inlined.
+
+    Maintained on write by app.services.lesson_feed so a parent's schedule pages off the primary key.
+    """
+
+    __tablename__ = "parent_lesson_feed"
+    __table_args__ = (Index("ix_parent_lesson_feed_lesson_id", "lesson_id"),)
+
+    parent_user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    starts_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    lesson_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("lessons.id"), primary_key=True)
+    group_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("groups.id"), nullable=False)
+    ends_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    topic: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    teacher_name: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    cabinet_text: Mapped[str | None] = mapped_column(Text, nullable=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    students: Mapped[list] = mapped_column(JSONB, server_default=text("'[]'::jsonb"), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=text("now()"), nullable=False)
@@ -1,17 +1,21 @@
 from datetime import datetime
 import uuid
 
-from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Integer, String, text
+from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, Integer, String, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.models.base import Base, CreatedAtMixin, UUIDMixin
+from app.models.base import Base, TimestampMixin, UUIDMixin
 
 
-class Payment(Base, UUIDMixin, CreatedAtMixin):
+class Payment(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "payments"
     __table_args__ = (
         CheckConstraint("amount_cents > 0", name="ck_payments_amount"),
+        Index("ix_payments_parent_created_at", "parent_user_id", "created_at"),
+        Index("ix_payments_status", "status"),
+        Index("ix_payments_created_at", "created_at"),
+        Index("ix_payments_updated_at", "updated_at"),
     )
 
     parent_user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -1,7 +1,7 @@
 from datetime import date
 import uuid
 
-from sqlalchemy import Boolean, Date, ForeignKey, String, text
+from sqlalchemy import Boolean, Date, ForeignKey, Index, String, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -10,6 +10,11 @@ from app.models.base import Base, TimestampMixin, UUIDMixin
 
 class Student(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "students"
+    __table_args__ = (
+        Index("ix_students_parent_user_id", "parent_user_id"),
+        Index("ix_students_group_id", "group_id"),
+        Index("ix_students_created_at", "created_at"),
+    )
 
     parent_user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     group_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("groups.id"), nullable=False)
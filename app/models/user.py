@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, CheckConstraint, String, text
+from sqlalchemy import Boolean, CheckConstraint, Index, String, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -10,6 +10,7 @@ class User(Base, UUIDMixin, TimestampMixin):
     __table_args__ = (
         CheckConstraint("email IS NOT NULL OR phone IS NOT NULL", name="ck_users_email_or_phone"),
         CheckConstraint("user_type IN ('admin','parent')", name="ck_users_user_type"),
+        Index("ix_users_created_at", "created_at"),
     )
 
     email: Mapped[str | None] = mapped_column(String(255), unique=True, nullable=True)
@@ -24,3 +25,5 @@ class User(Base, UUIDMixin, TimestampMixin):
     timezone: Mapped[str] = mapped_column(String(50), server_default=text("'Europe/Vienna'"), nullable=False)
     settings_json: Mapped[dict] = mapped_column(JSONB, server_default=text("'{}'::jsonb"), nullable=False)
     push_enabled: Mapped[bool] = mapped_column(Boolean, server_default=text("true"), nullable=False)
+    # sha256 of the secret in the /calendar/{token}.ics subscription URL.
+    calendar_token_hash: Mapped[str | None] = mapped_column(String(64), unique=True, nullable=True)
@@ -26,3 +26,8 @@ async def get_user_by_email_or_phone_any(session: AsyncSession, email: str | Non
 async def get_user_by_id(session: AsyncSession, user_id: uuid.UUID) -> User | None:
     result = await session.execute(select(User).where(User.id == user_id))
     return result.scalar_one_or_none()
+
+
+async def get_user_by_calendar_token_hash(session: AsyncSession, token_hash: str) -> User | None:
+    result = await session.execute(select(User).where(User.calendar_token_hash == token_hash))
+    return result.scalar_one_or_none()
@@ -3,6 +3,7 @@ import uuid
 from pydantic import BaseModel, EmailStr, Field, model_validator
 
 from app.schemas.common import BaseSchema
+from app.schemas.user import UserMeResponse
 
 
 class RegisterParentRequest(BaseModel):
@@ -50,3 +51,21 @@ class CheckUserResponse(BaseSchema):
     first_name: str | None = None
     last_name: str | None = None
     father_name: str | None = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+class TokenPairOut(BaseSchema):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
+
+class LoginResponse(UserMeResponse):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int
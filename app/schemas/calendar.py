@@ -0,0 +1,27 @@
+from datetime import datetime
+import uuid
+
+from pydantic import BaseModel
+
+
+class CalendarLesson(BaseModel):
+    id: uuid.UUID
+    group_id: uuid.UUID
+    starts_at: datetime
+    ends_at: datetime
+    topic: str | None = None
+    status: str
+    teacher_name: str | None = None
+    cabinet_text: str | None = None
+
+
+class CalendarMonthOut(BaseModel):
+    year: int
+    month: int
+    timezone: str
+    lessons: list[CalendarLesson]
+
+
+class CalendarTokenOut(BaseModel):
+    token: str
+    path: str
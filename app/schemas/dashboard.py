@@ -8,6 +8,7 @@ class DashboardRange(BaseModel):
     to_date: date
     days: int
     timezone: str
+    granularity: str = "day"
 
 
 class DashboardTotals(BaseModel):
@@ -23,6 +24,7 @@ class DashboardTotals(BaseModel):
     payments: int
     device_tokens: int
     managers: int
+    estimated: list[str] = []
 
 
 class DashboardWeek(BaseModel):
@@ -62,3 +64,9 @@ class DashboardResponse(BaseModel):
     totals: DashboardTotals
     week: DashboardWeek
     tables: list[DashboardTable]
+
+
+class DashboardRangeResponse(BaseModel):
+    range: DashboardRange
+    period: DashboardWeek
+    tables: list[DashboardTable]
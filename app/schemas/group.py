@@ -37,3 +37,32 @@ class GroupOut(BaseSchema):
     schedule_json: list[dict]
     created_at: datetime
     updated_at: datetime
+
+
+class SchedulePreviewRequest(BaseModel):
+    schedule_json: list[dict] | None = None
+    default_teacher_name: str | None = None
+
+
+class ScheduleSlot(BaseModel):
+    starts_at: datetime
+    ends_at: datetime
+    teacher_name: str | None = None
+    cabinet_text: str | None = None
+
+
+class ScheduleLessonUpdate(BaseModel):
+    lesson_id: uuid.UUID
+    starts_at: datetime
+    changes: dict
+
+
+class ScheduleLessonCancellation(BaseModel):
+    lesson_id: uuid.UUID
+    starts_at: datetime
+
+
+class SchedulePreviewOut(BaseModel):
+    inserts: list[ScheduleSlot]
+    updates: list[ScheduleLessonUpdate]
+    cancellations: list[ScheduleLessonCancellation]
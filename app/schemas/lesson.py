@@ -1,7 +1,7 @@
 from datetime import datetime
 import uuid
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.schemas.common import BaseSchema
 
@@ -40,6 +40,22 @@ class LessonUpdate(BaseModel):
     status: str | None = None
 
 
+class LessonBulkUpdateItem(LessonUpdate):
+    id: uuid.UUID
+
+
+# Keeps each bulk write a single statement under the driver's bind-parameter limit.
+LESSON_BULK_MAX_ITEMS = 2000
+
+
+class LessonBulkCreate(BaseModel):
+    items: list[LessonCreate] = Field(min_length=1, max_length=LESSON_BULK_MAX_ITEMS)
+
+
+class LessonBulkUpdate(BaseModel):
+    items: list[LessonBulkUpdateItem] = Field(min_length=1, max_length=LESSON_BULK_MAX_ITEMS)
+
+
 class LessonOut(BaseSchema):
     id: uuid.UUID
     group_id: uuid.UUID
@@ -52,6 +68,22 @@ class LessonOut(BaseSchema):
     status: str
 
 
+class BulkItemError(BaseModel):
+    code: str
+    message: str
+
+
+class LessonBulkItemResult(BaseModel):
+    index: int
+    status: str
+    lesson: LessonOut | None = None
+    error: BulkItemError | None = None
+
+
+class LessonBulkResponse(BaseModel):
+    items: list[LessonBulkItemResult]
+
+
 class LessonListPage(BaseModel):
     items: list[LessonListItem]
     next_cursor: str | None = None
@@ -70,3 +102,23 @@ class LessonDetailOut(BaseSchema):
 class WillGoRequest(BaseModel):
     student_id: uuid.UUID
     will_go: bool | None = None
+
+
+class WillGoBatchItem(BaseModel):
+    lesson_id: uuid.UUID
+    student_id: uuid.UUID
+    will_go: bool | None = None
+
+
+class WillGoBatchRequest(BaseModel):
+    items: list[WillGoBatchItem] = Field(min_length=1, max_length=LESSON_BULK_MAX_ITEMS)
+
+
+class WillGoOut(BaseModel):
+    lesson_id: uuid.UUID
+    student_id: uuid.UUID
+    will_go: bool | None = None
+
+
+class WillGoBatchResponse(BaseModel):
+    items: list[WillGoOut]
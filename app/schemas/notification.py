@@ -23,3 +23,12 @@ class NotificationOut(BaseSchema):
 class NotificationsPage(BaseModel):
     items: list[NotificationOut]
     next_cursor: str | None = None
+
+
+class UnreadCountOut(BaseModel):
+    unread: int
+
+
+class MarkAllReadOut(BaseModel):
+    marked: int
+    unread: int
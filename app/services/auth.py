@@ -5,11 +5,13 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.errors import Conflict, Forbidden, NotFound, Unauthorized
-from app.core.security import hash_password, verify_password
+from app.core.passwords import password_hasher
 from app.models.group import Group
 from app.models.student import Student
 from app.models.user import User
 from app.repositories.users import get_user_by_email_or_phone, get_user_by_email_or_phone_any
+from app.services.lesson_feed import refresh_feed_for_parents
+from app.services.parent_scope import parent_memberships
 
 
 async def register_parent(
@@ -42,7 +44,7 @@ async def register_parent(
     user = User(
         email=email,
         phone=phone,
-        password_hash=hash_password(password),
+        password_hash=await password_hasher.hash(password),
         user_type="parent",
         first_name=first_name,
         last_name=last_name,
@@ -66,8 +68,11 @@ async def register_parent(
         is_active=True,
     )
     session.add(student)
+    await session.flush()
+    await refresh_feed_for_parents(session, [user.id], group.id)
 
     await session.commit()
+    parent_memberships.invalidate(user.id)
     return user
 
 
@@ -82,8 +87,11 @@ async def login(
         raise Forbidden("AUTH_USER_NOT_FOUND", "User not found")
     if not user.password_hash:
         raise Unauthorized("AUTH_INVALID_CREDENTIALS", "Invalid credentials")
-    if not verify_password(password, user.password_hash):
+    valid, new_hash = await password_hasher.verify_and_update(password, user.password_hash)
+    if not valid:
         raise Unauthorized("AUTH_INVALID_CREDENTIALS", "Invalid credentials")
+    if new_hash is not None:
+        user.password_hash = new_hash
 
     user.updated_at = datetime.now(timezone.utc)
     await session.commit()
@@ -0,0 +1,262 @@
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+import hashlib
+import secrets
+import uuid
+
+from sqlalchemy import String, cast, func, literal, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.errors import BadRequest, Forbidden, NotFound
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.security import hash_token
+from app.core.settings import settings
+from app.core.tokens import Principal
+from app.models.calendar_month import CalendarMonth
+from app.models.group import Group
+from app.models.lesson import Lesson
+from app.models.user import User
+from app.repositories.users import get_user_by_calendar_token_hash
+from app.services.lessons import _lessons_query_for_user
+from app.services.parent_scope import parent_group_ids
+from app.utils.ics import CRLF, escape_text, fold_line, format_utc
+from app.utils.time import resolve_timezone
+
+# Order of the compact per-lesson arrays stored in calendar_months.lessons.
+_LESSON_FIELDS = ("id", "starts_at", "ends_at", "topic", "status", "teacher_name", "cabinet_text", "plan_text")
+
+
+def month_range(year: int, month: int, tz_name: str) -> tuple[datetime, datetime]:
+    if month < 1 or month > 12:
+        raise BadRequest("MONTH_INVALID", "Invalid month")
+    tz = resolve_timezone(tz_name)
+    start = datetime(year, month, 1, tzinfo=tz)
+    end = datetime(year + 1, 1, 1, tzinfo=tz) if month == 12 else datetime(year, month + 1, 1, tzinfo=tz)
+    return start, end
+
+
+async def _calendar_group_ids(session: AsyncSession, user: User | Principal) -> list[uuid.UUID]:
+    if user.user_type == "admin":
+        stmt = select(Group.id)
+    elif user.user_type == "parent":
+        stmt = parent_group_ids(user.id).distinct()
+    else:
+        raise Forbidden("FORBIDDEN", "Forbidden")
+    result = await session.execute(stmt)
+    return list(result.scalars().all())
+
+
+async def _build_months(
+    session_factory: async_sessionmaker[AsyncSession],
+    group_ids: list[uuid.UUID],
+    year: int,
+    month: int,
+    tz_name: str,
+    start: datetime,
+    end: datetime,
+) -> dict[uuid.UUID, list]:
+    # Built and stored by one INSERT ... SELECT, so the stored month matches a single snapshot. It runs in
+    # its own short transaction so the caller's read-only session never commits.
+    lessons = (
+        select(
+            func.coalesce(
+                func.jsonb_agg(
+                    aggregate_order_by(
+                        func.jsonb_build_array(
+                            cast(Lesson.id, String),
+                            Lesson.starts_at,
+                            Lesson.ends_at,
+                            Lesson.topic,
+                            Lesson.status,
+                            Lesson.teacher_name,
+                            Lesson.cabinet_text,
+                            Lesson.plan_text,
+                        ),
+                        Lesson.starts_at,
+                        Lesson.id,
+                    )
+                ),
+                func.jsonb_build_array(),
+            )
+        )
+        .where(Lesson.group_id == Group.id, Lesson.starts_at >= start, Lesson.starts_at < end)
+        .scalar_subquery()
+    )
+    rows = select(
+        Group.id,
+        literal(year),
+        literal(month),
+        literal(tz_name, String),
+        literal(start),
+        literal(end),
+        lessons,
+    ).where(Group.id.in_(group_ids))
+
+    stmt = insert(CalendarMonth).from_select(
+        ["group_id", "year", "month", "timezone", "range_start", "range_end", "lessons"], rows
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["group_id", "year", "month", "timezone"],
+        set_={"lessons": stmt.excluded.lessons, "built_at": func.now()},
+    ).returning(CalendarMonth.group_id, CalendarMonth.lessons)
+    async with session_factory() as session:
+        result = await session.execute(stmt)
+        built = {group_id: lessons for group_id, lessons in result.all()}
+        await session.commit()
+    return built
+
+
+async def get_month_calendar(
+    session_factory: async_sessionmaker[AsyncSession],
+    user: User | Principal,
+    year: int,
+    month: int,
+) -> list[dict]:
+    """Lessons of the user's groups in a local month, merged from per-group cached months.
+
+    Missing or expired months are rebuilt in one statement. Triggers on ``lessons`` drop cached months
+    on every write; the TTL bounds staleness if a rebuild races with a concurrent lesson write.
+    """
+    tz_name = settings.TIMEZONE
+    start, end = month_range(year, month, tz_name)
+    async with session_factory() as session:
+        group_ids = await _calendar_group_ids(session, user)
+        if not group_ids:
+            return []
+
+        fresh_after = func.now() - timedelta(seconds=settings.CALENDAR_CACHE_TTL_SECONDS)
+        result = await session.execute(
+            select(CalendarMonth.group_id, CalendarMonth.lessons).where(
+                CalendarMonth.group_id.in_(group_ids),
+                CalendarMonth.year == year,
+                CalendarMonth.month == month,
+                CalendarMonth.timezone == tz_name,
+                CalendarMonth.built_at > fresh_after,
+            )
+        )
+        months = dict(result.all())
+    missing = [group_id for group_id in group_ids if group_id not in months]
+    if missing:
+        months.update(await _build_months(session_factory, missing, year, month, tz_name, start, end))
+
+    items = [
+        {"group_id": group_id, **dict(zip(_LESSON_FIELDS, lesson))}
+        for group_id, lessons in months.items()
+        for lesson in lessons
+    ]
+    for item in items:
+        item["id"] = uuid.UUID(item["id"])
+        item["starts_at"] = datetime.fromisoformat(item["starts_at"])
+        item["ends_at"] = datetime.fromisoformat(item["ends_at"])
+    items.sort(key=lambda item: (item["starts_at"], item["id"]))
+    return items
+
+
+async def list_month_lessons(
+    session_factory: async_sessionmaker[AsyncSession],
+    user: User | Principal,
+    year: int,
+    month: int,
+    limit: int,
+    cursor: str | None,
+) -> tuple[list[dict], str | None]:
+    """One keyset page (starts_at ASC, id ASC) of ``get_month_calendar``, for ``GET /lessons/month``."""
+    limit = max(1, min(limit, 100))
+    items = await get_month_calendar(session_factory, user, year, month)
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except Exception as exc:
+            raise BadRequest("CURSOR_INVALID", "Invalid cursor") from exc
+        items = [item for item in items if (item["starts_at"], item["id"]) > after]
+
+    page = items[:limit]
+    next_cursor = None
+    if len(page) == limit:
+        next_cursor = encode_cursor(page[-1]["starts_at"], page[-1]["id"])
+    return page, next_cursor
+
+
+async def issue_calendar_token(session: AsyncSession, user: User) -> str:
+    """Create a new subscription token for the user; any previous calendar URL stops working."""
+    token = secrets.token_urlsafe(32)
+    user.calendar_token_hash = hash_token(token)
+    await session.commit()
+    return token
+
+
+async def get_calendar_feed_user(session: AsyncSession, token: str) -> User:
+    user = await get_user_by_calendar_token_hash(session, hash_token(token))
+    if not user:
+        raise NotFound("CALENDAR_NOT_FOUND", "Calendar not found")
+    return user
+
+
+async def calendar_feed_validators(session: AsyncSession, user: User) -> tuple[str, datetime]:
+    """Strong ETag and Last-Modified for a user's feed, from one aggregate over the scoped lessons.
+
+    The lesson count and the user's group set are part of the ETag so deletions and group changes,
+    which do not move max(updated_at), still produce a new tag.
+    """
+    scoped = _lessons_query_for_user(user).subquery()
+    result = await session.execute(select(func.max(scoped.c.updated_at), func.count()).select_from(scoped))
+    last_modified, count = result.one()
+    group_ids = sorted(str(group_id) for group_id in await _calendar_group_ids(session, user))
+
+    last_modified = (last_modified or user.created_at).replace(microsecond=0)
+    digest = hashlib.sha256(
+        "|".join([str(user.id), last_modified.isoformat(), str(count), *group_ids]).encode("utf-8")
+    ).hexdigest()
+    return f'"{digest[:32]}"', last_modified
+
+
+def _vevent(lesson: Lesson) -> str:
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{lesson.id}@{settings.APP_NAME.lower()}",
+        f"DTSTAMP:{format_utc(lesson.updated_at)}",
+        f"DTSTART:{format_utc(lesson.starts_at)}",
+        f"DTEND:{format_utc(lesson.ends_at)}",
+        f"SUMMARY:{escape_text(lesson.topic or 'Lesson')}",
+        f"STATUS:{'CANCELLED' if lesson.status == 'cancelled' else 'CONFIRMED'}",
+    ]
+    if lesson.cabinet_text:
+        lines.append(f"LOCATION:{escape_text(lesson.cabinet_text)}")
+    if lesson.teacher_name:
+        lines.append(f"DESCRIPTION:{escape_text(lesson.teacher_name)}")
+    lines.append("END:VEVENT")
+    return "".join(fold_line(line) for line in lines)
+
+
+async def iter_calendar_ics(
+    session_factory: async_sessionmaker[AsyncSession],
+    user: Principal,
+    batch_size: int = 500,
+) -> AsyncIterator[str]:
+    """Stream the iCalendar document, reading lessons through a server-side cursor in batches.
+
+    ``user`` is resolved before the response starts: once the VCALENDAR header is sent, a lookup failure
+    could only truncate the body instead of returning a 404.
+    """
+    yield "".join(
+        fold_line(line)
+        for line in (
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:-//{settings.APP_NAME}//Lessons//EN",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{escape_text(settings.APP_NAME)}",
+        )
+    )
+    async with session_factory() as session:
+        stmt = (
+            _lessons_query_for_user(user)
+            .order_by(Lesson.starts_at, Lesson.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await session.stream_scalars(stmt)
+        async for partition in result.partitions():
+            yield "".join(_vevent(lesson) for lesson in partition)
+    yield "END:VCALENDAR" + CRLF
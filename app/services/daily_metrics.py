@@ -0,0 +1,227 @@
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import Date, case, cast, delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.settings import settings
+from app.models.daily_metric import DailyMetric, DailyMetricMove, DailyMetricWatermark
+from app.models.device_token import DeviceToken
+from app.models.group import Group
+from app.models.lesson import Lesson, LessonParticipation
+from app.models.manager import Manager
+from app.models.material import Material
+from app.models.notification import Notification
+from app.models.payment import Payment
+from app.models.student import Student
+from app.models.user import User
+from app.utils.time import resolve_timezone
+
+_UPSERT_CHUNK = 1000
+
+
+# Each source is aggregated by the day of its bucket column. Only days that contain rows whose
+# change columns moved past the stored watermark are recomputed on an incremental run, plus the days
+# that updated or deleted rows left or were moved into (daily_metric_moves, filled by triggers on every
+# source table).
+_SOURCES = {
+    "users": {"bucket": User.created_at, "changed": (User.created_at,), "values": {"users": func.count()}},
+    "groups": {"bucket": Group.created_at, "changed": (Group.created_at,), "values": {"groups": func.count()}},
+    "students": {
+        "bucket": Student.created_at,
+        "changed": (Student.created_at,),
+        "values": {"students": func.count()},
+    },
+    "lessons_created": {
+        "bucket": Lesson.created_at,
+        "changed": (Lesson.created_at,),
+        "values": {"lessons_created": func.count()},
+    },
+    "lessons_starting": {
+        "bucket": Lesson.starts_at,
+        "changed": (Lesson.updated_at,),
+        "values": {"lessons_starting": func.count()},
+    },
+    "lesson_participations": {
+        "bucket": LessonParticipation.updated_at,
+        "changed": (LessonParticipation.updated_at,),
+        "values": {"lesson_participations": func.count()},
+    },
+    "materials": {
+        "bucket": Material.created_at,
+        "changed": (Material.created_at,),
+        "values": {"materials": func.count()},
+    },
+    "notifications": {
+        "bucket": Notification.created_at,
+        "changed": (Notification.created_at,),
+        "values": {"notifications": func.count()},
+    },
+    "payments": {
+        "bucket": Payment.created_at,
+        "changed": (Payment.updated_at,),
+        "values": {
+            "payments": func.count(),
+            "payments_amount_cents": func.coalesce(func.sum(Payment.amount_cents), 0),
+            "payments_paid": func.coalesce(func.sum(case((Payment.status == "paid", 1), else_=0)), 0),
+            "payments_paid_amount_cents": func.coalesce(
+                func.sum(case((Payment.status == "paid", Payment.amount_cents), else_=0)), 0
+            ),
+        },
+    },
+    "device_tokens": {
+        "bucket": DeviceToken.created_at,
+        "changed": (DeviceToken.created_at,),
+        "values": {"device_tokens": func.count()},
+    },
+    "managers": {
+        "bucket": Manager.created_at,
+        "changed": (Manager.created_at,),
+        "values": {"managers": func.count()},
+    },
+}
+
+
+def _local_day(column, tz_name: str):
+    return cast(func.timezone(tz_name, column), Date)
+
+
+async def _touched_days(session: AsyncSession, source: str, spec: dict, tz_name: str, since: datetime) -> list[date]:
+    stmt = (
+        select(_local_day(spec["bucket"], tz_name).label("day"))
+        .where(or_(*(column >= since for column in spec["changed"])))
+        .union(
+            select(_local_day(DailyMetricMove.bucket_at, tz_name)).where(
+                DailyMetricMove.source == source,
+                DailyMetricMove.recorded_at >= since,
+            )
+        )
+    )
+    result = await session.execute(stmt)
+    return sorted(row.day for row in result.all())
+
+
+async def _aggregate(
+    session: AsyncSession,
+    spec: dict,
+    tz_name: str,
+    days: list[date] | None,
+) -> dict[date, dict[str, int]]:
+    bucket = spec["bucket"]
+    stmt = select(
+        _local_day(bucket, tz_name).label("day"),
+        *(expr.label(metric) for metric, expr in spec["values"].items()),
+    ).group_by("day")
+    if days is not None:
+        tz = ZoneInfo(tz_name)
+        stmt = stmt.where(
+            bucket >= datetime.combine(days[0], time.min, tzinfo=tz),
+            bucket < datetime.combine(days[-1] + timedelta(days=1), time.min, tzinfo=tz),
+            _local_day(bucket, tz_name).in_(days),
+        )
+
+    result = await session.execute(stmt)
+    return {
+        row.day: {metric: int(row._mapping[metric]) for metric in spec["values"]}
+        for row in result.all()
+    }
+
+
+async def _upsert_metrics(session: AsyncSession, rows: list[dict]) -> None:
+    for offset in range(0, len(rows), _UPSERT_CHUNK):
+        stmt = insert(DailyMetric).values(rows[offset : offset + _UPSERT_CHUNK])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["metric", "day", "timezone"],
+            set_={"value": stmt.excluded.value, "updated_at": func.now()},
+        )
+        await session.execute(stmt)
+
+
+async def _store_watermark(session: AsyncSession, source: str, tz_name: str, processed_until: datetime) -> None:
+    stmt = insert(DailyMetricWatermark).values(source=source, timezone=tz_name, processed_until=processed_until)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["source", "timezone"],
+        set_={"processed_until": processed_until},
+    )
+    await session.execute(stmt)
+
+
+async def refresh_daily_metrics(session: AsyncSession, tz_name: str | None = None, full: bool = False) -> int:
+    """Bring the daily_metrics rollup for one timezone up to date and return the number of buckets written.
+
+    Incremental runs only recompute the days touched by rows changed since the last run, including the
+    days that updated (rescheduled, back-dated, re-priced) or deleted rows moved out of.
+    """
+    tz_name = tz_name or settings.TIMEZONE
+    resolve_timezone(tz_name)
+
+    run_started = (await session.execute(select(func.now()))).scalar_one()
+    watermark_rows = await session.execute(
+        select(DailyMetricWatermark.source, DailyMetricWatermark.processed_until).where(
+            DailyMetricWatermark.timezone == tz_name
+        )
+    )
+    watermarks = {row.source: row.processed_until for row in watermark_rows.all()}
+    overlap = timedelta(seconds=settings.DASHBOARD_ROLLUP_OVERLAP_SECONDS)
+
+    written = 0
+    for source, spec in _SOURCES.items():
+        processed_until = None if full else watermarks.get(source)
+        if processed_until is None:
+            days = None
+            await session.execute(
+                delete(DailyMetric).where(
+                    DailyMetric.timezone == tz_name,
+                    DailyMetric.metric.in_(list(spec["values"])),
+                )
+            )
+        else:
+            days = await _touched_days(session, source, spec, tz_name, processed_until - overlap)
+
+        if days is None or days:
+            aggregated = await _aggregate(session, spec, tz_name, days)
+            rows = [
+                {
+                    "metric": metric,
+                    "day": day,
+                    "timezone": tz_name,
+                    "value": aggregated.get(day, {}).get(metric, 0),
+                }
+                for day in (days if days is not None else sorted(aggregated))
+                for metric in spec["values"]
+            ]
+            await _upsert_metrics(session, rows)
+            written += len(rows)
+
+        await _store_watermark(session, source, tz_name, run_started)
+
+    # Moves older than every timezone's watermark (minus the overlap) have been applied everywhere.
+    oldest = (await session.execute(select(func.min(DailyMetricWatermark.processed_until)))).scalar_one()
+    await session.execute(delete(DailyMetricMove).where(DailyMetricMove.recorded_at < oldest - overlap))
+
+    await session.commit()
+    return written
+
+
+async def load_daily_metrics(
+    session: AsyncSession,
+    tz_name: str,
+    start_date: date,
+    end_date: date,
+    metrics: list[str] | None = None,
+) -> dict[str, dict[date, int]]:
+    stmt = select(DailyMetric.metric, DailyMetric.day, DailyMetric.value).where(
+        DailyMetric.timezone == tz_name,
+        DailyMetric.day >= start_date,
+        DailyMetric.day <= end_date,
+    )
+    if metrics is not None:
+        stmt = stmt.where(DailyMetric.metric.in_(metrics))
+
+    result = await session.execute(stmt)
+    values: dict[str, dict[date, int]] = {}
+    for metric, day, value in result.all():
+        if value:
+            values.setdefault(metric, {})[day] = int(value)
+    return values
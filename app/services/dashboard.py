@@ -1,9 +1,32 @@
+import asyncio
+import weakref
 from datetime import date, datetime, time, timedelta
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import case, func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import (
+    BigInteger,
+    Date,
+    DateTime,
+    Interval,
+    String,
+    and_,
+    case,
+    cast,
+    column,
+    func,
+    literal,
+    null,
+    select,
+    table,
+    text,
+    true,
+    union_all,
+    values,
+)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.core.cache import TTLCache
+from app.core.errors import BadRequest
 from app.core.settings import settings
 from app.models.device_token import DeviceToken
 from app.models.group import Group
@@ -16,12 +39,15 @@ from app.models.student import Student
 from app.models.user import User
 from app.schemas.dashboard import (
     DashboardRange,
+    DashboardRangeResponse,
     DashboardResponse,
     DashboardTable,
     DashboardTableRow,
     DashboardTotals,
     DashboardWeek,
 )
+from app.services.daily_metrics import load_daily_metrics
+from app.utils.time import resolve_timezone
 
 
 def _date_list(start_date: date, end_date: date) -> list[date]:
@@ -37,70 +63,87 @@ def _rows_count(dates: list[date], count_map: dict[date, int]) -> list[Dashboard
     return [DashboardTableRow(date=day, count=int(count_map.get(day, 0))) for day in dates]
 
 
+_TOTAL_MODELS = {
+    "users": User,
+    "groups": Group,
+    "students": Student,
+    "lessons": Lesson,
+    "lesson_participations": LessonParticipation,
+    "materials": Material,
+    "notifications": Notification,
+    "payments": Payment,
+    "device_tokens": DeviceToken,
+    "managers": Manager,
+}
+
+_DAILY_COLUMNS = {
+    "users": User.created_at,
+    "groups": Group.created_at,
+    "students": Student.created_at,
+    "lessons_created": Lesson.created_at,
+    "lessons_starting": Lesson.starts_at,
+    "lesson_participations": LessonParticipation.updated_at,
+    "materials": Material.created_at,
+    "notifications": Notification.created_at,
+    "payments": Payment.created_at,
+    "device_tokens": DeviceToken.created_at,
+    "managers": Manager.created_at,
+}
+
+_PAYMENT_ROLLUP_METRICS = {
+    "amount_cents": "payments_amount_cents",
+    "paid_count": "payments_paid",
+    "paid_amount_cents": "payments_paid_amount_cents",
+}
+
+DASHBOARD_MODES = ("sequential", "single_query", "parallel", "rollup")
+
+_parallel_slots_by_loop: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _parallel_slots() -> asyncio.Semaphore:
+    """The parallel-mode semaphore for the running loop; a semaphore is bound to the first loop that waits on it."""
+    loop = asyncio.get_running_loop()
+    slots = _parallel_slots_by_loop.get(loop)
+    if slots is None:
+        slots = _parallel_slots_by_loop[loop] = asyncio.Semaphore(max(1, settings.DASHBOARD_MAX_CONCURRENCY))
+    return slots
+
+
+def _bucket(column, tz_name: str, granularity: str = "day"):
+    """Local calendar bucket (day/week/month start) of a timestamptz column in tz_name."""
+    return cast(func.date_trunc(granularity, func.timezone(tz_name, column)), Date)
+
+
 async def _daily_count(
     session: AsyncSession,
     column,
     start_at: datetime,
     end_at: datetime,
+    tz_name: str,
 ):
     result = await session.execute(
         select(
-            func.date_trunc("day", column).label("day"),
+            _bucket(column, tz_name).label("day"),
             func.count().label("count"),
         )
         .where(column >= start_at, column < end_at)
         .group_by("day")
         .order_by("day")
     )
-    return {row.day.date(): int(row.count) for row in result.all()}
+    return {row.day: int(row.count) for row in result.all()}
 
 
 async def _total_count(session: AsyncSession, model):
     return int((await session.execute(select(func.count()).select_from(model))).scalar_one())
 
 
-async def build_weekly_dashboard(session: AsyncSession, days: int = 7) -> DashboardResponse:
-    tz = ZoneInfo(settings.TIMEZONE)
-    today = datetime.now(tz).date()
-    start_date = today - timedelta(days=days - 1)
-    start_at = datetime.combine(start_date, time.min, tzinfo=tz)
-    end_at = datetime.combine(today + timedelta(days=1), time.min, tzinfo=tz)
-
-    date_list = _date_list(start_date, today)
-
-    # Totals
-    totals_users = await _total_count(session, User)
-    totals_groups = await _total_count(session, Group)
-    totals_students = await _total_count(session, Student)
-    totals_lessons = await _total_count(session, Lesson)
-    totals_lesson_parts = await _total_count(session, LessonParticipation)
-    totals_materials = await _total_count(session, Material)
-    totals_notifications = await _total_count(session, Notification)
-    totals_payments = await _total_count(session, Payment)
-    totals_device_tokens = await _total_count(session, DeviceToken)
-    totals_managers = await _total_count(session, Manager)
-
-    user_type_rows = await session.execute(
-        select(User.user_type, func.count()).group_by(User.user_type)
-    )
-    users_by_type = {row[0]: int(row[1]) for row in user_type_rows.all()}
-
-    # Weekly counts
-    users_week = await _daily_count(session, User.created_at, start_at, end_at)
-    groups_week = await _daily_count(session, Group.created_at, start_at, end_at)
-    students_week = await _daily_count(session, Student.created_at, start_at, end_at)
-    lessons_created_week = await _daily_count(session, Lesson.created_at, start_at, end_at)
-    lessons_starting_week = await _daily_count(session, Lesson.starts_at, start_at, end_at)
-    lesson_parts_week = await _daily_count(session, LessonParticipation.updated_at, start_at, end_at)
-    materials_week = await _daily_count(session, Material.created_at, start_at, end_at)
-    notifications_week = await _daily_count(session, Notification.created_at, start_at, end_at)
-    payments_week = await _daily_count(session, Payment.created_at, start_at, end_at)
-    device_tokens_week = await _daily_count(session, DeviceToken.created_at, start_at, end_at)
-    managers_week = await _daily_count(session, Manager.created_at, start_at, end_at)
-
-    payments_agg = await session.execute(
+def _payments_daily_query(start_at: datetime, end_at: datetime, tz_name: str, granularity: str = "day"):
+    return (
         select(
-            func.date_trunc("day", Payment.created_at).label("day"),
+            _bucket(Payment.created_at, tz_name, granularity).label("day"),
             func.count().label("count"),
             func.coalesce(func.sum(Payment.amount_cents), 0).label("amount_cents"),
             func.coalesce(
@@ -115,58 +158,295 @@ async def build_weekly_dashboard(session: AsyncSession, days: int = 7) -> Dashbo
         )
         .where(Payment.created_at >= start_at, Payment.created_at < end_at)
         .group_by("day")
-        .order_by("day")
     )
-    payments_by_day: dict[date, dict[str, int]] = {}
+
+
+def _payment_amounts(row) -> dict[str, int]:
+    return {
+        "count": int(row.count),
+        "amount_cents": int(row.amount_cents),
+        "paid_count": int(row.paid_count),
+        "paid_amount_cents": int(row.paid_amount_cents),
+    }
+
+
+def _empty_metrics() -> dict:
+    return {
+        "totals": {},
+        "users_by_type": {},
+        "series": {name: {} for name in _DAILY_COLUMNS},
+        "payments_by_day": {},
+    }
+
+
+async def _load_metrics_sequential(
+    session: AsyncSession,
+    start_at: datetime,
+    end_at: datetime,
+    tz_name: str,
+    exact_totals: list[str],
+) -> dict:
+    """One statement per metric; kept as the reference path for benchmarks."""
+    metrics = _empty_metrics()
+    for name in exact_totals:
+        metrics["totals"][name] = await _total_count(session, _TOTAL_MODELS[name])
+
+    user_type_rows = await session.execute(
+        select(User.user_type, func.count()).group_by(User.user_type)
+    )
+    metrics["users_by_type"] = {row[0]: int(row[1]) for row in user_type_rows.all()}
+
+    for name, column in _DAILY_COLUMNS.items():
+        metrics["series"][name] = await _daily_count(session, column, start_at, end_at, tz_name)
+
+    payments_agg = await session.execute(_payments_daily_query(start_at, end_at, tz_name).order_by("day"))
     for row in payments_agg.all():
-        payments_by_day[row.day.date()] = {
-            "count": int(row.count),
-            "amount_cents": int(row.amount_cents),
-            "paid_count": int(row.paid_count),
-            "paid_amount_cents": int(row.paid_amount_cents),
-        }
-
-    # Weekly totals (derived from daily maps)
-    week = DashboardWeek(
-        users_created=sum(users_week.values()),
-        groups_created=sum(groups_week.values()),
-        students_created=sum(students_week.values()),
-        lessons_created=sum(lessons_created_week.values()),
-        lessons_starting=sum(lessons_starting_week.values()),
-        lesson_participations_updated=sum(lesson_parts_week.values()),
-        materials_created=sum(materials_week.values()),
-        notifications_created=sum(notifications_week.values()),
-        payments_created=sum(payments_week.values()),
+        metrics["payments_by_day"][row.day] = _payment_amounts(row)
+    return metrics
+
+
+def _metric_row(
+    kind: str,
+    metric,
+    day,
+    count,
+    amount_cents=None,
+    paid_count=None,
+    paid_amount_cents=None,
+) -> list:
+    def _or_null(value):
+        return cast(null(), BigInteger) if value is None else value
+
+    return [
+        literal(kind, String).label("kind"),
+        (literal(metric, String) if isinstance(metric, str) else metric).label("metric"),
+        (cast(null(), Date) if day is None else day).label("day"),
+        count.label("count"),
+        _or_null(amount_cents).label("amount_cents"),
+        _or_null(paid_count).label("paid_count"),
+        _or_null(paid_amount_cents).label("paid_amount_cents"),
+    ]
+
+
+def _totals_parts(names: list[str]) -> list:
+    parts = [
+        select(*_metric_row("total", name, None, func.count())).select_from(_TOTAL_MODELS[name])
+        for name in names
+    ]
+    parts.append(
+        select(*_metric_row("users_by_type", User.user_type, None, func.count())).group_by(User.user_type)
+    )
+    return parts
+
+
+def _series_parts(start_at: datetime, end_at: datetime, tz_name: str, granularity: str = "day") -> list:
+    parts = [
+        select(*_metric_row("daily", name, _bucket(column, tz_name, granularity), func.count()))
+        .where(column >= start_at, column < end_at)
+        .group_by("day")
+        for name, column in _DAILY_COLUMNS.items()
+        if name != "payments"
+    ]
+
+    payments = _payments_daily_query(start_at, end_at, tz_name, granularity).subquery()
+    parts.append(
+        select(
+            *_metric_row(
+                "payments",
+                "payments",
+                payments.c.day,
+                payments.c.count,
+                payments.c.amount_cents,
+                payments.c.paid_count,
+                payments.c.paid_amount_cents,
+            )
+        )
+    )
+    return parts
+
+
+def _metrics_parts(start_at: datetime, end_at: datetime, tz_name: str, exact_totals: list[str]) -> list:
+    return _totals_parts(exact_totals) + _series_parts(start_at, end_at, tz_name)
+
+
+def _metrics_statement(start_at: datetime, end_at: datetime, tz_name: str, exact_totals: list[str]):
+    """All totals and daily series as a single UNION ALL with a uniform row shape."""
+    return union_all(*_metrics_parts(start_at, end_at, tz_name, exact_totals))
+
+
+def _collect_metric_rows(metrics: dict, rows) -> dict:
+    for row in rows:
+        if row.kind == "total":
+            metrics["totals"][row.metric] = int(row.count)
+        elif row.kind == "users_by_type":
+            metrics["users_by_type"][row.metric] = int(row.count)
+        elif row.kind == "daily":
+            metrics["series"][row.metric][row.day] = int(row.count)
+        elif row.kind == "payments":
+            metrics["series"]["payments"][row.day] = int(row.count)
+            metrics["payments_by_day"][row.day] = _payment_amounts(row)
+    return metrics
+
+
+async def _load_metrics_single_query(
+    session: AsyncSession,
+    start_at: datetime,
+    end_at: datetime,
+    tz_name: str,
+    exact_totals: list[str],
+) -> dict:
+    result = await session.execute(_metrics_statement(start_at, end_at, tz_name, exact_totals))
+    return _collect_metric_rows(_empty_metrics(), result.all())
+
+
+async def _load_metrics_parallel(
+    session: AsyncSession,
+    start_at: datetime,
+    end_at: datetime,
+    tz_name: str,
+    exact_totals: list[str],
+) -> dict:
+    """Split the metric statements into DASHBOARD_MAX_CONCURRENCY batches on separate pooled connections.
+
+    The sessions share the caller's engine. A per-loop semaphore caps how many dashboard
+    connections are checked out at once, across concurrent requests too. Every batch imports the
+    caller's snapshot (pg_export_snapshot) into a REPEATABLE READ transaction, so totals and series
+    describe the same moment, as they do in the single-statement modes; the caller's transaction
+    stays open until all batches finish, which keeps the exported snapshot importable.
+    """
+    slots = max(1, settings.DASHBOARD_MAX_CONCURRENCY)
+    parts = _metrics_parts(start_at, end_at, tz_name, exact_totals)
+    batches = [union_all(*parts[offset::slots]) for offset in range(min(slots, len(parts)))]
+    session_factory = async_sessionmaker(session.bind, expire_on_commit=False)
+    snapshot_id = (await session.execute(select(func.pg_export_snapshot()))).scalar_one()
+
+    async def _run(stmt):
+        async with _parallel_slots():
+            async with session_factory() as batch_session:
+                await batch_session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+                # Utility statement: the snapshot id cannot be a bind parameter. It comes from the server.
+                await batch_session.execute(text(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'"))
+                return (await batch_session.execute(stmt)).all()
+
+    metrics = _empty_metrics()
+    for rows in await asyncio.gather(*(_run(stmt) for stmt in batches)):
+        _collect_metric_rows(metrics, rows)
+    return metrics
+
+
+async def _load_metrics_rollup(
+    session: AsyncSession,
+    start_at: datetime,
+    end_at: datetime,
+    tz_name: str,
+    exact_totals: list[str],
+) -> dict:
+    """Totals from the base tables, daily series from the daily_metrics rollup."""
+    result = await session.execute(union_all(*_totals_parts(exact_totals)))
+    metrics = _collect_metric_rows(_empty_metrics(), result.all())
+
+    rollups = await load_daily_metrics(
+        session,
+        tz_name,
+        start_at.date(),
+        (end_at - timedelta(days=1)).date(),
+        metrics=[*_DAILY_COLUMNS, *_PAYMENT_ROLLUP_METRICS.values()],
+    )
+    for name in _DAILY_COLUMNS:
+        metrics["series"][name] = rollups.get(name, {})
+    for day, count in rollups.get("payments", {}).items():
+        amounts = {"count": count}
+        for key, metric in _PAYMENT_ROLLUP_METRICS.items():
+            amounts[key] = rollups.get(metric, {}).get(day, 0)
+        metrics["payments_by_day"][day] = amounts
+    return metrics
+
+
+_pg_class = table("pg_class", column("oid"), column("relname"), column("reltuples"))
+_pg_stat_user_tables = table("pg_stat_user_tables", column("relid"), column("n_live_tup"))
+
+
+async def _estimate_totals(session: AsyncSession) -> dict[str, int]:
+    """Planner/statistics row estimates for tables at or above DASHBOARD_APPROX_MIN_ROWS.
+
+    Smaller tables (and tables never analyzed, where reltuples is -1) are left out so the caller
+    counts them exactly.
+    """
+    names = {model.__table__.name: name for name, model in _TOTAL_MODELS.items()}
+    estimate = func.coalesce(func.nullif(_pg_stat_user_tables.c.n_live_tup, 0), _pg_class.c.reltuples)
+    result = await session.execute(
+        select(_pg_class.c.relname, estimate.label("estimate"))
+        .select_from(
+            _pg_class.outerjoin(_pg_stat_user_tables, _pg_stat_user_tables.c.relid == _pg_class.c.oid)
+        )
+        .where(_pg_class.c.oid.in_([func.to_regclass(table_name) for table_name in names]))
+    )
+    return {
+        names[row.relname]: int(row.estimate)
+        for row in result.all()
+        if row.estimate is not None and row.estimate >= settings.DASHBOARD_APPROX_MIN_ROWS
+    }
+
+
+_LOADERS = {
+    "sequential": _load_metrics_sequential,
+    "single_query": _load_metrics_single_query,
+    "parallel": _load_metrics_parallel,
+    "rollup": _load_metrics_rollup,
+}
+
+
+def _period_summary(series: dict[str, dict[date, int]], payments_by_day: dict[date, dict[str, int]]) -> DashboardWeek:
+    return DashboardWeek(
+        users_created=sum(series["users"].values()),
+        groups_created=sum(series["groups"].values()),
+        students_created=sum(series["students"].values()),
+        lessons_created=sum(series["lessons_created"].values()),
+        lessons_starting=sum(series["lessons_starting"].values()),
+        lesson_participations_updated=sum(series["lesson_participations"].values()),
+        materials_created=sum(series["materials"].values()),
+        notifications_created=sum(series["notifications"].values()),
+        payments_created=sum(series["payments"].values()),
         payments_amount_cents=sum(item["amount_cents"] for item in payments_by_day.values()),
         payments_paid=sum(item["paid_count"] for item in payments_by_day.values()),
         payments_paid_amount_cents=sum(item["paid_amount_cents"] for item in payments_by_day.values()),
-        device_tokens_created=sum(device_tokens_week.values()),
-        managers_created=sum(managers_week.values()),
+        device_tokens_created=sum(series["device_tokens"].values()),
+        managers_created=sum(series["managers"].values()),
     )
 
-    tables: list[DashboardTable] = [
-        DashboardTable(name="users_by_day", rows=_rows_count(date_list, users_week)),
-        DashboardTable(name="groups_by_day", rows=_rows_count(date_list, groups_week)),
-        DashboardTable(name="students_by_day", rows=_rows_count(date_list, students_week)),
+
+def _series_tables(
+    date_list: list[date],
+    series: dict[str, dict[date, int]],
+    payments_by_day: dict[date, dict[str, int]],
+    granularity: str,
+) -> list[DashboardTable]:
+    return [
+        DashboardTable(name=f"users_by_{granularity}", rows=_rows_count(date_list, series["users"])),
+        DashboardTable(name=f"groups_by_{granularity}", rows=_rows_count(date_list, series["groups"])),
+        DashboardTable(name=f"students_by_{granularity}", rows=_rows_count(date_list, series["students"])),
         DashboardTable(
-            name="lessons_by_day",
+            name=f"lessons_by_{granularity}",
             rows=[
                 DashboardTableRow(
                     date=day,
-                    created=int(lessons_created_week.get(day, 0)),
-                    starting=int(lessons_starting_week.get(day, 0)),
+                    created=int(series["lessons_created"].get(day, 0)),
+                    starting=int(series["lessons_starting"].get(day, 0)),
                 )
                 for day in date_list
             ],
         ),
         DashboardTable(
-            name="lesson_participations_by_day",
-            rows=_rows_count(date_list, lesson_parts_week),
+            name=f"lesson_participations_by_{granularity}",
+            rows=_rows_count(date_list, series["lesson_participations"]),
+        ),
+        DashboardTable(name=f"materials_by_{granularity}", rows=_rows_count(date_list, series["materials"])),
+        DashboardTable(
+            name=f"notifications_by_{granularity}",
+            rows=_rows_count(date_list, series["notifications"]),
         ),
-        DashboardTable(name="materials_by_day", rows=_rows_count(date_list, materials_week)),
-        DashboardTable(name="notifications_by_day", rows=_rows_count(date_list, notifications_week)),
         DashboardTable(
-            name="payments_by_day",
+            name=f"payments_by_{granularity}",
             rows=[
                 DashboardTableRow(
                     date=day,
@@ -178,10 +458,44 @@ async def build_weekly_dashboard(session: AsyncSession, days: int = 7) -> Dashbo
                 for day in date_list
             ],
         ),
-        DashboardTable(name="device_tokens_by_day", rows=_rows_count(date_list, device_tokens_week)),
-        DashboardTable(name="managers_by_day", rows=_rows_count(date_list, managers_week)),
+        DashboardTable(
+            name=f"device_tokens_by_{granularity}",
+            rows=_rows_count(date_list, series["device_tokens"]),
+        ),
+        DashboardTable(name=f"managers_by_{granularity}", rows=_rows_count(date_list, series["managers"])),
     ]
 
+
+async def build_weekly_dashboard(
+    session: AsyncSession,
+    days: int = 7,
+    mode: str | None = None,
+    approximate: bool = False,
+) -> DashboardResponse:
+    mode = mode or settings.DASHBOARD_QUERY_MODE
+    loader = _LOADERS.get(mode)
+    if loader is None:
+        raise BadRequest("DASHBOARD_MODE_INVALID", f"Dashboard mode must be one of: {', '.join(DASHBOARD_MODES)}")
+
+    tz = ZoneInfo(settings.TIMEZONE)
+    today = datetime.now(tz).date()
+    start_date = today - timedelta(days=days - 1)
+    start_at = datetime.combine(start_date, time.min, tzinfo=tz)
+    end_at = datetime.combine(today + timedelta(days=1), time.min, tzinfo=tz)
+
+    date_list = _date_list(start_date, today)
+
+    estimates = await _estimate_totals(session) if approximate else {}
+    exact_totals = [name for name in _TOTAL_MODELS if name not in estimates]
+    metrics = await loader(session, start_at, end_at, settings.TIMEZONE, exact_totals)
+    totals = estimates | metrics["totals"]
+    users_by_type = metrics["users_by_type"]
+    series = metrics["series"]
+    payments_by_day = metrics["payments_by_day"]
+
+    week = _period_summary(series, payments_by_day)
+    tables = _series_tables(date_list, series, payments_by_day, "day")
+
     return DashboardResponse(
         range=DashboardRange(
             from_date=start_date,
@@ -190,19 +504,153 @@ async def build_weekly_dashboard(session: AsyncSession, days: int = 7) -> Dashbo
             timezone=settings.TIMEZONE,
         ),
         totals=DashboardTotals(
-            users=totals_users,
+            users=totals["users"],
             users_admin=int(users_by_type.get("admin", 0)),
             users_parent=int(users_by_type.get("parent", 0)),
-            groups=totals_groups,
-            students=totals_students,
-            lessons=totals_lessons,
-            lesson_participations=totals_lesson_parts,
-            materials=totals_materials,
-            notifications=totals_notifications,
-            payments=totals_payments,
-            device_tokens=totals_device_tokens,
-            managers=totals_managers,
+            groups=totals["groups"],
+            students=totals["students"],
+            lessons=totals["lessons"],
+            lesson_participations=totals["lesson_participations"],
+            materials=totals["materials"],
+            notifications=totals["notifications"],
+            payments=totals["payments"],
+            device_tokens=totals["device_tokens"],
+            managers=totals["managers"],
+            estimated=sorted(estimates),
         ),
         week=week,
         tables=tables,
     )
+
+
+_GRANULARITY_STEPS = {"day": "1 day", "week": "1 week", "month": "1 month"}
+
+
+def _bucket_start(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day + timedelta(days=7)
+    if granularity == "month":
+        return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+    return day + timedelta(days=1)
+
+
+def _range_statement(
+    start_at: datetime,
+    end_at: datetime,
+    tz_name: str,
+    granularity: str,
+    first_bucket: date,
+    last_bucket: date,
+):
+    """Per-bucket series for every metric, zero-filled in the database against generate_series."""
+    agg = union_all(*_series_parts(start_at, end_at, tz_name, granularity)).cte("agg")
+    buckets = select(
+        cast(
+            func.generate_series(
+                cast(literal(first_bucket), DateTime),
+                cast(literal(last_bucket), DateTime),
+                cast(literal(_GRANULARITY_STEPS[granularity]), Interval),
+            ),
+            Date,
+        ).label("day")
+    ).cte("buckets")
+    metric_names = values(column("metric", String), name="metric_names").data([(name,) for name in _DAILY_COLUMNS])
+    return (
+        select(
+            metric_names.c.metric,
+            buckets.c.day,
+            func.coalesce(agg.c.count, 0).label("count"),
+            func.coalesce(agg.c.amount_cents, 0).label("amount_cents"),
+            func.coalesce(agg.c.paid_count, 0).label("paid_count"),
+            func.coalesce(agg.c.paid_amount_cents, 0).label("paid_amount_cents"),
+        )
+        .select_from(
+            buckets.join(metric_names, true()).outerjoin(
+                agg,
+                and_(agg.c.metric == metric_names.c.metric, agg.c.day == buckets.c.day),
+            )
+        )
+        .order_by(metric_names.c.metric, buckets.c.day)
+    )
+
+
+async def build_range_dashboard(
+    session: AsyncSession,
+    from_date: date,
+    to_date: date,
+    granularity: str = "day",
+    tz_name: str | None = None,
+) -> DashboardRangeResponse:
+    if granularity not in _GRANULARITY_STEPS:
+        raise BadRequest("GRANULARITY_INVALID", f"Granularity must be one of: {', '.join(_GRANULARITY_STEPS)}")
+    if from_date > to_date:
+        raise BadRequest("DATE_RANGE_INVALID", "Invalid date range")
+
+    tz_name = tz_name or settings.TIMEZONE
+    tz = resolve_timezone(tz_name)
+
+    first_bucket = _bucket_start(from_date, granularity)
+    last_bucket = _bucket_start(to_date, granularity)
+    end_date = _next_bucket(last_bucket, granularity)
+    if granularity == "month":
+        bucket_count = (last_bucket.year - first_bucket.year) * 12 + last_bucket.month - first_bucket.month + 1
+    else:
+        bucket_count = (end_date - first_bucket).days // (7 if granularity == "week" else 1)
+    if bucket_count > settings.DASHBOARD_RANGE_MAX_BUCKETS:
+        raise BadRequest("DATE_RANGE_TOO_LARGE", "Date range has too many buckets for this granularity")
+
+    start_at = datetime.combine(first_bucket, time.min, tzinfo=tz)
+    end_at = datetime.combine(end_date, time.min, tzinfo=tz)
+    result = await session.execute(
+        _range_statement(start_at, end_at, tz_name, granularity, first_bucket, last_bucket)
+    )
+
+    bucket_list: list[date] = []
+    series: dict[str, dict[date, int]] = {name: {} for name in _DAILY_COLUMNS}
+    payments_by_day: dict[date, dict[str, int]] = {}
+    for row in result.all():
+        series[row.metric][row.day] = int(row.count)
+        if row.metric == "payments":
+            bucket_list.append(row.day)
+            payments_by_day[row.day] = _payment_amounts(row)
+
+    return DashboardRangeResponse(
+        range=DashboardRange(
+            from_date=first_bucket,
+            to_date=end_date - timedelta(days=1),
+            days=(end_date - first_bucket).days,
+            timezone=tz_name,
+            granularity=granularity,
+        ),
+        period=_period_summary(series, payments_by_day),
+        tables=_series_tables(bucket_list, series, payments_by_day, granularity),
+    )
+
+
+weekly_dashboard_cache = TTLCache(
+    "dashboard",
+    ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS,
+    stale_seconds=settings.DASHBOARD_CACHE_STALE_SECONDS,
+)
+
+
+async def get_weekly_dashboard(
+    session_factory: async_sessionmaker[AsyncSession],
+    days: int = 7,
+    approximate: bool = False,
+) -> DashboardResponse:
+    """Cached build_weekly_dashboard; loads run on their own session so they outlive any one request."""
+
+    async def _load() -> DashboardResponse:
+        async with session_factory() as session:
+            return await build_weekly_dashboard(session, days=days, approximate=approximate)
+
+    return await weekly_dashboard_cache.get((days, settings.TIMEZONE, approximate), _load)
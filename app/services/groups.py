@@ -4,9 +4,12 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.errors import Forbidden, NotFound
+from app.core.tokens import Principal
 from app.models.group import Group
-from app.models.student import Student
 from app.models.user import User
+from app.services.lessons import schedule_fingerprint
+from app.services.parent_scope import in_parent_groups
+from app.services.schedule_diff import apply_schedule_changes, plan_schedule_changes
 
 
 async def list_groups(session: AsyncSession) -> list[Group]:
@@ -59,29 +62,60 @@ async def update_group(
         group.course_title = course_title
     if course_description is not None:
         group.course_description = course_description
-    if default_teacher_name is not None:
-        group.default_teacher_name = default_teacher_name
     if capacity is not None:
         group.capacity = capacity
     if is_active is not None:
         group.is_active = is_active
+    schedule_changed = schedule_json is not None and schedule_json != group.schedule_json
+    teacher_changed = default_teacher_name is not None and default_teacher_name != group.default_teacher_name
+    if default_teacher_name is not None:
+        group.default_teacher_name = default_teacher_name
     if schedule_json is not None:
         group.schedule_json = schedule_json
 
+    if schedule_changed or teacher_changed:
+        # Bring already generated future lessons in line within the same transaction.
+        plan = await plan_schedule_changes(session, group, group.schedule_json, group.default_teacher_name)
+        await apply_schedule_changes(session, plan)
+        group.schedule_fingerprint = schedule_fingerprint(group.schedule_json)
+
     await session.commit()
     return group
 
 
-async def list_user_courses(session: AsyncSession, user: User) -> list[dict]:
+async def preview_schedule_changes(
+    session: AsyncSession,
+    group_id: uuid.UUID,
+    schedule_json: list[dict] | None,
+    default_teacher_name: str | None,
+) -> dict:
+    group = await session.get(Group, group_id)
+    if not group:
+        raise NotFound("GROUP_NOT_FOUND", "Group not found")
+
+    plan = await plan_schedule_changes(
+        session,
+        group,
+        schedule_json if schedule_json is not None else group.schedule_json,
+        default_teacher_name if default_teacher_name is not None else group.default_teacher_name,
+    )
+    return {
+        "inserts": plan["inserts"],
+        "updates": [
+            {"lesson_id": item["lesson"].id, "starts_at": item["lesson"].starts_at, "changes": item["changes"]}
+            for item in plan["updates"]
+        ],
+        "cancellations": [
+            {"lesson_id": lesson.id, "starts_at": lesson.starts_at} for lesson in plan["cancellations"]
+        ],
+    }
+
+
+async def list_user_courses(session: AsyncSession, user: User | Principal) -> list[dict]:
     if user.user_type == "admin":
         stmt = select(Group)
     elif user.user_type == "parent":
-        stmt = (
-            select(Group)
-            .join(Student, Student.group_id == Group.id)
-            .where(Student.parent_user_id == user.id)
-            .distinct()
-        )
+        stmt = select(Group).where(in_parent_groups(Group.id, user.id))
     else:
         raise Forbidden("FORBIDDEN", "Forbidden")
 
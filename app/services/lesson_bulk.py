@@ -0,0 +1,205 @@
+from datetime import datetime, timezone
+import uuid
+
+from sqlalchemy import DateTime, String, Text, column, select, tuple_, update, values
+from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.errors import AppError, BadRequest, Conflict, NotFound
+from app.models.group import Group
+from app.models.lesson import Lesson
+from app.services.lesson_feed import refresh_feed_for_lessons
+
+_FIELDS = ("group_id", "starts_at", "ends_at", "topic", "plan_text", "teacher_name", "cabinet_text", "status")
+_REQUIRED = {"group_id", "starts_at", "ends_at", "status"}
+_LESSON_COLUMNS = [Lesson.__table__.c[name] for name in ("id", *_FIELDS)]
+_SLOT_CONSTRAINT = "uq_lessons_group_starts_at"
+
+
+def _failed(index: int, error: AppError) -> dict:
+    return {"index": index, "status": "error", "lesson": None, "error": {"code": error.code, "message": error.message}}
+
+
+def _time_conflict() -> Conflict:
+    return Conflict("LESSON_TIME_CONFLICT", "Lesson already exists for this group and time")
+
+
+def _lesson_not_found() -> NotFound:
+    return NotFound("LESSON_NOT_FOUND", "Lesson not found")
+
+
+def _is_slot_conflict(exc: IntegrityError) -> bool:
+    return _SLOT_CONSTRAINT in str(exc.orig)
+
+
+async def _existing_group_ids(session: AsyncSession, group_ids: set[uuid.UUID]) -> set[uuid.UUID]:
+    if not group_ids:
+        return set()
+    result = await session.execute(select(Group.id).where(Group.id.in_(group_ids)))
+    return set(result.scalars().all())
+
+
+async def _occupied_slots(session: AsyncSession, slots: set[tuple]) -> dict[tuple, uuid.UUID]:
+    if not slots:
+        return {}
+    result = await session.execute(
+        select(Lesson.group_id, Lesson.starts_at, Lesson.id).where(
+            tuple_(Lesson.group_id, Lesson.starts_at).in_(list(slots))
+        )
+    )
+    return {(group_id, starts_at): lesson_id for group_id, starts_at, lesson_id in result.all()}
+
+
+def _validate(
+    row: dict,
+    groups: set[uuid.UUID],
+    occupied: dict[tuple, uuid.UUID],
+    claimed: set[tuple],
+    lesson_id: uuid.UUID | None = None,
+) -> AppError | None:
+    if row["ends_at"] <= row["starts_at"]:
+        return BadRequest("LESSON_TIME_INVALID", "Lesson end must be after start")
+    if row["group_id"] not in groups:
+        return NotFound("GROUP_NOT_FOUND", "Group not found")
+    slot = (row["group_id"], row["starts_at"])
+    if slot in claimed or occupied.get(slot, lesson_id) != lesson_id:
+        return _time_conflict()
+    claimed.add(slot)
+    return None
+
+
+async def bulk_create_lessons(session: AsyncSession, items: list[dict]) -> list[dict]:
+    """Create many lessons with one group lookup, one conflict lookup and one INSERT.
+
+    Invalid items are reported per index and skipped; the rest are committed together.
+    """
+    groups = await _existing_group_ids(session, {item["group_id"] for item in items})
+    occupied = await _occupied_slots(session, {(item["group_id"], item["starts_at"]) for item in items})
+
+    results: dict[int, dict] = {}
+    pending: dict[tuple, int] = {}
+    claimed: set[tuple] = set()
+    for index, item in enumerate(items):
+        error = _validate(item, groups, occupied, claimed)
+        if error:
+            results[index] = _failed(index, error)
+        else:
+            pending[(item["group_id"], item["starts_at"])] = index
+
+    if pending:
+        rows = [{name: items[index][name] for name in _FIELDS} for index in pending.values()]
+        result = await session.execute(
+            insert(Lesson.__table__)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["group_id", "starts_at"])
+            .returning(*_LESSON_COLUMNS)
+        )
+        created = {(row.group_id, row.starts_at): dict(row._mapping) for row in result.all()}
+        for slot, index in pending.items():
+            lesson = created.get(slot)
+            if lesson is None:
+                # Inserted concurrently after the conflict lookup.
+                results[index] = _failed(index, _time_conflict())
+            else:
+                results[index] = {"index": index, "status": "created", "lesson": lesson, "error": None}
+        await refresh_feed_for_lessons(session, [lesson["id"] for lesson in created.values()])
+
+    await session.commit()
+    return [results[index] for index in range(len(items))]
+
+
+async def _apply_updates(session: AsyncSession, rows: list[dict], now: datetime) -> dict[uuid.UUID, dict]:
+    changes = values(
+        column("id", UUID(as_uuid=True)),
+        column("group_id", UUID(as_uuid=True)),
+        column("starts_at", DateTime(timezone=True)),
+        column("ends_at", DateTime(timezone=True)),
+        column("topic", String),
+        column("plan_text", Text),
+        column("teacher_name", String),
+        column("cabinet_text", Text),
+        column("status", String),
+        name="changes",
+    ).data([tuple(row[name] for name in ("id", *_FIELDS)) for row in rows])
+    result = await session.execute(
+        update(Lesson.__table__)
+        .where(Lesson.__table__.c.id == changes.c.id)
+        .values({name: changes.c[name] for name in _FIELDS} | {"updated_at": now})
+        .returning(*_LESSON_COLUMNS)
+    )
+    return {row.id: dict(row._mapping) for row in result.all()}
+
+
+async def bulk_update_lessons(session: AsyncSession, items: list[dict]) -> list[dict]:
+    """Apply partial updates to many lessons with one UPDATE ... FROM (VALUES ...).
+
+    ``items`` carry ``id`` plus the fields to change. Invalid items are reported per index and skipped,
+    including lessons deleted or slots taken by concurrent writes after the lookups.
+    """
+    ids = {item["id"] for item in items}
+    result = await session.execute(select(*_LESSON_COLUMNS).where(Lesson.id.in_(ids)))
+    current = {row.id: dict(row._mapping) for row in result.all()}
+
+    merged: dict[int, dict] = {}
+    results: dict[int, dict] = {}
+    seen: set[uuid.UUID] = set()
+    for index, item in enumerate(items):
+        lesson = current.get(item["id"])
+        if lesson is None:
+            results[index] = _failed(index, _lesson_not_found())
+        elif item["id"] in seen:
+            results[index] = _failed(index, BadRequest("LESSON_DUPLICATE", "Lesson appears more than once"))
+        else:
+            seen.add(item["id"])
+            changes = {
+                key: value
+                for key, value in item.items()
+                if key != "id" and not (value is None and key in _REQUIRED)
+            }
+            merged[index] = {**lesson, **changes}
+
+    groups = await _existing_group_ids(session, {row["group_id"] for row in merged.values()})
+    occupied = await _occupied_slots(session, {(row["group_id"], row["starts_at"]) for row in merged.values()})
+
+    valid: dict[int, dict] = {}
+    claimed: set[tuple] = set()
+    for index, row in merged.items():
+        error = _validate(row, groups, occupied, claimed, lesson_id=row["id"])
+        if error:
+            results[index] = _failed(index, error)
+        else:
+            valid[index] = row
+
+    if valid:
+        now = datetime.now(timezone.utc)
+        try:
+            async with session.begin_nested():
+                updated = await _apply_updates(session, list(valid.values()), now)
+        except IntegrityError as exc:
+            if not _is_slot_conflict(exc):
+                raise
+            # A target slot was taken after the conflict lookup. Retry row by row so only the colliding
+            # items fail, as ON CONFLICT DO NOTHING does for bulk_create_lessons.
+            updated = {}
+            for index, row in valid.items():
+                try:
+                    async with session.begin_nested():
+                        updated |= await _apply_updates(session, [row], now)
+                except IntegrityError as exc:
+                    if not _is_slot_conflict(exc):
+                        raise
+                    results[index] = _failed(index, _time_conflict())
+        for index, row in valid.items():
+            if index in results:
+                continue
+            lesson = updated.get(row["id"])
+            if lesson is None:
+                # Deleted after the lookup.
+                results[index] = _failed(index, _lesson_not_found())
+            else:
+                results[index] = {"index": index, "status": "updated", "lesson": lesson, "error": None}
+        await refresh_feed_for_lessons(session, list(updated))
+
+    await session.commit()
+    return [results[index] for index in range(len(items))]
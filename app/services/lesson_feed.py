@@ -0,0 +1,132 @@
+import uuid
+
+from sqlalchemy import String, cast, delete, func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.lesson import Lesson, LessonParticipation
+from app.models.parent_lesson_feed import ParentLessonFeedItem
+from app.models.student import Student
+
+_CHUNK = 1000
+
+_FEED_COLUMNS = [
+    "parent_user_id",
+    "starts_at",
+    "lesson_id",
+    "group_id",
+    "ends_at",
+    "topic",
+    "teacher_name",
+    "cabinet_text",
+    "status",
+    "students",
+]
+
+
+def _feed_rows(
+    lesson_ids: list[uuid.UUID] | None,
+    parent_user_ids: list[uuid.UUID] | None,
+    group_id: uuid.UUID | None = None,
+):
+    students = func.jsonb_agg(
+        aggregate_order_by(
+            func.jsonb_build_object(
+                "student_id",
+                cast(Student.id, String),
+                "first_name",
+                Student.first_name,
+                "last_name",
+                Student.last_name,
+                "father_name",
+                Student.father_name,
+                "will_go",
+                LessonParticipation.will_go,
+            ),
+            Student.last_name,
+            Student.first_name,
+            Student.id,
+        )
+    )
+    stmt = (
+        select(
+            Student.parent_user_id,
+            Lesson.starts_at,
+            Lesson.id,
+            Lesson.group_id,
+            Lesson.ends_at,
+            Lesson.topic,
+            Lesson.teacher_name,
+            Lesson.cabinet_text,
+            Lesson.status,
+            students,
+        )
+        .select_from(Lesson)
+        .join(Student, Student.group_id == Lesson.group_id)
+        .outerjoin(
+            LessonParticipation,
+            (LessonParticipation.lesson_id == Lesson.id) & (LessonParticipation.student_id == Student.id),
+        )
+        .group_by(Student.parent_user_id, Lesson.id)
+    )
+    if lesson_ids is not None:
+        stmt = stmt.where(Lesson.id.in_(lesson_ids))
+    if parent_user_ids is not None:
+        stmt = stmt.where(Student.parent_user_id.in_(parent_user_ids))
+    if group_id is not None:
+        stmt = stmt.where(Lesson.group_id == group_id)
+    return stmt
+
+
+async def _refresh(
+    session: AsyncSession,
+    lesson_ids: list[uuid.UUID] | None,
+    parent_user_ids: list[uuid.UUID] | None,
+    group_id: uuid.UUID | None = None,
+) -> None:
+    stmt = delete(ParentLessonFeedItem)
+    if lesson_ids is not None:
+        stmt = stmt.where(ParentLessonFeedItem.lesson_id.in_(lesson_ids))
+    if parent_user_ids is not None:
+        stmt = stmt.where(ParentLessonFeedItem.parent_user_id.in_(parent_user_ids))
+    if group_id is not None:
+        stmt = stmt.where(ParentLessonFeedItem.group_id == group_id)
+    await session.execute(stmt)
+
+    insert_stmt = insert(ParentLessonFeedItem).from_select(
+        _FEED_COLUMNS, _feed_rows(lesson_ids, parent_user_ids, group_id)
+    )
+    # A concurrent refresh of the same rows may have inserted them after our DELETE.
+    insert_stmt = insert_stmt.on_conflict_do_update(
+        index_elements=["parent_user_id", "starts_at", "lesson_id"],
+        set_={
+            **{name: insert_stmt.excluded[name] for name in _FEED_COLUMNS[3:]},
+            "updated_at": func.now(),
+        },
+    )
+    await session.execute(insert_stmt)
+
+
+async def refresh_feed_for_lessons(
+    session: AsyncSession,
+    lesson_ids: list[uuid.UUID],
+    parent_user_id: uuid.UUID | None = None,
+) -> None:
+    """Rebuild feed rows for the given lessons, optionally for one parent only. Does not commit."""
+    parent_user_ids = [parent_user_id] if parent_user_id is not None else None
+    for offset in range(0, len(lesson_ids), _CHUNK):
+        await _refresh(session, lesson_ids[offset : offset + _CHUNK], parent_user_ids)
+
+
+async def refresh_feed_for_parents(
+    session: AsyncSession,
+    parent_user_ids: list[uuid.UUID],
+    group_id: uuid.UUID | None = None,
+) -> None:
+    """Rebuild the feed of the given parents, optionally only one group's lessons. Does not commit.
+
+    A new child only adds its group's lessons (merged with any sibling already in that group), so
+    pass group_id then; the other lessons of the parent's feed are untouched.
+    """
+    for offset in range(0, len(parent_user_ids), _CHUNK):
+        await _refresh(session, None, parent_user_ids[offset : offset + _CHUNK], group_id)
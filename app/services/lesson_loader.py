@@ -0,0 +1,89 @@
+from collections.abc import Iterable, Iterator
+from itertools import islice
+import uuid
+
+from sqlalchemy import column, select, table, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.errors import BadRequest
+from app.core.settings import settings
+from app.models.lesson import Lesson
+
+LOAD_METHODS = ("values", "copy")
+
+_COLUMNS = ("group_id", "teacher_name", "cabinet_text", "starts_at", "ends_at", "status")
+# Six bind parameters per row keeps a VALUES chunk well under asyncpg's 32767 parameter limit.
+_VALUES_CHUNK = 1000
+
+_STAGING = "lesson_staging"
+_staging = table(_STAGING, *(column(name) for name in _COLUMNS))
+
+
+def _chunks(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _insert_new(stmt):
+    return stmt.on_conflict_do_nothing(index_elements=["group_id", "starts_at"]).returning(Lesson.id)
+
+
+async def _load_values(session: AsyncSession, rows: Iterable[dict]) -> tuple[int, list[uuid.UUID]]:
+    processed = 0
+    inserted: list[uuid.UUID] = []
+    for chunk in _chunks(rows, _VALUES_CHUNK):
+        result = await session.execute(_insert_new(insert(Lesson.__table__).values(chunk)))
+        inserted.extend(result.scalars().all())
+        processed += len(chunk)
+    return processed, inserted
+
+
+async def _load_copy(session: AsyncSession, rows: Iterable[dict]) -> tuple[int, list[uuid.UUID]]:
+    await session.execute(
+        text(
+            f"CREATE TEMP TABLE IF NOT EXISTS {_STAGING} ("
+            "group_id uuid NOT NULL, teacher_name varchar(200), cabinet_text text, "
+            "starts_at timestamptz NOT NULL, ends_at timestamptz NOT NULL, status varchar(20) NOT NULL"
+            ") ON COMMIT DROP"
+        )
+    )
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    driver = raw.driver_connection
+
+    merge = _insert_new(
+        insert(Lesson.__table__).from_select(
+            list(_COLUMNS),
+            select(*(_staging.c[name] for name in _COLUMNS)),
+        )
+    )
+
+    processed = 0
+    inserted: list[uuid.UUID] = []
+    for chunk in _chunks(rows, settings.LESSON_COPY_CHUNK_ROWS):
+        await driver.copy_records_to_table(
+            _STAGING,
+            records=[tuple(row[name] for name in _COLUMNS) for row in chunk],
+            columns=list(_COLUMNS),
+        )
+        result = await session.execute(merge)
+        inserted.extend(result.scalars().all())
+        await session.execute(text(f"TRUNCATE {_STAGING}"))
+        processed += len(chunk)
+    return processed, inserted
+
+
+async def load_lessons(session: AsyncSession, rows: Iterable[dict], method: str = "values") -> tuple[int, list[uuid.UUID]]:
+    """Insert lesson rows, skipping existing (group_id, starts_at), and return (rows processed, new ids).
+
+    ``rows`` is consumed lazily in bounded chunks. ``copy`` streams each chunk into a temporary staging
+    table with COPY and merges it with one INSERT ... SELECT; ``values`` sends chunked multi-row INSERTs.
+    Does not commit.
+    """
+    if method == "values":
+        return await _load_values(session, rows)
+    if method == "copy":
+        return await _load_copy(session, rows)
+    raise BadRequest("LOAD_METHOD_INVALID", f"method must be one of: {', '.join(LOAD_METHODS)}")
@@ -1,18 +1,27 @@
-from datetime import datetime, time, timedelta, timezone
+from collections.abc import Iterator
+from datetime import date, datetime, time, timedelta, timezone
+import hashlib
+import json
+from time import perf_counter
 from zoneinfo import ZoneInfo
 import uuid
 
-from sqlalchemy import select
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import Boolean, DateTime, cast, column, literal, select, values
+from sqlalchemy.dialects.postgresql import UUID, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.errors import BadRequest, Conflict, Forbidden, NotFound
 from app.core.pagination import decode_cursor, encode_cursor
 from app.core.settings import settings
+from app.core.tokens import Principal
 from app.models.group import Group
 from app.models.lesson import Lesson, LessonParticipation
+from app.models.parent_lesson_feed import ParentLessonFeedItem
 from app.models.student import Student
 from app.models.user import User
+from app.services.lesson_feed import refresh_feed_for_lessons
+from app.services.lesson_loader import load_lessons
+from app.services.parent_scope import in_parent_groups, parent_memberships
 
 
 def _parse_schedule_item(item: dict) -> tuple[int, time, int, str | None] | None:
@@ -69,6 +78,8 @@ async def create_lesson(
         status=status,
     )
     session.add(lesson)
+    await session.flush()
+    await refresh_feed_for_lessons(session, [lesson.id])
     await session.commit()
     return lesson
 
@@ -103,11 +114,59 @@ async def update_lesson(session: AsyncSession, lesson_id: uuid.UUID, data: dict)
     for key, value in data.items():
         setattr(lesson, key, value)
 
+    await session.flush()
+    await refresh_feed_for_lessons(session, [lesson.id])
     await session.commit()
     return lesson
 
 
-async def generate_lessons(session: AsyncSession, days: int = 30, actor_user_id: uuid.UUID | None = None) -> int:
+def schedule_fingerprint(schedule_json) -> str:
+    """Stable hash of a group's schedule in the configured timezone; changes force a full regeneration."""
+    canonical = json.dumps(schedule_json, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{settings.TIMEZONE}|{canonical}".encode()).hexdigest()
+
+
+def schedule_occurrences(
+    group_id: uuid.UUID,
+    schedule_json,
+    teacher_name: str | None,
+    start_date: date,
+    end_date: date,
+    tz: ZoneInfo,
+) -> Iterator[dict]:
+    """Yield lesson rows for every schedule slot between ``start_date`` and ``end_date`` (inclusive)."""
+    if not isinstance(schedule_json, list):
+        return
+    for item in schedule_json:
+        if not isinstance(item, dict):
+            continue
+        parsed = _parse_schedule_item(item)
+        if not parsed:
+            continue
+        weekday, start_time, duration_minutes, cabinet_text = parsed
+
+        current = start_date + timedelta(days=(weekday - start_date.isoweekday()) % 7)
+        while current <= end_date:
+            starts_at = datetime.combine(current, start_time, tzinfo=tz)
+            yield {
+                "group_id": group_id,
+                "teacher_name": teacher_name,
+                "cabinet_text": cabinet_text,
+                "starts_at": starts_at,
+                "ends_at": starts_at + timedelta(minutes=duration_minutes),
+                "status": "scheduled",
+            }
+            current += timedelta(days=7)
+
+
+async def generate_lessons_report(session: AsyncSession, days: int = 30, method: str = "values") -> dict:
+    """Materialize scheduled lessons up to ``today + days`` and report what was loaded.
+
+    Each group only generates dates past its ``lessons_generated_until`` watermark; a group whose
+    schedule fingerprint changed (or that was never generated) starts again from today. Rows are
+    produced lazily and loaded with ``method`` (see ``load_lessons``).
+    """
+    started = perf_counter()
     tz = ZoneInfo(settings.TIMEZONE)
     today = datetime.now(tz).date()
     end_date = today + timedelta(days=days)
@@ -115,49 +174,45 @@ async def generate_lessons(session: AsyncSession, days: int = 30, actor_user_id:
     groups_result = await session.execute(select(Group).where(Group.is_active.is_(True)))
     groups = groups_result.scalars().all()
 
-    rows: list[dict] = []
+    windows: list[tuple[Group, date]] = []
     for group in groups:
-        if not isinstance(group.schedule_json, list):
-            continue
-        for item in group.schedule_json:
-            if not isinstance(item, dict):
-                continue
-            parsed = _parse_schedule_item(item)
-            if not parsed:
-                continue
-            weekday, start_time, duration_minutes, cabinet_text = parsed
-
-            days_ahead = (weekday - today.isoweekday()) % 7
-            current = today + timedelta(days=days_ahead)
-
-            while current <= end_date:
-                starts_at = datetime.combine(current, start_time, tzinfo=tz)
-                ends_at = starts_at + timedelta(minutes=duration_minutes)
-                rows.append(
-                    {
-                        "group_id": group.id,
-                        "teacher_name": group.default_teacher_name,
-                        "cabinet_text": cabinet_text,
-                        "starts_at": starts_at,
-                        "ends_at": ends_at,
-                        "status": "scheduled",
-                    }
-                )
-                current += timedelta(days=7)
-
-    if not rows:
-        return 0
-
-    stmt = (
-        insert(Lesson.__table__)
-        .values(rows)
-        .on_conflict_do_nothing(index_elements=["group_id", "starts_at"])
-        .returning(Lesson.id)
+        fingerprint = schedule_fingerprint(group.schedule_json)
+        if group.schedule_fingerprint == fingerprint and group.lessons_generated_until is not None:
+            start_date = max(today, group.lessons_generated_until + timedelta(days=1))
+            generated_until = max(group.lessons_generated_until, end_date)
+        else:
+            start_date = today
+            generated_until = end_date
+
+        if start_date <= end_date:
+            windows.append((group, start_date))
+        group.lessons_generated_until = generated_until
+        group.schedule_fingerprint = fingerprint
+
+    rows = (
+        row
+        for group, start_date in windows
+        for row in schedule_occurrences(
+            group.id, group.schedule_json, group.default_teacher_name, start_date, end_date, tz
+        )
     )
-    result = await session.execute(stmt)
-    inserted = result.all()
+    processed, inserted = await load_lessons(session, rows, method)
+    await refresh_feed_for_lessons(session, inserted)
     await session.commit()
-    return len(inserted)
+
+    seconds = perf_counter() - started
+    return {
+        "method": method,
+        "processed": processed,
+        "created": len(inserted),
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(processed / seconds, 1) if seconds else 0.0,
+    }
+
+
+async def generate_lessons(session: AsyncSession, days: int = 30, actor_user_id: uuid.UUID | None = None) -> int:
+    report = await generate_lessons_report(session, days=days)
+    return report["created"]
 
 
 async def list_parent_lessons(
@@ -168,12 +223,11 @@ async def list_parent_lessons(
 ):
     limit = max(1, min(limit, 50))
 
+    # parent_lesson_feed's primary key (parent_user_id, starts_at, lesson_id) serves this as one range scan.
     stmt = (
-        select(Lesson)
-        .join(Student, Student.group_id == Lesson.group_id)
-        .where(Student.parent_user_id == user_id)
-        .distinct()
-        .order_by(Lesson.starts_at.desc(), Lesson.id.desc())
+        select(ParentLessonFeedItem)
+        .where(ParentLessonFeedItem.parent_user_id == user_id)
+        .order_by(ParentLessonFeedItem.starts_at.desc(), ParentLessonFeedItem.lesson_id.desc())
         .limit(limit)
     )
 
@@ -183,80 +237,43 @@ async def list_parent_lessons(
         except Exception as exc:
             raise BadRequest("CURSOR_INVALID", "Invalid cursor") from exc
         stmt = stmt.where(
-            (Lesson.starts_at < starts_at) | ((Lesson.starts_at == starts_at) & (Lesson.id < lesson_id))
+            (ParentLessonFeedItem.starts_at < starts_at)
+            | ((ParentLessonFeedItem.starts_at == starts_at) & (ParentLessonFeedItem.lesson_id < lesson_id))
         )
 
     result = await session.execute(stmt)
-    lessons = result.scalars().all()
-
-    if not lessons:
-        return [], None
-
-    lesson_ids = [lesson.id for lesson in lessons]
-
-    rows = await session.execute(
-        select(
-            Lesson.id,
-            Student.id,
-            Student.first_name,
-            Student.last_name,
-            Student.father_name,
-            LessonParticipation.will_go,
-        )
-        .join(Student, Student.group_id == Lesson.group_id)
-        .outerjoin(
-            LessonParticipation,
-            (LessonParticipation.lesson_id == Lesson.id) & (LessonParticipation.student_id == Student.id),
-        )
-        .where(Student.parent_user_id == user_id, Lesson.id.in_(lesson_ids))
-    )
-
-    students_map: dict[uuid.UUID, list[dict]] = {}
-    for lesson_id, student_id, first_name, last_name, father_name, will_go in rows.all():
-        students_map.setdefault(lesson_id, []).append(
-            {
-                "student_id": student_id,
-                "first_name": first_name,
-                "last_name": last_name,
-                "father_name": father_name,
-                "will_go": will_go,
-            }
-        )
-
-    items = []
-    for lesson in lessons:
-        items.append(
-            {
-                "id": lesson.id,
-                "group_id": lesson.group_id,
-                "starts_at": lesson.starts_at,
-                "ends_at": lesson.ends_at,
-                "topic": lesson.topic,
-                "teacher_name": lesson.teacher_name,
-                "cabinet_text": lesson.cabinet_text,
-                "status": lesson.status,
-                "students": students_map.get(lesson.id, []),
-            }
-        )
+    rows = result.scalars().all()
+
+    items = [
+        {
+            "id": row.lesson_id,
+            "group_id": row.group_id,
+            "starts_at": row.starts_at,
+            "ends_at": row.ends_at,
+            "topic": row.topic,
+            "teacher_name": row.teacher_name,
+            "cabinet_text": row.cabinet_text,
+            "status": row.status,
+            "students": [
+                {**student, "student_id": uuid.UUID(student["student_id"])} for student in row.students
+            ],
+        }
+        for row in rows
+    ]
 
     next_cursor = None
-    if len(lessons) == limit:
-        last = lessons[-1]
-        next_cursor = encode_cursor(last.starts_at, last.id)
+    if len(rows) == limit:
+        last = rows[-1]
+        next_cursor = encode_cursor(last.starts_at, last.lesson_id)
 
     return items, next_cursor
 
 
-def _lessons_query_for_user(user: User):
+def _lessons_query_for_user(user: User | Principal):
     if user.user_type == "admin":
         return select(Lesson)
     if user.user_type == "parent":
-        return (
-            select(Lesson)
-            .join(Student, Student.group_id == Lesson.group_id)
-            .where(Student.parent_user_id == user.id)
-            .distinct()
-        )
+        return select(Lesson).where(in_parent_groups(Lesson.group_id, user.id))
     raise Forbidden("FORBIDDEN", "Forbidden")
 
 
@@ -296,7 +313,7 @@ def _apply_cursor_asc(stmt, cursor: str | None):
 
 async def list_lessons_for_user(
     session: AsyncSession,
-    user: User,
+    user: User | Principal,
     limit: int,
     cursor: str | None,
 ):
@@ -319,7 +336,7 @@ async def list_lessons_for_user(
 
 async def list_lessons_in_range(
     session: AsyncSession,
-    user: User,
+    user: User | Principal,
     start_at: datetime,
     end_at: datetime,
     limit: int,
@@ -347,7 +364,7 @@ async def list_lessons_in_range(
     return items, next_cursor
 
 
-async def get_lesson_for_user(session: AsyncSession, user: User, lesson_id: uuid.UUID) -> Lesson:
+async def get_lesson_for_user(session: AsyncSession, user: User | Principal, lesson_id: uuid.UUID) -> Lesson:
     lesson = await session.get(Lesson, lesson_id)
     if not lesson:
         raise NotFound("LESSON_NOT_FOUND", "Lesson not found")
@@ -357,14 +374,19 @@ async def get_lesson_for_user(session: AsyncSession, user: User, lesson_id: uuid
     if user.user_type != "parent":
         raise Forbidden("FORBIDDEN", "Forbidden")
 
-    result = await session.execute(
-        select(Student.id).where(Student.parent_user_id == user.id, Student.group_id == lesson.group_id).limit(1)
-    )
-    if not result.scalar_one_or_none():
+    membership = await parent_memberships.get(session, user.id)
+    if lesson.group_id not in membership.group_ids:
         raise Forbidden("FORBIDDEN", "Forbidden")
     return lesson
 
 
+async def _refuse_stale_membership(session: AsyncSession, user_id: uuid.UUID) -> None:
+    """A guarded write matched no student: the cached membership was stale. Drop it and refuse."""
+    await session.rollback()
+    parent_memberships.invalidate(user_id)
+    raise Forbidden("FORBIDDEN", "Student does not belong to parent")
+
+
 async def upsert_will_go(
     session: AsyncSession,
     user_id: uuid.UUID,
@@ -372,31 +394,89 @@ async def upsert_will_go(
     student_id: uuid.UUID,
     will_go: bool | None,
 ) -> LessonParticipation:
-    student = await session.get(Student, student_id)
-    if not student or student.parent_user_id != user_id:
+    membership = await parent_memberships.get(session, user_id, expect_students=[student_id])
+    student_group_id = membership.students.get(student_id)
+    if student_group_id is None:
         raise Forbidden("FORBIDDEN", "Student does not belong to parent")
 
     lesson = await session.get(Lesson, lesson_id)
     if not lesson:
         raise NotFound("LESSON_NOT_FOUND", "Lesson not found")
-    if student.group_id != lesson.group_id:
+    if student_group_id != lesson.group_id:
         raise BadRequest("LESSON_NOT_IN_CHILD_GROUP", "Lesson not in child group")
 
-    stmt = insert(LessonParticipation).values(
-        lesson_id=lesson_id,
-        student_id=student_id,
-        will_go=will_go,
-        updated_at=datetime.now(timezone.utc),
-    )
+    # The cached membership may predate a move or delete made elsewhere, so the row is only written
+    # if students still says this child belongs to the parent and the lesson's group.
+    owned = select(
+        literal(lesson_id, UUID(as_uuid=True)),
+        Student.id,
+        literal(will_go, Boolean),
+        literal(datetime.now(timezone.utc), DateTime(timezone=True)),
+    ).where(Student.id == student_id, Student.parent_user_id == user_id, Student.group_id == lesson.group_id)
+    stmt = insert(LessonParticipation).from_select(["lesson_id", "student_id", "will_go", "updated_at"], owned)
     stmt = stmt.on_conflict_do_update(
         index_elements=["lesson_id", "student_id"],
-        set_={
-            "will_go": will_go,
-            "updated_at": datetime.now(timezone.utc),
-        },
+        set_={"will_go": stmt.excluded.will_go, "updated_at": stmt.excluded.updated_at},
     ).returning(LessonParticipation.lesson_id, LessonParticipation.student_id)
 
-    await session.execute(stmt)
+    if (await session.execute(stmt)).first() is None:
+        await _refuse_stale_membership(session, user_id)
+    await refresh_feed_for_lessons(session, [lesson_id], parent_user_id=user_id)
     await session.commit()
 
     return await session.get(LessonParticipation, (lesson_id, student_id))
+
+
+async def upsert_will_go_batch(session: AsyncSession, user_id: uuid.UUID, items: list[dict]) -> list[dict]:
+    """Set will_go for many (lesson, student) pairs: one lesson lookup, one guarded upsert, one commit.
+
+    The batch is all-or-nothing and fails with the same errors as ``upsert_will_go``. When a pair
+    appears more than once the last value wins.
+    """
+    answers = {(item["lesson_id"], item["student_id"]): item["will_go"] for item in items}
+    student_ids = {student_id for _, student_id in answers}
+    lesson_ids = {lesson_id for lesson_id, _ in answers}
+
+    student_groups = (await parent_memberships.get(session, user_id, expect_students=student_ids)).students
+    if not student_ids <= student_groups.keys():
+        raise Forbidden("FORBIDDEN", "Student does not belong to parent")
+
+    lessons = await session.execute(select(Lesson.id, Lesson.group_id).where(Lesson.id.in_(lesson_ids)))
+    lesson_groups = dict(lessons.all())
+    if len(lesson_groups) != len(lesson_ids):
+        raise NotFound("LESSON_NOT_FOUND", "Lesson not found")
+    if any(lesson_groups[lesson_id] != student_groups[student_id] for lesson_id, student_id in answers):
+        raise BadRequest("LESSON_NOT_IN_CHILD_GROUP", "Lesson not in child group")
+
+    answer_rows = values(
+        column("lesson_id", UUID(as_uuid=True)),
+        column("student_id", UUID(as_uuid=True)),
+        column("will_go", Boolean),
+        name="answers",
+    ).data([(lesson_id, student_id, will_go) for (lesson_id, student_id), will_go in answers.items()])
+    # As in upsert_will_go, ownership is re-checked against students inside the statement.
+    owned = (
+        select(
+            answer_rows.c.lesson_id,
+            answer_rows.c.student_id,
+            # An all-NULL VALUES column would otherwise be typed as text.
+            cast(answer_rows.c.will_go, Boolean),
+            literal(datetime.now(timezone.utc), DateTime(timezone=True)),
+        )
+        .join(Student, Student.id == answer_rows.c.student_id)
+        .join(Lesson, Lesson.id == answer_rows.c.lesson_id)
+        .where(Student.parent_user_id == user_id, Student.group_id == Lesson.group_id)
+    )
+    stmt = insert(LessonParticipation).from_select(["lesson_id", "student_id", "will_go", "updated_at"], owned)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["lesson_id", "student_id"],
+        set_={"will_go": stmt.excluded.will_go, "updated_at": stmt.excluded.updated_at},
+    ).returning(LessonParticipation.lesson_id, LessonParticipation.student_id, LessonParticipation.will_go)
+
+    result = await session.execute(stmt)
+    rows = [dict(row._mapping) for row in result.all()]
+    if len(rows) != len(answers):
+        await _refuse_stale_membership(session, user_id)
+    await refresh_feed_for_lessons(session, list(lesson_ids), parent_user_id=user_id)
+    await session.commit()
+    return rows
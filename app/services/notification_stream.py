@@ -0,0 +1,198 @@
+import asyncio
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+import json
+import uuid
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.listener import PgListener, pg_listener
+from app.core.settings import settings
+from app.models.notification import Notification
+from app.schemas.notification import NotificationOut
+
+# Fired by the notifications AFTER INSERT trigger with {"id": ..., "user_id": ...}.
+CHANNEL = "notifications_created"
+# Queued instead of a notification id when events may have been lost; the stream re-queries instead.
+RESYNC = None
+
+
+class NotificationBroker:
+    """Fans NOTIFY events from the shared listener out to per-user subscriber queues."""
+
+    def __init__(self, listener: PgListener) -> None:
+        self.listener = listener
+        self._subscribers: dict[uuid.UUID, set[asyncio.Queue]] = {}
+        self._listening = False
+        self._listen_lock = asyncio.Lock()
+        self.dropped = 0
+
+    async def subscribe(self, user_id: uuid.UUID) -> asyncio.Queue:
+        if not self._listening:
+            async with self._listen_lock:
+                if not self._listening:
+                    await self.listener.add(CHANNEL, self._on_notify)
+                    self._listening = True
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.NOTIFICATION_STREAM_QUEUE_SIZE)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: uuid.UUID, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+
+    def close(self) -> None:
+        """Stop receiving events; the next subscribe registers with the listener again."""
+        if self._listening:
+            self.listener.remove(CHANNEL, self._on_notify)
+            self._listening = False
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self._subscribers),
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+            "dropped": self.dropped,
+            "listener": self.listener.stats(),
+        }
+
+    def _on_notify(self, payload: str | None) -> None:
+        if payload is None:
+            # The listener (re)connected: anything created while it was down was never announced.
+            for queues in self._subscribers.values():
+                for queue in queues:
+                    self._put(queue, RESYNC)
+            return
+        event = json.loads(payload)
+        queues = self._subscribers.get(uuid.UUID(event["user_id"]))
+        if not queues:
+            return
+        notification_id = uuid.UUID(event["id"])
+        for queue in queues:
+            self._put(queue, notification_id)
+
+    def _put(self, queue: asyncio.Queue, item: uuid.UUID | None) -> None:
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # A stalled client does not grow memory: its backlog collapses into one resync, which re-reads
+            # everything after the last notification it was sent.
+            self.dropped += 1
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC)
+
+
+notification_broker = NotificationBroker(pg_listener)
+
+
+async def _load_notifications(
+    session_factory: async_sessionmaker[AsyncSession],
+    user_id: uuid.UUID,
+    ids: list[uuid.UUID],
+) -> list[Notification]:
+    async with session_factory() as session:
+        result = await session.execute(
+            select(Notification)
+            .where(Notification.id.in_(ids), Notification.user_id == user_id)
+            .order_by(Notification.created_at, Notification.id)
+        )
+        return list(result.scalars().all())
+
+
+async def _load_after(
+    session_factory: async_sessionmaker[AsyncSession],
+    user_id: uuid.UUID,
+    after: tuple[datetime, uuid.UUID],
+    limit: int,
+) -> list[Notification]:
+    async with session_factory() as session:
+        result = await session.execute(
+            select(Notification)
+            .where(Notification.user_id == user_id, tuple_(Notification.created_at, Notification.id) > after)
+            .order_by(Notification.created_at, Notification.id)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+
+async def _resume_point(
+    session_factory: async_sessionmaker[AsyncSession],
+    user_id: uuid.UUID,
+    last_event_id: uuid.UUID | None,
+) -> tuple[datetime, uuid.UUID] | None:
+    """``(created_at, id)`` of the client's ``Last-Event-ID``, if it is one of the user's notifications."""
+    if last_event_id is None:
+        return None
+    async with session_factory() as session:
+        created_at = (
+            await session.execute(
+                select(Notification.created_at).where(Notification.id == last_event_id, Notification.user_id == user_id)
+            )
+        ).scalar_one_or_none()
+    return (created_at, last_event_id) if created_at is not None else None
+
+
+async def stream_notifications(
+    session_factory: async_sessionmaker[AsyncSession],
+    user_id: uuid.UUID,
+    last_event_id: uuid.UUID | None = None,
+    broker: NotificationBroker = notification_broker,
+) -> AsyncIterator[str]:
+    """Yield SSE frames for new notifications; a database session is only held while loading a batch.
+
+    Subscribing here rather than in the route ties the queue to the body: if the client disconnects
+    before streaming starts, nothing was registered. A known ``last_event_id`` first replays what was
+    created after it. Whenever the broker signals a resync (listener reconnect, overflowing queue) the
+    stream re-reads everything after the newest notification it has sent, a page at a time.
+    """
+    queue = await broker.subscribe(user_id)
+    page_size = settings.NOTIFICATION_STREAM_QUEUE_SIZE
+    try:
+        yield f"retry: {settings.NOTIFICATION_STREAM_RETRY_MS}\n\n"
+        after = await _resume_point(session_factory, user_id, last_event_id)
+        if after is None:
+            after = (datetime.now(timezone.utc), uuid.UUID(int=0))
+            resync = False
+        else:
+            resync = True
+        # Ids sent recently, oldest first: a replayed notification's own NOTIFY may still be queued.
+        recent: dict[uuid.UUID, None] = {}
+        while True:
+            if not resync:
+                try:
+                    first = await asyncio.wait_for(queue.get(), timeout=settings.NOTIFICATION_STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                items = [first]
+            else:
+                items = []
+            while not queue.empty():
+                items.append(queue.get_nowait())
+            resync = resync or RESYNC in items
+            ids = [item for item in items if item is not RESYNC]
+
+            notifications = await _load_notifications(session_factory, user_id, ids) if ids else []
+            if resync:
+                replayed = await _load_after(session_factory, user_id, after, page_size)
+                # A full page means there may be more; keep resyncing before waiting on the queue again.
+                resync = len(replayed) == page_size
+                seen = {notification.id for notification in notifications}
+                notifications += [notification for notification in replayed if notification.id not in seen]
+                notifications.sort(key=lambda notification: (notification.created_at, notification.id))
+            for notification in notifications:
+                if notification.id in recent:
+                    continue
+                recent[notification.id] = None
+                if len(recent) > page_size:
+                    del recent[next(iter(recent))]
+                after = max(after, (notification.created_at, notification.id))
+                data = NotificationOut.model_validate(notification).model_dump_json()
+                yield f"id: {notification.id}\nevent: notification\ndata: {data}\n\n"
+    finally:
+        broker.unsubscribe(user_id, queue)
@@ -1,13 +1,15 @@
+from collections import Counter
 from datetime import datetime, timedelta, timezone
 import uuid
 
-from sqlalchemy import select
+from sqlalchemy import DateTime, String, cast, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.errors import BadRequest
 from app.core.pagination import decode_cursor, encode_cursor
 from app.models.lesson import Lesson
-from app.models.notification import Notification
+from app.models.notification import Notification, NotificationCounter
 from app.models.student import Student
 
 
@@ -40,63 +42,138 @@ async def list_notifications(session: AsyncSession, user_id: uuid.UUID, limit: i
     return items, next_cursor
 
 
+async def _increment_unread(session: AsyncSession, counts: dict[uuid.UUID, int]) -> None:
+    if not counts:
+        return
+    # Sorted so concurrent producers lock counter rows in the same order.
+    stmt = insert(NotificationCounter).values(
+        [{"user_id": user_id, "unread": count} for user_id, count in sorted(counts.items())]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={"unread": NotificationCounter.unread + stmt.excluded.unread},
+    )
+    await session.execute(stmt)
+
+
+async def _decrement_unread(session: AsyncSession, user_id: uuid.UUID, count: int) -> None:
+    if not count:
+        return
+    await session.execute(
+        update(NotificationCounter)
+        .where(NotificationCounter.user_id == user_id)
+        .values(unread=func.greatest(NotificationCounter.unread - count, 0))
+    )
+
+
+async def get_unread_count(session: AsyncSession, user_id: uuid.UUID) -> int:
+    result = await session.execute(select(NotificationCounter.unread).where(NotificationCounter.user_id == user_id))
+    return result.scalar_one_or_none() or 0
+
+
 async def mark_read(session: AsyncSession, user_id: uuid.UUID, notification_id: uuid.UUID) -> Notification | None:
+    # Conditional UPDATE so concurrent calls for the same notification decrement the counter once.
+    changed = await session.execute(
+        update(Notification)
+        .where(
+            Notification.id == notification_id,
+            Notification.user_id == user_id,
+            Notification.status != "read",
+        )
+        .values(status="read", read_at=datetime.now(timezone.utc))
+        .returning(Notification.id)
+        .execution_options(synchronize_session=False)
+    )
+    if changed.first() is not None:
+        await _decrement_unread(session, user_id, 1)
+        await session.commit()
+
+    result = await session.execute(
+        select(Notification)
+        .where(Notification.id == notification_id, Notification.user_id == user_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+
+async def mark_all_read(session: AsyncSession, user_id: uuid.UUID) -> int:
     result = await session.execute(
-        select(Notification).where(Notification.id == notification_id, Notification.user_id == user_id)
+        update(Notification)
+        .where(Notification.user_id == user_id, Notification.status != "read")
+        .values(status="read", read_at=datetime.now(timezone.utc))
+        .returning(Notification.id)
+        .execution_options(synchronize_session=False)
     )
-    notification = result.scalar_one_or_none()
-    if not notification:
-        return None
-    notification.status = "read"
-    notification.read_at = datetime.now(timezone.utc)
+    marked = len(result.all())
+    # Subtract what was marked instead of zeroing, so notifications committed meanwhile keep their count.
+    await _decrement_unread(session, user_id, marked)
     await session.commit()
-    return notification
+    return marked
+
+
+def on_dedup_conflict_do_nothing(stmt):
+    """Make a notifications INSERT idempotent on (user_id, type, dedup_key); rows without a key always insert."""
+    return stmt.on_conflict_do_nothing(
+        index_elements=["user_id", "type", "dedup_key"],
+        index_where=Notification.dedup_key.isnot(None),
+    )
+
+
+async def create_notifications(session: AsyncSession, rows: list[dict]) -> list[uuid.UUID]:
+    """Insert notification rows, skipping those whose dedup_key already exists, and bump unread counters.
+
+    Does not commit.
+    """
+    if not rows:
+        return []
+    result = await session.execute(
+        on_dedup_conflict_do_nothing(insert(Notification).values(rows)).returning(
+            Notification.id, Notification.user_id, Notification.status
+        )
+    )
+    created = result.all()
+    await _increment_unread(session, Counter(row.user_id for row in created if row.status != "read"))
+    return [row.id for row in created]
 
 
 async def enqueue_lesson_reminders(session: AsyncSession) -> int:
+    """Insert one reminder per (parent, lesson) starting in 23-25h with a single INSERT ... SELECT."""
     now = datetime.now(timezone.utc)
     window_start = now + timedelta(hours=23)
     window_end = now + timedelta(hours=25)
 
-    lessons_result = await session.execute(
-        select(Lesson).where(Lesson.starts_at >= window_start, Lesson.starts_at <= window_end)
+    targets = (
+        select(
+            Student.parent_user_id.label("user_id"),
+            Lesson.id.label("lesson_id"),
+            Lesson.group_id.label("group_id"),
+        )
+        .join(Student, Student.group_id == Lesson.group_id)
+        .where(Lesson.starts_at >= window_start, Lesson.starts_at <= window_end)
+        .distinct()
+        .subquery()
+    )
+    lesson_key = cast(targets.c.lesson_id, String)
+    rows = select(
+        targets.c.user_id,
+        literal("lesson_reminder", String),
+        literal("Lesson reminder", String),
+        literal("Lesson starts soon", String),
+        func.jsonb_build_object("lesson_id", lesson_key, "group_id", cast(targets.c.group_id, String)),
+        literal("queued", String),
+        literal(now, DateTime(timezone=True)),
+        lesson_key,
     )
-    lessons = lessons_result.scalars().all()
 
-    created = 0
-    for lesson in lessons:
-        parent_rows = await session.execute(
-            select(Student.parent_user_id).where(Student.group_id == lesson.group_id).distinct()
-        )
-        user_ids = [row[0] for row in parent_rows.all()]
-        if not user_ids:
-            continue
-
-        existing = await session.execute(
-            select(Notification.user_id)
-            .where(
-                Notification.user_id.in_(user_ids),
-                Notification.type == "lesson_reminder",
-                Notification.payload["lesson_id"].astext == str(lesson.id),
-            )
-        )
-        existing_user_ids = {row[0] for row in existing.all()}
-
-        for user_id in user_ids:
-            if user_id in existing_user_ids:
-                continue
-            session.add(
-                Notification(
-                    user_id=user_id,
-                    type="lesson_reminder",
-                    title="Lesson reminder",
-                    body="Lesson starts soon",
-                    payload={"lesson_id": str(lesson.id), "group_id": str(lesson.group_id)},
-                    status="queued",
-                    scheduled_at=now,
-                )
+    result = await session.execute(
+        on_dedup_conflict_do_nothing(
+            insert(Notification).from_select(
+                ["user_id", "type", "title", "body", "payload", "status", "scheduled_at", "dedup_key"],
+                rows,
             )
-            created += 1
-
+        ).returning(Notification.user_id)
+    )
+    created = result.scalars().all()
+    await _increment_unread(session, Counter(created))
     await session.commit()
-    return created
+    return len(created)
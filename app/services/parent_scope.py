@@ -0,0 +1,79 @@
+from collections.abc import Collection, Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import NotifyLRUCache
+from app.core.listener import PgListener, pg_listener
+from app.core.settings import settings
+from app.models.student import Student
+
+# Fired by triggers on students with the parent_user_id whose children were added, moved or removed.
+CHANNEL = "students_changed"
+
+
+def parent_group_ids(parent_user_id: uuid.UUID):
+    """``SELECT group_id FROM students WHERE parent_user_id = ...`` for use as a semi-join."""
+    return select(Student.group_id).where(Student.parent_user_id == parent_user_id)
+
+
+def in_parent_groups(group_column, parent_user_id: uuid.UUID):
+    """Restrict rows to groups where the parent has a child.
+
+    Unlike ``JOIN students ... DISTINCT`` a semi-join never multiplies rows, so ``ORDER BY ... LIMIT``
+    can walk an ordered index and stop after ``limit`` matches instead of sorting the whole set.
+    """
+    return group_column.in_(parent_group_ids(parent_user_id))
+
+
+@dataclass(frozen=True, slots=True)
+class ParentMembership:
+    # student id -> group id; read-only because the instance is shared by every request hitting the cache.
+    students: Mapping[uuid.UUID, uuid.UUID]
+    group_ids: frozenset[uuid.UUID]
+
+
+class ParentMembershipCache(NotifyLRUCache):
+    """Per-process index of which students (and so which groups) each parent has.
+
+    Point authorization checks become set lookups instead of a ``students`` query per request. Entries
+    can lag changes made by other processes until their NOTIFY arrives, so writes must re-check
+    ownership in the statement itself (see ``upsert_will_go``), and list queries use the uncached
+    ``in_parent_groups`` semi-join.
+    """
+
+    def __init__(self, listener: PgListener, max_entries: int, ttl_seconds: float) -> None:
+        super().__init__("parent_membership", listener, CHANNEL, uuid.UUID, max_entries, ttl_seconds)
+
+    async def get(
+        self,
+        session: AsyncSession,
+        parent_user_id: uuid.UUID,
+        expect_students: Collection[uuid.UUID] = (),
+    ) -> ParentMembership:
+        """The parent's membership, reloaded once if it lacks any of ``expect_students``.
+
+        The reload keeps a child just added through another process from being refused while its
+        NOTIFY is still in flight.
+        """
+        membership = await self.get_or_load(parent_user_id, lambda: _load_membership(session, parent_user_id))
+        if any(student_id not in membership.students for student_id in expect_students):
+            self.invalidate(parent_user_id)
+            membership = await self.get_or_load(parent_user_id, lambda: _load_membership(session, parent_user_id))
+        return membership
+
+
+async def _load_membership(session: AsyncSession, parent_user_id: uuid.UUID) -> ParentMembership:
+    result = await session.execute(
+        select(Student.id, Student.group_id).where(Student.parent_user_id == parent_user_id)
+    )
+    students = dict(result.all())
+    return ParentMembership(students=MappingProxyType(students), group_ids=frozenset(students.values()))
+
+
+parent_memberships = ParentMembershipCache(
+    pg_listener, settings.PARENT_CACHE_MAX_ENTRIES, settings.PARENT_CACHE_TTL_SECONDS
+)
@@ -1,7 +1,8 @@
 from datetime import datetime, timezone
 import uuid
 
-from sqlalchemy import desc, select
+from sqlalchemy import String, desc, literal, select
+from sqlalchemy.dialects.postgresql import UUID, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.errors import BadRequest, Forbidden, NotFound
@@ -9,6 +10,7 @@ from app.core.pagination import decode_cursor, encode_cursor
 from app.models.lesson import Lesson
 from app.models.payment import Payment
 from app.models.student import Student
+from app.services.parent_scope import parent_memberships
 
 
 async def create_payment(
@@ -21,30 +23,51 @@ async def create_payment(
     student_id: uuid.UUID,
     lesson_id: uuid.UUID,
 ) -> Payment:
-    student = await session.get(Student, student_id)
-    if not student or student.parent_user_id != user_id:
+    membership = await parent_memberships.get(session, user_id, expect_students=[student_id])
+    student_group_id = membership.students.get(student_id)
+    if student_group_id is None:
         raise Forbidden("FORBIDDEN", "Student does not belong to parent")
 
     lesson = await session.get(Lesson, lesson_id)
     if not lesson:
         raise NotFound("LESSON_NOT_FOUND", "Lesson not found")
-    if lesson.group_id != student.group_id:
+    if lesson.group_id != student_group_id:
         raise BadRequest("LESSON_NOT_IN_CHILD_GROUP", "Lesson not in child group")
 
-    payment = Payment(
-        parent_user_id=user_id,
-        student_id=student_id,
-        group_id=student.group_id,
-        lesson_id=lesson_id,
-        amount_cents=amount_cents,
-        currency=currency,
-        provider=provider,
-        provider_payment_id=provider_payment_id,
-        status="pending",
-    )
-    session.add(payment)
+    # The membership may be cached from before a move or delete made elsewhere; the payment is only
+    # inserted if students still ties this child to the parent and the lesson's group.
+    owned = select(
+        literal(user_id, UUID(as_uuid=True)),
+        Student.id,
+        Student.group_id,
+        literal(lesson_id, UUID(as_uuid=True)),
+        literal(amount_cents),
+        literal(currency, String),
+        literal(provider, String),
+        literal(provider_payment_id, String),
+        literal("pending", String),
+    ).where(Student.id == student_id, Student.parent_user_id == user_id, Student.group_id == lesson.group_id)
+    stmt = insert(Payment).from_select(
+        [
+            "parent_user_id",
+            "student_id",
+            "group_id",
+            "lesson_id",
+            "amount_cents",
+            "currency",
+            "provider",
+            "provider_payment_id",
+            "status",
+        ],
+        owned,
+    ).returning(Payment.id)
+    payment_id = (await session.execute(stmt)).scalar_one_or_none()
+    if payment_id is None:
+        await session.rollback()
+        parent_memberships.invalidate(user_id)
+        raise Forbidden("FORBIDDEN", "Student does not belong to parent")
     await session.commit()
-    return payment
+    return await session.get(Payment, payment_id)
 
 
 async def handle_webhook(session: AsyncSession, provider: str, payload) -> Payment:
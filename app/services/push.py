@@ -0,0 +1,68 @@
+from abc import ABC, abstractmethod
+import logging
+import uuid
+
+from app.core.settings import settings
+
+logger = logging.getLogger("push")
+
+
+class PushBackend(ABC):
+    """Delivers notifications to device tokens.
+
+    ``send`` receives ``(notification_id, tokens, title, body, payload)`` tuples and returns the ids of
+    notifications that reached at least one device.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def send(self, messages: list[tuple[uuid.UUID, list[str], str | None, str | None, dict]]) -> set[uuid.UUID]:
+        """Deliver a batch; raise only when the whole batch could not be attempted (e.g. provider down)."""
+
+
+class LogPushBackend(PushBackend):
+    """Writes each delivery to the log; the default until a real provider is configured."""
+
+    name = "log"
+
+    async def send(self, messages):
+        delivered = set()
+        for notification_id, tokens, title, _body, _payload in messages:
+            logger.info(
+                "push",
+                extra={"notification_id": str(notification_id), "tokens": len(tokens), "title": title},
+            )
+            delivered.add(notification_id)
+        return delivered
+
+
+class FakePushBackend(PushBackend):
+    """Records messages in memory. Tokens listed in ``failing_tokens`` are treated as undeliverable."""
+
+    name = "fake"
+
+    def __init__(self, failing_tokens: set[str] | None = None) -> None:
+        self.failing_tokens = failing_tokens or set()
+        self.sent: list[tuple[uuid.UUID, str]] = []
+
+    async def send(self, messages):
+        delivered = set()
+        for notification_id, tokens, _title, _body, _payload in messages:
+            for token in tokens:
+                if token in self.failing_tokens:
+                    continue
+                self.sent.append((notification_id, token))
+                delivered.add(notification_id)
+        return delivered
+
+
+_BACKENDS = {backend.name: backend for backend in (LogPushBackend, FakePushBackend)}
+
+
+def get_push_backend(name: str | None = None) -> PushBackend:
+    name = name or settings.PUSH_BACKEND
+    try:
+        return _BACKENDS[name]()
+    except KeyError as exc:
+        raise ValueError(f"Unknown push backend: {name}") from exc
@@ -0,0 +1,117 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.settings import settings
+from app.models.group import Group
+from app.models.lesson import Lesson
+from app.services.lesson_feed import refresh_feed_for_lessons
+from app.services.lesson_loader import load_lessons
+from app.services.lessons import schedule_occurrences
+
+_COMPARED = ("starts_at", "ends_at", "teacher_name", "cabinet_text")
+
+
+async def plan_schedule_changes(
+    session: AsyncSession,
+    group: Group,
+    schedule_json: list[dict],
+    teacher_name: str | None,
+) -> dict:
+    """Diff a (new) schedule against the group's future scheduled lessons up to its generation watermark.
+
+    Lessons already at a scheduled time are kept and only updated where fields differ. Within a local
+    day, leftover lessons are moved onto new slots before anything is cancelled or inserted, so will-go
+    answers and payments stay attached. Cancelled or done lessons are never touched.
+    """
+    plan = {"inserts": [], "updates": [], "cancellations": []}
+    tz = ZoneInfo(settings.TIMEZONE)
+    now = datetime.now(timezone.utc)
+    today = now.astimezone(tz).date()
+    until = group.lessons_generated_until
+    if until is None or until < today:
+        return plan
+
+    result = await session.execute(
+        select(Lesson)
+        .where(
+            Lesson.group_id == group.id,
+            Lesson.starts_at >= now,
+            Lesson.starts_at < datetime.combine(until + timedelta(days=1), time.min, tzinfo=tz),
+        )
+        .order_by(Lesson.starts_at)
+    )
+    by_start = {lesson.starts_at: lesson for lesson in result.scalars().all()}
+
+    desired: dict[datetime, dict] = {}
+    for row in schedule_occurrences(group.id, schedule_json, teacher_name, today, until, tz):
+        if row["starts_at"] >= now:
+            desired.setdefault(row["starts_at"], row)
+
+    unmatched: list[dict] = []
+    for starts_at, row in sorted(desired.items()):
+        lesson = by_start.pop(starts_at, None)
+        if lesson is None:
+            unmatched.append(row)
+        elif lesson.status == "scheduled":
+            changes = {name: row[name] for name in _COMPARED if getattr(lesson, name) != row[name]}
+            if changes:
+                plan["updates"].append({"lesson": lesson, "row": row, "changes": changes})
+
+    leftovers: dict = defaultdict(list)
+    for lesson in by_start.values():
+        if lesson.status == "scheduled":
+            leftovers[lesson.starts_at.astimezone(tz).date()].append(lesson)
+
+    for row in unmatched:
+        same_day = leftovers.get(row["starts_at"].astimezone(tz).date())
+        if same_day:
+            lesson = same_day.pop(0)
+            changes = {name: row[name] for name in _COMPARED if getattr(lesson, name) != row[name]}
+            plan["updates"].append({"lesson": lesson, "row": row, "changes": changes})
+        else:
+            plan["inserts"].append(row)
+
+    plan["cancellations"] = sorted(
+        (lesson for lessons in leftovers.values() for lesson in lessons), key=lambda lesson: lesson.starts_at
+    )
+    return plan
+
+
+async def apply_schedule_changes(session: AsyncSession, plan: dict) -> dict:
+    """Apply a plan from ``plan_schedule_changes`` with one bulk statement per kind. Does not commit."""
+    touched = []
+    if plan["inserts"]:
+        _, inserted = await load_lessons(session, plan["inserts"])
+        touched.extend(inserted)
+
+    if plan["updates"]:
+        now = datetime.now(timezone.utc)
+        await session.execute(
+            update(Lesson),
+            [
+                {"id": item["lesson"].id, **{name: item["row"][name] for name in _COMPARED}, "updated_at": now}
+                for item in plan["updates"]
+            ],
+        )
+        touched.extend(item["lesson"].id for item in plan["updates"])
+
+    if plan["cancellations"]:
+        cancelled = [lesson.id for lesson in plan["cancellations"]]
+        await session.execute(
+            update(Lesson)
+            .where(Lesson.id.in_(cancelled), Lesson.status == "scheduled")
+            .values(status="cancelled")
+            .execution_options(synchronize_session=False)
+        )
+        touched.extend(cancelled)
+
+    await refresh_feed_for_lessons(session, touched)
+    return {
+        "inserted": len(plan["inserts"]),
+        "updated": len(plan["updates"]),
+        "cancelled": len(plan["cancellations"]),
+    }
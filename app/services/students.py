@@ -6,6 +6,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.errors import NotFound
 from app.models.group import Group
 from app.models.student import Student
+from app.services.lesson_feed import refresh_feed_for_parents
+from app.services.parent_scope import parent_memberships
 
 
 async def list_parent_students(session: AsyncSession, user_id: uuid.UUID) -> list[Student]:
@@ -37,5 +39,10 @@ async def create_student(
         is_active=is_active,
     )
     session.add(student)
+    await session.flush()
+    await refresh_feed_for_parents(session, [user_id], group_id)
     await session.commit()
+    # The students trigger tells every process; drop this one's entry now so the caller's next request
+    # cannot race the NOTIFY.
+    parent_memberships.invalidate(user_id)
     return student
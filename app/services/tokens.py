@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+import uuid
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.errors import Unauthorized
+from app.core.settings import settings
+from app.core.tokens import create_token, decode_token
+from app.models.revoked_token import RevokedToken
+from app.repositories.users import get_user_by_id
+
+
+def issue_tokens(user_id: uuid.UUID, user_type: str) -> dict:
+    access_token, _ = create_token(user_id, user_type, "access", settings.ACCESS_TTL)
+    refresh_token, _ = create_token(user_id, user_type, "refresh", settings.REFRESH_TTL)
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "expires_in": settings.ACCESS_TTL,
+    }
+
+
+async def is_token_revoked(session: AsyncSession, jti: str) -> bool:
+    result = await session.execute(select(RevokedToken.jti).where(RevokedToken.jti == jti))
+    return result.scalar_one_or_none() is not None
+
+
+async def _revoke(session: AsyncSession, claims: dict) -> bool:
+    """Record a token id as revoked; False if it already was (e.g. a replayed refresh token)."""
+    await session.execute(delete(RevokedToken).where(RevokedToken.expires_at < func.now()))
+    stmt = (
+        insert(RevokedToken)
+        .values(jti=claims["jti"], expires_at=datetime.fromtimestamp(claims["exp"], timezone.utc))
+        .on_conflict_do_nothing(index_elements=["jti"])
+        .returning(RevokedToken.jti)
+    )
+    result = await session.execute(stmt)
+    return result.scalar_one_or_none() is not None
+
+
+async def refresh_tokens(session: AsyncSession, refresh_token: str) -> dict:
+    """Exchange a refresh token for a new pair. Each refresh token can be used once."""
+    claims = decode_token(refresh_token, "refresh")
+    user = await get_user_by_id(session, uuid.UUID(claims["sub"]))
+    if not user:
+        raise Unauthorized("AUTH_TOKEN_INVALID", "Invalid token")
+    if not await _revoke(session, claims):
+        await session.rollback()
+        raise Unauthorized("AUTH_TOKEN_REVOKED", "Token revoked")
+
+    await session.commit()
+    return issue_tokens(user.id, user.user_type)
+
+
+async def revoke_tokens(session: AsyncSession, refresh_token: str, access_token: str | None = None) -> None:
+    await _revoke(session, decode_token(refresh_token, "refresh"))
+    if access_token:
+        await _revoke(session, decode_token(access_token, "access"))
+    await session.commit()
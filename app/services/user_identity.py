@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import NotifyLRUCache
+from app.core.listener import PgListener, pg_listener
+from app.core.settings import settings
+from app.models.user import User
+
+# Fired by triggers on users with the changed or deleted user's id.
+CHANNEL = "users_changed"
+
+
+@dataclass(frozen=True, slots=True)
+class UserIdentity:
+    id: uuid.UUID
+    user_type: str
+    timezone: str | None
+    push_enabled: bool
+
+
+class UserIdentityCache(NotifyLRUCache):
+    """Per-process cache of the few user columns that authorization and scheduling need."""
+
+    def __init__(self, listener: PgListener, max_entries: int, ttl_seconds: float) -> None:
+        super().__init__("user_identity", listener, CHANNEL, uuid.UUID, max_entries, ttl_seconds)
+
+    async def get(self, session: AsyncSession, user_id: uuid.UUID) -> UserIdentity | None:
+        return await self.get_or_load(user_id, lambda: _load_identity(session, user_id))
+
+
+async def _load_identity(session: AsyncSession, user_id: uuid.UUID) -> UserIdentity | None:
+    result = await session.execute(
+        select(User.id, User.user_type, User.timezone, User.push_enabled).where(User.id == user_id)
+    )
+    row = result.one_or_none()
+    return UserIdentity(*row) if row is not None else None
+
+
+user_identity_cache = UserIdentityCache(
+    pg_listener, settings.USER_CACHE_MAX_ENTRIES, settings.USER_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,37 @@
+from datetime import datetime, timezone
+
+CRLF = "\r\n"
+
+
+def escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def format_utc(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def fold_line(line: str) -> str:
+    """Fold a content line to 75 octets per RFC 5545, never splitting a UTF-8 sequence."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + CRLF
+
+    parts = []
+    current = b""
+    limit = 75
+    for char in line:
+        size = len(char.encode("utf-8"))
+        if len(current) + size > limit:
+            parts.append(current.decode("utf-8"))
+            current = b""
+            limit = 74  # continuation lines start with a space
+        current += char.encode("utf-8")
+    parts.append(current.decode("utf-8"))
+    return (CRLF + " ").join(parts) + CRLF
@@ -1,8 +1,16 @@
 ﻿from datetime import datetime
-from zoneinfo import ZoneInfo
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
+from app.core.errors import BadRequest
 from app.core.settings import settings
 
 
 def now_tz() -> datetime:
     return datetime.now(ZoneInfo(settings.TIMEZONE))
+
+
+def resolve_timezone(name: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError) as exc:
+        raise BadRequest("TIMEZONE_INVALID", "Invalid timezone") from exc
@@ -0,0 +1,155 @@
+import argparse
+import asyncio
+from datetime import datetime, timezone
+import logging
+
+from sqlalchemy import DateTime, func, literal, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import AsyncSessionLocal, engine
+from app.core.logging import configure_logging
+from app.core.settings import settings
+from app.models.device_token import DeviceToken
+from app.models.notification import Notification
+from app.models.user import User
+from app.services.push import PushBackend, get_push_backend
+
+logger = logging.getLogger("dispatch")
+
+
+async def dispatch_batch(session: AsyncSession, backend: PushBackend, batch_size: int | None = None) -> dict:
+    """Claim, deliver and settle one batch of due notifications in a single transaction.
+
+    Rows are claimed with ``FOR UPDATE SKIP LOCKED`` and stay locked until the settling ``UPDATE``s commit,
+    so concurrent workers pick disjoint batches and nothing is delivered twice. Rows without a schedule
+    are due immediately. Users with push turned off get ``skipped``; rows the backend did not deliver get
+    ``failed``. If the backend raises, the batch stays ``queued`` and is retried with exponential backoff
+    until ``NOTIFICATION_DISPATCH_MAX_ATTEMPTS``.
+    """
+    batch_size = batch_size or settings.NOTIFICATION_DISPATCH_BATCH_SIZE
+    now = datetime.now(timezone.utc)
+
+    claimed = (
+        await session.execute(
+            select(
+                Notification.id,
+                Notification.user_id,
+                Notification.title,
+                Notification.body,
+                Notification.payload,
+                Notification.attempts,
+                User.push_enabled,
+            )
+            .join(User, User.id == Notification.user_id)
+            .where(
+                Notification.status == "queued",
+                or_(Notification.scheduled_at.is_(None), Notification.scheduled_at <= now),
+            )
+            .order_by(Notification.scheduled_at.asc().nulls_first(), Notification.id)
+            .limit(batch_size)
+            .with_for_update(of=Notification, skip_locked=True)
+        )
+    ).all()
+    if not claimed:
+        await session.rollback()
+        return {"claimed": 0, "sent": 0, "failed": 0, "skipped": 0, "retried": 0}
+
+    skipped = {row.id for row in claimed if not row.push_enabled}
+    pushable = [row for row in claimed if row.push_enabled]
+    token_rows = await session.execute(
+        select(DeviceToken.user_id, DeviceToken.token).where(
+            DeviceToken.user_id.in_({row.user_id for row in pushable}),
+            DeviceToken.revoked_at.is_(None),
+        )
+    )
+    tokens_by_user: dict = {}
+    for user_id, token in token_rows.all():
+        tokens_by_user.setdefault(user_id, []).append(token)
+
+    messages = [
+        (row.id, tokens_by_user[row.user_id], row.title, row.body, row.payload)
+        for row in pushable
+        if row.user_id in tokens_by_user
+    ]
+    retry = []
+    try:
+        delivered = await backend.send(messages) if messages else set()
+    except Exception:
+        logger.exception("push backend failed", extra={"backend": backend.name, "batch": len(messages)})
+        delivered = set()
+        attempted = {message[0] for message in messages}
+        retry = [
+            row.id
+            for row in pushable
+            if row.id in attempted and row.attempts + 1 < settings.NOTIFICATION_DISPATCH_MAX_ATTEMPTS
+        ]
+
+    failed = {row.id for row in pushable} - delivered - set(retry)
+    for status, ids in (("sent", delivered), ("failed", failed), ("skipped", skipped)):
+        if ids:
+            await session.execute(
+                update(Notification)
+                .where(Notification.id.in_(ids))
+                .values(status=status, sent_at=now if status == "sent" else None)
+                .execution_options(synchronize_session=False)
+            )
+    if retry:
+        backoff = settings.NOTIFICATION_DISPATCH_RETRY_SECONDS * func.power(2, Notification.attempts)
+        await session.execute(
+            update(Notification)
+            .where(Notification.id.in_(retry))
+            .values(
+                attempts=Notification.attempts + 1,
+                scheduled_at=literal(now, DateTime(timezone=True)) + func.make_interval(0, 0, 0, 0, 0, 0, backoff),
+            )
+            .execution_options(synchronize_session=False)
+        )
+    await session.commit()
+    return {
+        "claimed": len(claimed),
+        "sent": len(delivered),
+        "failed": len(failed),
+        "skipped": len(skipped),
+        "retried": len(retry),
+    }
+
+
+async def run(
+    backend: PushBackend,
+    batch_size: int | None = None,
+    poll_seconds: float | None = None,
+    once: bool = False,
+) -> None:
+    poll_seconds = settings.NOTIFICATION_DISPATCH_POLL_SECONDS if poll_seconds is None else poll_seconds
+    while True:
+        async with AsyncSessionLocal() as session:
+            result = await dispatch_batch(session, backend, batch_size)
+        if result["claimed"]:
+            logger.info("dispatched", extra=result)
+        if once and result["claimed"] == 0:
+            return
+        if result["claimed"] == 0:
+            await asyncio.sleep(poll_seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deliver queued notifications to the configured push backend.")
+    parser.add_argument("--batch-size", type=int, default=None, help="Notifications claimed per transaction.")
+    parser.add_argument("--poll-seconds", type=float, default=None, help="Sleep between empty polls.")
+    parser.add_argument("--backend", default=None, help="Push backend name (defaults to PUSH_BACKEND).")
+    parser.add_argument("--once", action="store_true", help="Exit once the queue is drained.")
+    args = parser.parse_args()
+
+    configure_logging()
+
+    async def _run():
+        try:
+            await run(get_push_backend(args.backend), args.batch_size, args.poll_seconds, args.once)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""add daily metric rollups
+
+Revision ID: 0003_daily_metrics
+Revises: 0002_student_class_group
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_daily_metrics"
+down_revision = "0002_student_class_group"
+branch_labels = None
+depends_on = None
+
+
+# Columns scanned by the incremental rollup job ("rows changed since the watermark").
+_CHANGE_INDEXES = [
+    ("ix_users_created_at", "users", "created_at"),
+    ("ix_groups_created_at", "groups", "created_at"),
+    ("ix_students_created_at", "students", "created_at"),
+    ("ix_lessons_created_at", "lessons", "created_at"),
+    ("ix_lessons_updated_at", "lessons", "updated_at"),
+    ("ix_lesson_participation_updated_at", "lesson_participation", "updated_at"),
+    ("ix_materials_created_at", "materials", "created_at"),
+    ("ix_notifications_created_at", "notifications", "created_at"),
+    ("ix_payments_created_at", "payments", "created_at"),
+    ("ix_payments_updated_at", "payments", "updated_at"),
+    ("ix_device_tokens_created_at", "device_tokens", "created_at"),
+    ("ix_managers_created_at", "managers", "created_at"),
+]
+
+
+def upgrade() -> None:
+    op.add_column(
+        "payments",
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+
+    op.create_table(
+        "daily_metrics",
+        sa.Column("metric", sa.String(100), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("timezone", sa.String(50), primary_key=True),
+        sa.Column("value", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.create_index("ix_daily_metrics_timezone_day", "daily_metrics", ["timezone", "day"])
+
+    op.create_table(
+        "daily_metric_watermarks",
+        sa.Column("source", sa.String(100), primary_key=True),
+        sa.Column("timezone", sa.String(50), primary_key=True),
+        sa.Column("processed_until", sa.DateTime(timezone=True), nullable=False),
+    )
+
+    for name, table, column in _CHANGE_INDEXES:
+        op.create_index(name, table, [column])
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(_CHANGE_INDEXES):
+        op.drop_index(name, table_name=table)
+    op.drop_table("daily_metric_watermarks")
+    op.drop_index("ix_daily_metrics_timezone_day", table_name="daily_metrics")
+    op.drop_table("daily_metrics")
+    op.drop_column("payments", "updated_at")
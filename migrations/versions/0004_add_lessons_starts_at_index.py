@@ -0,0 +1,23 @@
+"""add lessons starts_at index
+
+Revision ID: 0004_lessons_starts_at
+Revises: 0003_daily_metrics
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+
+revision = "0004_lessons_starts_at"
+down_revision = "0003_daily_metrics"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Range scans on starts_at across all groups (dashboard lessons_starting series, lesson ranges).
+    op.create_index("ix_lessons_starts_at_id", "lessons", ["starts_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_lessons_starts_at_id", table_name="lessons")
@@ -0,0 +1,52 @@
+"""add notification dedup key
+
+Revision ID: 0005_notification_dedup_key
+Revises: 0004_lessons_starts_at
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_notification_dedup_key"
+down_revision = "0004_lessons_starts_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("notifications", sa.Column("dedup_key", sa.String(200), nullable=True))
+
+    # Existing reminders are keyed by lesson id; if duplicates slipped in, only the oldest one gets the key.
+    op.execute(
+        """
+        UPDATE notifications AS n
+        SET dedup_key = d.lesson_id
+        FROM (
+            SELECT
+                id,
+                payload ->> 'lesson_id' AS lesson_id,
+                row_number() OVER (
+                    PARTITION BY user_id, type, payload ->> 'lesson_id'
+                    ORDER BY created_at, id
+                ) AS rn
+            FROM notifications
+            WHERE type = 'lesson_reminder' AND payload ? 'lesson_id'
+        ) AS d
+        WHERE n.id = d.id AND d.rn = 1
+        """
+    )
+
+    op.create_index(
+        "uq_notifications_user_type_dedup_key",
+        "notifications",
+        ["user_id", "type", "dedup_key"],
+        unique=True,
+        postgresql_where=sa.text("dedup_key IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_notifications_user_type_dedup_key", table_name="notifications")
+    op.drop_column("notifications", "dedup_key")
@@ -0,0 +1,37 @@
+"""add notification counters
+
+Revision ID: 0006_notification_counters
+Revises: 0005_notification_dedup_key
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0006_notification_counters"
+down_revision = "0005_notification_dedup_key"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_counters",
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("unread", sa.Integer(), server_default=sa.text("0"), nullable=False),
+    )
+    op.execute(
+        """
+        INSERT INTO notification_counters (user_id, unread)
+        SELECT user_id, count(*)
+        FROM notifications
+        WHERE status <> 'read'
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("notification_counters")
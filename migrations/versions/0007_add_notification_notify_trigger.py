@@ -0,0 +1,43 @@
+"""notify on notification insert
+
+Revision ID: 0007_notification_notify
+Revises: 0006_notification_counters
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+
+revision = "0007_notification_notify"
+down_revision = "0006_notification_counters"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Every insert path (reminders, create_notifications, ...) publishes on commit for GET /notifications/stream.
+    op.execute(
+        """
+        CREATE FUNCTION notify_notification_created() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify(
+                'notifications_created',
+                json_build_object('id', NEW.id, 'user_id', NEW.user_id)::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER notifications_notify_created
+        AFTER INSERT ON notifications
+        FOR EACH ROW EXECUTE FUNCTION notify_notification_created()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER notifications_notify_created ON notifications")
+    op.execute("DROP FUNCTION notify_notification_created()")
@@ -0,0 +1,66 @@
+"""add parent lesson feed
+
+Revision ID: 0008_parent_lesson_feed
+Revises: 0007_notification_notify
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0008_parent_lesson_feed"
+down_revision = "0007_notification_notify"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "parent_lesson_feed",
+        sa.Column("parent_user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("starts_at", sa.DateTime(timezone=True), primary_key=True),
+        sa.Column("lesson_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("lessons.id"), primary_key=True),
+        sa.Column("group_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("groups.id"), nullable=False),
+        sa.Column("ends_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("topic", sa.String(500), nullable=True),
+        sa.Column("teacher_name", sa.String(200), nullable=True),
+        sa.Column("cabinet_text", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("students", postgresql.JSONB(), server_default=sa.text("'[]'::jsonb"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    # Refreshes delete by lesson_id (lesson edits, will-go).
+    op.create_index("ix_parent_lesson_feed_lesson_id", "parent_lesson_feed", ["lesson_id"])
+
+    op.execute(
+        """
+        INSERT INTO parent_lesson_feed (
+            parent_user_id, starts_at, lesson_id, group_id, ends_at,
+            topic, teacher_name, cabinet_text, status, students
+        )
+        SELECT
+            s.parent_user_id, l.starts_at, l.id, l.group_id, l.ends_at,
+            l.topic, l.teacher_name, l.cabinet_text, l.status,
+            jsonb_agg(
+                jsonb_build_object(
+                    'student_id', s.id::text,
+                    'first_name', s.first_name,
+                    'last_name', s.last_name,
+                    'father_name', s.father_name,
+                    'will_go', lp.will_go
+                )
+                ORDER BY s.last_name, s.first_name, s.id
+            )
+        FROM lessons AS l
+        JOIN students AS s ON s.group_id = l.group_id
+        LEFT JOIN lesson_participation AS lp ON lp.lesson_id = l.id AND lp.student_id = s.id
+        GROUP BY s.parent_user_id, l.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_parent_lesson_feed_lesson_id", table_name="parent_lesson_feed")
+    op.drop_table("parent_lesson_feed")
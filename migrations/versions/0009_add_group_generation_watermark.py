@@ -0,0 +1,25 @@
+"""add group lesson generation watermark
+
+Revision ID: 0009_group_generation_watermark
+Revises: 0008_parent_lesson_feed
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009_group_generation_watermark"
+down_revision = "0008_parent_lesson_feed"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("groups", sa.Column("lessons_generated_until", sa.Date(), nullable=True))
+    op.add_column("groups", sa.Column("schedule_fingerprint", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("groups", "schedule_fingerprint")
+    op.drop_column("groups", "lessons_generated_until")
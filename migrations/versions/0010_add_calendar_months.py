@@ -0,0 +1,81 @@
+"""add calendar month cache
+
+Revision ID: 0010_calendar_months
+Revises: 0009_group_generation_watermark
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0010_calendar_months"
+down_revision = "0009_group_generation_watermark"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "calendar_months",
+        sa.Column("group_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("groups.id"), primary_key=True),
+        sa.Column("year", sa.Integer(), primary_key=True),
+        sa.Column("month", sa.Integer(), primary_key=True),
+        sa.Column("timezone", sa.String(50), primary_key=True),
+        sa.Column("range_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("range_end", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("lessons", postgresql.JSONB(), server_default=sa.text("'[]'::jsonb"), nullable=False),
+        sa.Column("built_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+
+    # Statement-level triggers so bulk paths (generate_lessons, COPY merge, bulk updates) invalidate
+    # with one DELETE per statement. Matching on the stored range keeps this timezone-agnostic.
+    op.execute(
+        """
+        CREATE FUNCTION invalidate_calendar_months() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                DELETE FROM calendar_months AS c
+                USING new_rows AS l
+                WHERE c.group_id = l.group_id AND l.starts_at >= c.range_start AND l.starts_at < c.range_end;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM calendar_months AS c
+                USING old_rows AS l
+                WHERE c.group_id = l.group_id AND l.starts_at >= c.range_start AND l.starts_at < c.range_end;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER lessons_calendar_insert AFTER INSERT ON lessons
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION invalidate_calendar_months()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER lessons_calendar_update AFTER UPDATE ON lessons
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION invalidate_calendar_months()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER lessons_calendar_delete AFTER DELETE ON lessons
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION invalidate_calendar_months()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER lessons_calendar_delete ON lessons")
+    op.execute("DROP TRIGGER lessons_calendar_update ON lessons")
+    op.execute("DROP TRIGGER lessons_calendar_insert ON lessons")
+    op.execute("DROP FUNCTION invalidate_calendar_months()")
+    op.drop_table("calendar_months")
@@ -0,0 +1,25 @@
+"""add user calendar token
+
+Revision ID: 0011_user_calendar_token
+Revises: 0010_calendar_months
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0011_user_calendar_token"
+down_revision = "0010_calendar_months"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("calendar_token_hash", sa.String(64), nullable=True))
+    op.create_unique_constraint("users_calendar_token_hash_key", "users", ["calendar_token_hash"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("users_calendar_token_hash_key", "users", type_="unique")
+    op.drop_column("users", "calendar_token_hash")
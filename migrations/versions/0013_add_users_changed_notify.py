@@ -0,0 +1,55 @@
+"""notify on user identity changes
+
+Revision ID: 0013_users_changed_notify
+Revises: 0012_revoked_tokens
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+
+revision = "0013_users_changed_notify"
+down_revision = "0012_revoked_tokens"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Invalidates per-process user identity caches. Only the cached columns are watched, so the
+    # updated_at bump on every login does not publish.
+    op.execute(
+        """
+        CREATE FUNCTION notify_user_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('users_changed', OLD.id::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER users_notify_updated
+        AFTER UPDATE ON users
+        FOR EACH ROW
+        WHEN (
+            OLD.user_type IS DISTINCT FROM NEW.user_type
+            OR OLD.timezone IS DISTINCT FROM NEW.timezone
+            OR OLD.push_enabled IS DISTINCT FROM NEW.push_enabled
+        )
+        EXECUTE FUNCTION notify_user_changed()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER users_notify_deleted
+        AFTER DELETE ON users
+        FOR EACH ROW EXECUTE FUNCTION notify_user_changed()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER users_notify_deleted ON users")
+    op.execute("DROP TRIGGER users_notify_updated ON users")
+    op.execute("DROP FUNCTION notify_user_changed()")
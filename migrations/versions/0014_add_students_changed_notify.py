@@ -0,0 +1,59 @@
+"""notify on student membership changes
+
+Revision ID: 0014_students_changed_notify
+Revises: 0013_users_changed_notify
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+
+revision = "0014_students_changed_notify"
+down_revision = "0013_users_changed_notify"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Invalidates per-process parent membership caches. A student moved between parents notifies
+    # both; identical payloads within one transaction are delivered once.
+    op.execute(
+        """
+        CREATE FUNCTION notify_student_membership_changed() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                PERFORM pg_notify('students_changed', OLD.parent_user_id::text);
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                PERFORM pg_notify('students_changed', NEW.parent_user_id::text);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER students_notify_inserted_deleted
+        AFTER INSERT OR DELETE ON students
+        FOR EACH ROW EXECUTE FUNCTION notify_student_membership_changed()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER students_notify_moved
+        AFTER UPDATE ON students
+        FOR EACH ROW
+        WHEN (
+            OLD.parent_user_id IS DISTINCT FROM NEW.parent_user_id
+            OR OLD.group_id IS DISTINCT FROM NEW.group_id
+        )
+        EXECUTE FUNCTION notify_student_membership_changed()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER students_notify_moved ON students")
+    op.execute("DROP TRIGGER students_notify_inserted_deleted ON students")
+    op.execute("DROP FUNCTION notify_student_membership_changed()")
@@ -0,0 +1,97 @@
+"""record daily metric bucket moves
+
+Revision ID: 0015_daily_metric_moves
+Revises: 0014_students_changed_notify
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0015_daily_metric_moves"
+down_revision = "0014_students_changed_notify"
+branch_labels = None
+depends_on = None
+
+# Every daily_metrics source: (source, bucket column, columns whose change moves the row's contribution).
+# On UPDATE both the old and new bucket days are recorded, so back-dating with plain SQL (which leaves
+# the watermark "changed" columns alone) is still picked up; on DELETE the old day is.
+_MOVES = {
+    "users": [("users", "created_at", ("created_at",))],
+    "groups": [("groups", "created_at", ("created_at",))],
+    "students": [("students", "created_at", ("created_at",))],
+    "lessons": [
+        ("lessons_created", "created_at", ("created_at",)),
+        ("lessons_starting", "starts_at", ("starts_at",)),
+    ],
+    "lesson_participation": [("lesson_participations", "updated_at", ("updated_at",))],
+    "materials": [("materials", "created_at", ("created_at",))],
+    "notifications": [("notifications", "created_at", ("created_at",))],
+    "payments": [("payments", "created_at", ("created_at", "status", "amount_cents"))],
+    "device_tokens": [("device_tokens", "created_at", ("created_at",))],
+    "managers": [("managers", "created_at", ("created_at",))],
+}
+_KEYS = {"lesson_participation": ("lesson_id", "student_id")}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "daily_metric_moves",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), primary_key=True),
+        sa.Column("source", sa.String(100), nullable=False),
+        sa.Column("bucket_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("recorded_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.create_index("ix_daily_metric_moves_source_recorded_at", "daily_metric_moves", ["source", "recorded_at"])
+
+    union = "\n                    UNION ALL\n                    "
+    for table, sources in _MOVES.items():
+        key = " AND ".join(f"n.{column} = o.{column}" for column in _KEYS.get(table, ("id",)))
+        updated = union.join(
+            f"SELECT '{source}', v.bucket_at FROM old_rows AS o JOIN new_rows AS n ON {key} "
+            f"CROSS JOIN LATERAL (VALUES (o.{bucket}), (n.{bucket})) AS v (bucket_at) "
+            f"WHERE ({', '.join(f'o.{column}' for column in tracked)}) "
+            f"IS DISTINCT FROM ({', '.join(f'n.{column}' for column in tracked)})"
+            for source, bucket, tracked in sources
+        )
+        deleted = union.join(f"SELECT '{source}', {bucket} FROM old_rows" for source, bucket, _ in sources)
+        op.execute(
+            f"""
+            CREATE FUNCTION record_{table}_metric_moves() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP = 'UPDATE' THEN
+                    INSERT INTO daily_metric_moves (source, bucket_at)
+                    {updated};
+                ELSE
+                    INSERT INTO daily_metric_moves (source, bucket_at)
+                    {deleted};
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_metric_moves_update AFTER UPDATE ON {table}
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION record_{table}_metric_moves()
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_metric_moves_delete AFTER DELETE ON {table}
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION record_{table}_metric_moves()
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in reversed(_MOVES):
+        op.execute(f"DROP TRIGGER {table}_metric_moves_delete ON {table}")
+        op.execute(f"DROP TRIGGER {table}_metric_moves_update ON {table}")
+        op.execute(f"DROP FUNCTION record_{table}_metric_moves()")
+    op.drop_index("ix_daily_metric_moves_source_recorded_at", table_name="daily_metric_moves")
+    op.drop_table("daily_metric_moves")
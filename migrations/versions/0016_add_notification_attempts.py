@@ -0,0 +1,23 @@
+"""add notification delivery attempts
+
+Revision ID: 0016_notification_attempts
+Revises: 0015_daily_metric_moves
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0016_notification_attempts"
+down_revision = "0015_daily_metric_moves"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("notifications", sa.Column("attempts", sa.Integer(), server_default=sa.text("0"), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column("notifications", "attempts")
@@ -0,0 +1,79 @@
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import event
+
+from app.core.db import AsyncSessionLocal, engine
+from app.services.dashboard import DASHBOARD_MODES, build_weekly_dashboard
+
+
+class _StatementCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.count += 1
+
+
+async def _bench_mode(mode: str, days: int, iterations: int, counter: _StatementCounter) -> dict:
+    timings: list[float] = []
+    statements: list[int] = []
+    async with AsyncSessionLocal() as session:
+        # Warm up the connection and the plan cache before measuring.
+        await build_weekly_dashboard(session, days=days, mode=mode)
+        for _ in range(iterations):
+            counter.count = 0
+            start = time.perf_counter()
+            await build_weekly_dashboard(session, days=days, mode=mode)
+            timings.append((time.perf_counter() - start) * 1000)
+            statements.append(counter.count)
+            await session.rollback()
+
+    timings.sort()
+    return {
+        "mode": mode,
+        "statements": max(statements),
+        "min_ms": timings[0],
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dashboard query modes against the configured database.")
+    parser.add_argument("--days", type=int, default=7, help="Dashboard window in days.")
+    parser.add_argument("--iterations", type=int, default=50, help="Measured runs per mode.")
+    parser.add_argument(
+        "--mode",
+        action="append",
+        choices=DASHBOARD_MODES,
+        help="Mode to benchmark (repeatable, defaults to all).",
+    )
+    args = parser.parse_args()
+
+    async def _run():
+        counter = _StatementCounter()
+        event.listen(engine.sync_engine, "before_cursor_execute", counter)
+        try:
+            results = [
+                await _bench_mode(mode, args.days, args.iterations, counter)
+                for mode in (args.mode or DASHBOARD_MODES)
+            ]
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", counter)
+            await engine.dispose()
+
+        print(f"{'mode':<16}{'stmts':>8}{'min ms':>10}{'median ms':>12}{'p95 ms':>10}")
+        for item in results:
+            print(
+                f"{item['mode']:<16}{item['statements']:>8}{item['min_ms']:>10.2f}"
+                f"{item['median_ms']:>12.2f}{item['p95_ms']:>10.2f}"
+            )
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import statistics
+import time
+
+from app.core.security import PASSWORD_PROFILES, build_password_context
+
+
+def _bench_profile(profile: str, iterations: int, threads: int) -> dict:
+    context = build_password_context(profile)
+    password_hash = context.hash("benchmark-password")
+
+    def _timed_verify(_: int) -> float:
+        start = time.perf_counter()
+        context.verify("benchmark-password", password_hash)
+        return (time.perf_counter() - start) * 1000
+
+    # Warm up the backend before measuring.
+    _timed_verify(0)
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        start = time.perf_counter()
+        timings = sorted(executor.map(_timed_verify, range(iterations)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "profile": profile,
+        "rounds": PASSWORD_PROFILES[profile],
+        "hashes_per_second": iterations / elapsed,
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure password hashing throughput per cost profile on this host.")
+    parser.add_argument("--iterations", type=int, default=50, help="Measured verifications per profile.")
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=1,
+        help="Concurrent hashing threads; match PASSWORD_HASH_WORKERS to see per-process capacity.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="append",
+        choices=list(PASSWORD_PROFILES),
+        help="Profile to benchmark (repeatable, defaults to all).",
+    )
+    args = parser.parse_args()
+
+    results = [
+        _bench_profile(profile, args.iterations, args.threads) for profile in (args.profile or PASSWORD_PROFILES)
+    ]
+
+    print(f"{'profile':<12}{'rounds':>10}{'hashes/s':>12}{'median ms':>12}{'p95 ms':>10}")
+    for item in results:
+        print(
+            f"{item['profile']:<12}{item['rounds']:>10}{item['hashes_per_second']:>12.1f}"
+            f"{item['median_ms']:>12.2f}{item['p95_ms']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,20 +6,27 @@ from sqlalchemy import delete, select
 
 from app.core.db import AsyncSessionLocal
 from app.core.security import hash_password
+from app.models.calendar_month import CalendarMonth
 from app.models.device_token import DeviceToken
 from app.models.group import Group
 from app.models.lesson import Lesson, LessonParticipation
 from app.models.manager import Manager
 from app.models.material import Material
-from app.models.notification import Notification
+from app.models.notification import Notification, NotificationCounter
+from app.models.parent_lesson_feed import ParentLessonFeedItem
 from app.models.payment import Payment
 from app.models.student import Student
 from app.models.user import User
+from app.services.lesson_feed import refresh_feed_for_parents
+from app.services.notifications import create_notifications
 
 
 async def _clear_data():
     async with AsyncSessionLocal() as session:
         for model in (
+            CalendarMonth,
+            ParentLessonFeedItem,
+            NotificationCounter,
             LessonParticipation,
             Payment,
             Notification,
@@ -185,27 +192,32 @@ async def _seed():
         ]
         session.add_all(materials)
 
-        notifications = [
-            Notification(
-                user_id=parent_one.id,
-                type="lesson_reminder",
-                title="Lesson reminder",
-                body="Math lesson starts soon",
-                payload={"lesson_id": str(lessons[0].id), "group_id": str(group_one.id)},
-                status="queued",
-                scheduled_at=now,
-            ),
-            Notification(
-                user_id=parent_two.id,
-                type="announcement",
-                title="New materials",
-                body="Biology slides are available",
-                payload={"group_id": str(group_two.id)},
-                status="sent",
-                sent_at=now,
-            ),
-        ]
-        session.add_all(notifications)
+        # Through create_notifications so notification_counters matches the inserted unread rows.
+        await create_notifications(
+            session,
+            [
+                {
+                    "user_id": parent_one.id,
+                    "type": "lesson_reminder",
+                    "title": "Lesson reminder",
+                    "body": "Math lesson starts soon",
+                    "payload": {"lesson_id": str(lessons[0].id), "group_id": str(group_one.id)},
+                    "status": "queued",
+                    "scheduled_at": now,
+                    "sent_at": None,
+                },
+                {
+                    "user_id": parent_two.id,
+                    "type": "announcement",
+                    "title": "New materials",
+                    "body": "Biology slides are available",
+                    "payload": {"group_id": str(group_two.id)},
+                    "status": "sent",
+                    "scheduled_at": None,
+                    "sent_at": now,
+                },
+            ],
+        )
 
         payment = Payment(
             parent_user_id=parent_one.id,
@@ -237,6 +249,8 @@ async def _seed():
         )
         session.add(manager)
 
+        await session.flush()
+        await refresh_feed_for_parents(session, [parent_one.id, parent_two.id])
         await session.commit()
 
         print("Seed completed.")
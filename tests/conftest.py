@@ -1,5 +1,9 @@
 ﻿import os
 
+# Before anything imports app.core.settings: tests sign tokens with the default secret and use ?user_id=.
+os.environ.setdefault("ENV", "test")
+os.environ.setdefault("ALLOW_USER_ID_AUTH", "true")
+
 import pytest
 from alembic import command
 from alembic.config import Config
@@ -46,12 +50,15 @@ async def app_instance(database_url, migrated):
 
 @pytest.fixture
 async def client(app_instance, session):
-    from app.core.db import get_session
+    from app.core.db import get_session, get_session_factory
     from httpx import AsyncClient
 
     async def override_get_session():
         yield session
 
     app_instance.dependency_overrides[get_session] = override_get_session
+    app_instance.dependency_overrides[get_session_factory] = lambda: async_sessionmaker(
+        session.bind, expire_on_commit=False
+    )
     async with AsyncClient(app=app_instance, base_url="http://test") as client:
         yield client
@@ -0,0 +1,96 @@
+import uuid
+
+import pytest
+
+from app.api.deps import get_principal
+from app.core.errors import Unauthorized
+from app.core.security import hash_password
+from app.core.settings import settings
+from app.core.tokens import check_signing_secret, create_token, decode_token, principal_from_claims
+from app.models.user import User
+
+
+def test_token_round_trip_and_rejections():
+    user_id = uuid.uuid4()
+    token, claims = create_token(user_id, "parent", "access", 60)
+
+    decoded = decode_token(token, "access")
+    assert decoded == claims
+    assert principal_from_claims(decoded).id == user_id
+
+    header, payload, signature = token.split(".")
+    tampered = f"{header}.{payload[:-2]}xx.{signature}"
+    for bad_token, token_type, code in [
+        (token, "refresh", "AUTH_TOKEN_INVALID"),
+        (tampered, "access", "AUTH_TOKEN_INVALID"),
+        ("not-a-token", "access", "AUTH_TOKEN_INVALID"),
+        (create_token(user_id, "parent", "access", -1)[0], "access", "AUTH_TOKEN_EXPIRED"),
+    ]:
+        with pytest.raises(Unauthorized) as exc_info:
+            decode_token(bad_token, token_type)
+        assert exc_info.value.code == code
+
+
+async def _login(session, client):
+    email = f"token-{uuid.uuid4().hex}@example.com"
+    user = User(email=email, password_hash=hash_password("password"), user_type="parent")
+    session.add(user)
+    await session.commit()
+
+    resp = await client.post("/auth/login", json={"email": email, "password": "password"})
+    assert resp.status_code == 200
+    return user, resp.json()
+
+
+def test_public_jwt_secret_is_refused_outside_tests(monkeypatch):
+    monkeypatch.setattr(settings, "ENV", "production")
+    for secret in ("change-me", "", "  "):
+        monkeypatch.setattr(settings, "JWT_SECRET", secret)
+        with pytest.raises(RuntimeError):
+            check_signing_secret()
+
+    monkeypatch.setattr(settings, "JWT_SECRET", "a-long-random-secret")
+    check_signing_secret()
+
+
+@pytest.mark.asyncio
+async def test_user_id_fallback_is_off_unless_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "ALLOW_USER_ID_AUTH", False)
+    with pytest.raises(Unauthorized):
+        await get_principal(user_id=uuid.uuid4(), authorization=None, session_factory=None)
+
+
+@pytest.mark.asyncio
+async def test_bearer_token_replaces_user_id(session, client):
+    user, tokens = await _login(session, client)
+    assert tokens["id"] == str(user.id)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    resp = await client.get("/students", headers=headers)
+    assert resp.status_code == 200
+    assert (await client.get("/me", headers=headers)).json()["id"] == str(user.id)
+
+    mismatch = await client.get("/students", headers=headers, params={"user_id": str(uuid.uuid4())})
+    assert mismatch.status_code == 403
+    assert mismatch.json()["error"]["code"] == "AUTH_USER_MISMATCH"
+
+    assert (await client.get("/students", headers={"Authorization": "Bearer nope"})).status_code == 401
+    assert (await client.get("/students")).status_code == 401
+    assert (await client.get("/students", params={"user_id": str(user.id)})).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_refresh_tokens_are_single_use(session, client):
+    _, tokens = await _login(session, client)
+
+    refreshed = await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert refreshed.status_code == 200
+    assert refreshed.json()["access_token"] != tokens["access_token"]
+
+    replay = await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert replay.status_code == 401
+    assert replay.json()["error"]["code"] == "AUTH_TOKEN_REVOKED"
+
+    new_refresh = refreshed.json()["refresh_token"]
+    assert (await client.post("/auth/logout", json={"refresh_token": new_refresh})).status_code == 204
+    assert (await client.post("/auth/refresh", json={"refresh_token": new_refresh})).status_code == 401
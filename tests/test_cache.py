@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from app.core.cache import LRUCache, NotifyLRUCache, TTLCache
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    cache = TTLCache("test", ttl_seconds=60)
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(cache.get("key", load) for _ in range(10)))
+
+    assert results == [1] * 10
+    assert calls == 1
+    assert cache.stats()["misses"] == 10
+    assert await cache.get("key", load) == 1
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_while_refreshing():
+    cache = TTLCache("test", ttl_seconds=0, stale_seconds=60)
+    values = iter([1, 2])
+
+    async def load():
+        return next(values)
+
+    assert await cache.get("key", load) == 1
+    assert await cache.get("key", load) == 1
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert await cache.get("key", load) == 2
+    assert cache.stats()["stale_hits"] == 2
+
+
+def test_lru_cache_evicts_least_recently_used_and_expires():
+    cache = LRUCache("test", max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+
+    expired = LRUCache("test", max_entries=2, ttl_seconds=0)
+    expired.set("a", 1)
+    assert expired.get("a") is None
+    assert expired.stats()["entries"] == 0
+
+
+class _FlakyListener:
+    def __init__(self):
+        self.callbacks = []
+        self.fail_next = True
+
+    async def add(self, _channel, callback):
+        if self.fail_next:
+            self.fail_next = False
+            raise ConnectionError("listener unavailable")
+        self.callbacks.append(callback)
+
+    def remove(self, _channel, callback):
+        self.callbacks.remove(callback)
+
+
+@pytest.mark.asyncio
+async def test_notify_cache_retries_a_failed_subscribe_and_unsubscribes_on_close():
+    listener = _FlakyListener()
+    cache = NotifyLRUCache("test", listener, "test_changed", str, max_entries=10, ttl_seconds=60)
+
+    async def load():
+        return "value"
+
+    with pytest.raises(ConnectionError):
+        await cache.get_or_load("key", load)
+    assert await asyncio.gather(*(cache.get_or_load(key, load) for key in "abc")) == ["value"] * 3
+    assert len(listener.callbacks) == 1
+
+    cache.close()
+    assert listener.callbacks == []
+    assert cache.cache.get("a") is None
+    await cache.get_or_load("key", load)
+    assert len(listener.callbacks) == 1
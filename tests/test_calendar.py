@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta, timezone
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.core.security import hash_password
+from app.models.calendar_month import CalendarMonth
+from app.models.group import Group
+from app.models.student import Student
+from app.models.user import User
+from app.services.lessons import create_lesson
+
+
+async def _parent_in_groups(session, group_count: int):
+    parent = User(
+        email=f"cal-{uuid.uuid4().hex}@example.com",
+        password_hash=hash_password("password"),
+        user_type="parent",
+    )
+    groups = [Group(name=f"Cal {uuid.uuid4().hex[:6]}", schedule_json=[]) for _ in range(group_count)]
+    session.add_all([parent, *groups])
+    await session.flush()
+    for index, group in enumerate(groups):
+        session.add(Student(parent_user_id=parent.id, group_id=group.id, first_name=f"C{index}", last_name="M"))
+    await session.commit()
+    return parent, groups
+
+
+@pytest.mark.asyncio
+async def test_month_calendar_merges_groups_and_invalidates(session, client):
+    parent, groups = await _parent_in_groups(session, 2)
+    base = datetime(2031, 5, 10, 8, 0, tzinfo=timezone.utc)
+    for offset, group in enumerate(groups):
+        start = base + timedelta(days=offset)
+        await create_lesson(session, group.id, start, start + timedelta(hours=1), None, None, None, None, "scheduled")
+
+    params = {"user_id": str(parent.id), "year": 2031, "month": 5}
+    resp = await client.get("/calendar/month", params=params)
+    assert resp.status_code == 200
+    lessons = resp.json()["lessons"]
+    assert [lesson["group_id"] for lesson in lessons] == [str(group.id) for group in groups]
+
+    cached = await session.execute(select(CalendarMonth).where(CalendarMonth.group_id.in_([g.id for g in groups])))
+    assert len(cached.scalars().all()) == 2
+
+    extra = base + timedelta(days=5)
+    await create_lesson(session, groups[0].id, extra, extra + timedelta(hours=1), "New", None, None, None, "scheduled")
+    resp = await client.get("/calendar/month", params=params)
+    assert [lesson["topic"] for lesson in resp.json()["lessons"]][-1] == "New"
+
+
+@pytest.mark.asyncio
+async def test_lessons_month_pages_through_the_month_cache(session, client):
+    parent, groups = await _parent_in_groups(session, 2)
+    base = datetime(2031, 7, 3, 8, 0, tzinfo=timezone.utc)
+    created = []
+    for offset in range(3):
+        start = base + timedelta(days=offset)
+        end = start + timedelta(hours=1)
+        created.append(
+            await create_lesson(session, groups[offset % 2].id, start, end, None, None, None, None, "scheduled")
+        )
+
+    params = {"user_id": str(parent.id), "year": 2031, "month": 7, "limit": 2}
+    first = (await client.get("/lessons/month", params=params)).json()
+    second = (await client.get("/lessons/month", params={**params, "cursor": first["next_cursor"]})).json()
+    assert [item["id"] for item in first["items"] + second["items"]] == [str(lesson.id) for lesson in created]
+    assert second["next_cursor"] is None
+
+    cached = await session.execute(select(CalendarMonth).where(CalendarMonth.group_id.in_([g.id for g in groups])))
+    assert {month.month for month in cached.scalars().all()} == {7}
+
+
+@pytest.mark.asyncio
+async def test_ics_feed_supports_conditional_get(session, client):
+    parent, groups = await _parent_in_groups(session, 1)
+    start = datetime(2031, 6, 2, 8, 0, tzinfo=timezone.utc)
+    lesson = await create_lesson(
+        session, groups[0].id, start, start + timedelta(hours=1), "Algebra; part 1", None, None, "Room 4", "scheduled"
+    )
+
+    token_resp = await client.post("/calendar/token", params={"user_id": str(parent.id)})
+    assert token_resp.status_code == 200
+    path = token_resp.json()["path"]
+
+    resp = await client.get(path)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/calendar")
+    body = resp.text
+    assert body.startswith("BEGIN:VCALENDAR\r\n") and body.endswith("END:VCALENDAR\r\n")
+    assert f"UID:{lesson.id}@" in body
+    assert r"SUMMARY:Algebra\; part 1" in body
+    etag = resp.headers["etag"]
+
+    assert (await client.get(path, headers={"If-None-Match": etag})).status_code == 304
+    assert (
+        await client.get(path, headers={"If-Modified-Since": resp.headers["last-modified"]})
+    ).status_code == 304
+
+    lesson.topic = "Geometry"
+    lesson.updated_at = datetime.now(timezone.utc) + timedelta(seconds=2)
+    await session.commit()
+    changed = await client.get(path, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+    assert (await client.get("/calendar/not-a-token.ics")).status_code == 404
@@ -0,0 +1,234 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import uuid
+
+import pytest
+from sqlalchemy import Date, cast, delete, func, select, text, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.security import hash_password
+from app.core.settings import settings
+from app.models.group import Group
+from app.models.lesson import Lesson, LessonParticipation
+from app.models.payment import Payment
+from app.models.student import Student
+from app.models.user import User
+from app.services.daily_metrics import load_daily_metrics, refresh_daily_metrics
+from app.services.dashboard import _parallel_slots, build_weekly_dashboard
+
+
+async def _seed_dashboard_data(session):
+    parent = User(
+        email=f"dash-{uuid.uuid4().hex}@example.com",
+        password_hash=hash_password("password"),
+        user_type="parent",
+    )
+    session.add(parent)
+    await session.flush()
+
+    group = Group(name=f"Dash {uuid.uuid4().hex[:6]}", schedule_json=[])
+    session.add(group)
+    await session.flush()
+
+    student = Student(parent_user_id=parent.id, group_id=group.id, first_name="A", last_name="B")
+    session.add(student)
+
+    starts_at = datetime.now(timezone.utc) - timedelta(days=1)
+    lesson = Lesson(group_id=group.id, starts_at=starts_at, ends_at=starts_at + timedelta(hours=1))
+    session.add(lesson)
+    await session.flush()
+
+    session.add_all(
+        [
+            Payment(parent_user_id=parent.id, lesson_id=lesson.id, amount_cents=1500, status="paid"),
+            Payment(parent_user_id=parent.id, lesson_id=lesson.id, amount_cents=700, status="pending"),
+        ]
+    )
+    await session.commit()
+    return lesson, student
+
+
+@pytest.mark.asyncio
+async def test_dashboard_modes_match_sequential(session):
+    await _seed_dashboard_data(session)
+
+    sequential = await build_weekly_dashboard(session, days=7, mode="sequential")
+    single = await build_weekly_dashboard(session, days=7, mode="single_query")
+    parallel = await build_weekly_dashboard(session, days=7, mode="parallel")
+
+    assert single.model_dump() == sequential.model_dump()
+    assert parallel.model_dump() == sequential.model_dump()
+    assert single.totals.payments >= 2
+    assert single.week.payments_paid_amount_cents >= 1500
+
+
+@pytest.mark.asyncio
+async def test_parallel_dashboard_batches_share_the_callers_snapshot(session):
+    await _seed_dashboard_data(session)
+    session_factory = async_sessionmaker(session.bind, expire_on_commit=False)
+
+    async with session_factory() as reader:
+        await reader.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        users = (await reader.execute(select(func.count()).select_from(User))).scalar_one()
+
+        session.add(
+            User(
+                email=f"dash-{uuid.uuid4().hex}@example.com",
+                password_hash=hash_password("password"),
+                user_type="parent",
+            )
+        )
+        await session.commit()
+
+        parallel = await build_weekly_dashboard(reader, days=7, mode="parallel")
+        assert parallel.totals.users == users
+
+
+def test_parallel_slots_are_created_per_event_loop():
+    async def _slots():
+        return _parallel_slots()
+
+    assert asyncio.run(_slots()) is not asyncio.run(_slots())
+
+
+@pytest.mark.asyncio
+async def test_weekly_dashboard_endpoint(session, client):
+    await _seed_dashboard_data(session)
+
+    resp = await client.get("/dashboard/weekly")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["range"]["days"] == 7
+    assert data["totals"]["users"] >= 1
+    assert {table["name"] for table in data["tables"]} >= {"users_by_day", "payments_by_day"}
+
+
+@pytest.mark.asyncio
+async def test_dashboard_rollup_matches_live(session, monkeypatch):
+    monkeypatch.setattr(settings, "TIMEZONE", "UTC")
+    await _seed_dashboard_data(session)
+    await refresh_daily_metrics(session, tz_name="UTC")
+
+    await _seed_dashboard_data(session)
+    assert await refresh_daily_metrics(session, tz_name="UTC") > 0
+
+    live = await build_weekly_dashboard(session, days=7, mode="single_query")
+    rollup = await build_weekly_dashboard(session, days=7, mode="rollup")
+
+    assert rollup.model_dump() == live.model_dump()
+
+
+@pytest.mark.asyncio
+async def test_dashboard_rollup_recomputes_days_rows_moved_out_of(session, monkeypatch):
+    monkeypatch.setattr(settings, "TIMEZONE", "UTC")
+    lesson, student = await _seed_dashboard_data(session)
+    answered_at = datetime.now(timezone.utc) - timedelta(days=3)
+    participation = LessonParticipation(lesson_id=lesson.id, student_id=student.id, updated_at=answered_at)
+    session.add(participation)
+    await session.commit()
+    await refresh_daily_metrics(session, tz_name="UTC")
+
+    old_start = lesson.starts_at
+    lesson.starts_at = old_start - timedelta(days=2)
+    lesson.ends_at = lesson.starts_at + timedelta(hours=1)
+    participation.will_go = True
+    await session.commit()
+    await session.refresh(participation)
+    assert await refresh_daily_metrics(session, tz_name="UTC") > 0
+
+    checks = [
+        ("lessons_starting", Lesson.starts_at, [old_start.date(), lesson.starts_at.date()]),
+        (
+            "lesson_participations",
+            LessonParticipation.updated_at,
+            [answered_at.date(), participation.updated_at.date()],
+        ),
+    ]
+    for metric, column, days in checks:
+        bucket = cast(func.timezone("UTC", column), Date)
+        live = await session.execute(select(bucket, func.count()).where(bucket.in_(days)).group_by(bucket))
+        rollup = await load_daily_metrics(session, "UTC", min(days), max(days), [metric])
+        rolled_up = {day: value for day, value in rollup.get(metric, {}).items() if day in days}
+        assert rolled_up == dict(live.all()), metric
+
+    live = await build_weekly_dashboard(session, days=7, mode="single_query")
+    rollup = await build_weekly_dashboard(session, days=7, mode="rollup")
+    assert rollup.model_dump() == live.model_dump()
+
+
+@pytest.mark.asyncio
+async def test_dashboard_rollup_recomputes_days_of_deleted_and_back_dated_rows(session, monkeypatch):
+    monkeypatch.setattr(settings, "TIMEZONE", "UTC")
+    lesson, student = await _seed_dashboard_data(session)
+    await refresh_daily_metrics(session, tz_name="UTC")
+
+    result = await session.execute(
+        select(Payment).where(Payment.lesson_id == lesson.id).order_by(Payment.amount_cents.desc())
+    )
+    paid, pending = result.scalars().all()
+    created_day = paid.created_at.date()
+    back_dated = paid.created_at - timedelta(days=3)
+    # Plain SQL leaves updated_at alone, so only the move triggers reveal the days involved.
+    await session.execute(update(Payment).where(Payment.id == paid.id).values(created_at=back_dated))
+    await session.execute(delete(Payment).where(Payment.id == pending.id))
+    await session.execute(delete(Student).where(Student.id == student.id))
+    await session.commit()
+    assert await refresh_daily_metrics(session, tz_name="UTC") > 0
+
+    days = [back_dated.date(), created_day]
+    for metric, column in (("payments", Payment.created_at), ("students", Student.created_at)):
+        bucket = cast(func.timezone("UTC", column), Date)
+        live = await session.execute(select(bucket, func.count()).where(bucket.in_(days)).group_by(bucket))
+        rollup = await load_daily_metrics(session, "UTC", min(days), max(days), [metric])
+        rolled_up = {day: value for day, value in rollup.get(metric, {}).items() if day in days}
+        assert rolled_up == dict(live.all()), metric
+
+    live = await build_weekly_dashboard(session, days=7, mode="single_query")
+    rollup = await build_weekly_dashboard(session, days=7, mode="rollup")
+    assert rollup.model_dump() == live.model_dump()
+
+
+@pytest.mark.asyncio
+async def test_dashboard_approximate_flags_estimated_totals(session, monkeypatch):
+    await _seed_dashboard_data(session)
+    await session.execute(text("ANALYZE payments"))
+    monkeypatch.setattr(settings, "DASHBOARD_APPROX_MIN_ROWS", 1)
+
+    approx = await build_weekly_dashboard(session, days=7, approximate=True)
+    exact = await build_weekly_dashboard(session, days=7)
+
+    assert "payments" in approx.totals.estimated
+    assert approx.totals.payments > 0
+    assert exact.totals.estimated == []
+
+
+@pytest.mark.asyncio
+async def test_range_dashboard_zero_fills_week_buckets(session, client):
+    await _seed_dashboard_data(session)
+    today = datetime.now(timezone.utc).date()
+
+    resp = await client.get(
+        "/dashboard/range",
+        params={
+            "from": (today - timedelta(days=20)).isoformat(),
+            "to": today.isoformat(),
+            "granularity": "week",
+            "tz": "America/New_York",
+        },
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["range"]["granularity"] == "week"
+    assert data["range"]["timezone"] == "America/New_York"
+    tables = {table["name"]: table["rows"] for table in data["tables"]}
+    payments = tables["payments_by_week"]
+    assert len(payments) in (3, 4)
+    assert all(datetime.fromisoformat(row["date"]).weekday() == 0 for row in payments)
+    assert sum(row["count"] for row in payments) == data["period"]["payments_created"] >= 2
+
+    bad_tz = await client.get(
+        "/dashboard/range",
+        params={"from": today.isoformat(), "to": today.isoformat(), "tz": "Mars/Olympus"},
+    )
+    assert bad_tz.status_code == 400
+    assert bad_tz.json()["error"]["code"] == "TIMEZONE_INVALID"
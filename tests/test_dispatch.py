@@ -0,0 +1,111 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import uuid
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.security import hash_password
+from app.core.settings import settings
+from app.models.device_token import DeviceToken
+from app.models.notification import Notification
+from app.models.user import User
+from app.services.push import FakePushBackend, PushBackend
+from app.workers.dispatch import dispatch_batch
+
+
+async def _queued_notifications(
+    session, count: int, with_token: bool = True, push_enabled: bool = True, scheduled: bool = True
+):
+    user = User(
+        email=f"push-{uuid.uuid4().hex}@example.com",
+        password_hash=hash_password("password"),
+        user_type="parent",
+        push_enabled=push_enabled,
+    )
+    session.add(user)
+    await session.flush()
+    if with_token:
+        session.add(DeviceToken(user_id=user.id, token=f"tok-{uuid.uuid4().hex}", platform="ios"))
+
+    due = datetime.now(timezone.utc) - timedelta(minutes=1) if scheduled else None
+    notifications = [
+        Notification(user_id=user.id, type="test", title="T", body="B", status="queued", scheduled_at=due)
+        for _ in range(count)
+    ]
+    session.add_all(notifications)
+    await session.commit()
+    return [notification.id for notification in notifications]
+
+
+async def _statuses(session, ids):
+    result = await session.execute(
+        select(Notification.id, Notification.status, Notification.sent_at).where(Notification.id.in_(ids))
+    )
+    return {row.id: (row.status, row.sent_at) for row in result.all()}
+
+
+class _DownPushBackend(PushBackend):
+    name = "down"
+
+    async def send(self, messages):
+        raise ConnectionError("provider unavailable")
+
+
+@pytest.mark.asyncio
+async def test_dispatch_marks_sent_failed_and_skipped(session):
+    delivered_ids = await _queued_notifications(session, 2)
+    unscheduled_ids = await _queued_notifications(session, 1, scheduled=False)
+    orphan_ids = await _queued_notifications(session, 1, with_token=False)
+    opted_out_ids = await _queued_notifications(session, 1, push_enabled=False)
+
+    backend = FakePushBackend()
+    while (await dispatch_batch(session, backend, batch_size=50))["claimed"]:
+        pass
+
+    statuses = await _statuses(session, delivered_ids + unscheduled_ids + orphan_ids + opted_out_ids)
+    assert all(statuses[item][0] == "sent" and statuses[item][1] is not None for item in delivered_ids)
+    assert statuses[unscheduled_ids[0]][0] == "sent"
+    assert statuses[orphan_ids[0]] == ("failed", None)
+    assert statuses[opted_out_ids[0]] == ("skipped", None)
+    assert not {notification_id for notification_id, _ in backend.sent} & set(opted_out_ids)
+    assert {notification_id for notification_id, _ in backend.sent} >= set(delivered_ids)
+
+
+@pytest.mark.asyncio
+async def test_parallel_workers_do_not_double_deliver(session):
+    ids = await _queued_notifications(session, 20)
+    SessionLocal = async_sessionmaker(session.bind, expire_on_commit=False)
+    backend = FakePushBackend()
+
+    async def worker():
+        async with SessionLocal() as worker_session:
+            while (await dispatch_batch(worker_session, backend, batch_size=3))["claimed"]:
+                pass
+
+    await asyncio.gather(*(worker() for _ in range(4)))
+
+    delivered = [notification_id for notification_id, _ in backend.sent]
+    assert len(delivered) == len(set(delivered))
+    assert set(ids) <= set(delivered)
+
+
+@pytest.mark.asyncio
+async def test_backend_error_requeues_the_batch_with_backoff(session, monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFICATION_DISPATCH_MAX_ATTEMPTS", 2)
+    ids = await _queued_notifications(session, 2)
+
+    result = await dispatch_batch(session, _DownPushBackend(), batch_size=50)
+    assert result["retried"] >= 2
+    rows = await session.execute(
+        select(Notification.status, Notification.attempts, Notification.scheduled_at).where(Notification.id.in_(ids))
+    )
+    for status, attempts, scheduled_at in rows.all():
+        assert (status, attempts) == ("queued", 1)
+        assert scheduled_at > datetime.now(timezone.utc)
+
+    await session.execute(update(Notification).where(Notification.id.in_(ids)).values(scheduled_at=None))
+    await session.commit()
+    await dispatch_batch(session, _DownPushBackend(), batch_size=50)
+    assert {status for status, _ in (await _statuses(session, ids)).values()} == {"failed"}
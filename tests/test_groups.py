@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+import uuid
+from zoneinfo import ZoneInfo
+
+import pytest
+from sqlalchemy import select
+
+from app.core.settings import settings
+from app.models.group import Group
+from app.models.lesson import Lesson
+from app.services.lessons import generate_lessons
+
+
+def _slot(day_offset: int, start_time: str) -> dict:
+    today = datetime.now(ZoneInfo(settings.TIMEZONE)).date()
+    weekday = (today + timedelta(days=day_offset)).isoweekday()
+    return {"weekday": weekday, "start_time": start_time, "duration_minutes": 60}
+
+
+@pytest.mark.asyncio
+async def test_schedule_change_is_diffed_onto_future_lessons(session, client):
+    group = Group(name=f"Diff {uuid.uuid4().hex[:6]}", schedule_json=[_slot(1, "10:00")])
+    session.add(group)
+    await session.commit()
+    await generate_lessons(session, days=13)
+
+    original = (await session.execute(select(Lesson).where(Lesson.group_id == group.id))).scalars().all()
+    assert len(original) == 2
+
+    new_schedule = [_slot(1, "12:00"), _slot(2, "10:00")]
+    preview = await client.post(f"/groups/{group.id}/schedule-preview", json={"schedule_json": new_schedule})
+    assert preview.status_code == 200
+    plan = preview.json()
+    assert {item["lesson_id"] for item in plan["updates"]} == {str(lesson.id) for lesson in original}
+    assert len(plan["inserts"]) == 2
+    assert plan["cancellations"] == []
+
+    resp = await client.patch(f"/groups/{group.id}", json={"schedule_json": [_slot(2, "10:00")]})
+    assert resp.status_code == 200
+
+    session.expire_all()
+    lessons = (await session.execute(select(Lesson).where(Lesson.group_id == group.id))).scalars().all()
+    statuses = {lesson.id: lesson.status for lesson in lessons}
+    assert all(statuses[lesson.id] == "cancelled" for lesson in original)
+    assert sum(1 for status in statuses.values() if status == "scheduled") == 2
@@ -1,14 +1,26 @@
-from datetime import date
+from datetime import date, datetime, timedelta, timezone
+import uuid
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.dialects import postgresql
 
 from app.core.security import hash_password
 from app.models.group import Group
 from app.models.lesson import Lesson, LessonParticipation
+from app.models.parent_lesson_feed import ParentLessonFeedItem
 from app.models.student import Student
 from app.models.user import User
-from app.services.lessons import generate_lessons
+from app.services import lesson_bulk
+from app.services.lessons import (
+    _lessons_query_for_user,
+    create_lesson,
+    generate_lessons,
+    list_parent_lessons,
+    update_lesson,
+    upsert_will_go,
+)
+from app.services.students import create_student
 
 
 @pytest.mark.asyncio
@@ -67,3 +79,289 @@ async def test_generate_lessons_and_will_go(session, client):
     part = await session.get(LessonParticipation, (lesson.id, student.id))
     assert part is not None
     assert part.will_go is True
+
+
+@pytest.mark.asyncio
+async def test_parent_lesson_feed_follows_writes(session):
+    parent = User(
+        email=f"feed-{uuid.uuid4().hex}@example.com",
+        password_hash=hash_password("password"),
+        user_type="parent",
+    )
+    group = Group(name=f"Feed {uuid.uuid4().hex[:6]}", schedule_json=[])
+    session.add_all([parent, group])
+    await session.commit()
+
+    starts_at = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=2)
+    lesson = await create_lesson(
+        session, group.id, starts_at, starts_at + timedelta(hours=1), "Intro", None, None, None, "scheduled"
+    )
+    first = await create_student(session, parent.id, group.id, "Ann", "B", None, None, True)
+    second = await create_student(session, parent.id, group.id, "Bob", "C", None, None, True)
+    await upsert_will_go(session, parent.id, lesson.id, second.id, True)
+
+    items, _ = await list_parent_lessons(session, parent.id, limit=10, cursor=None)
+    assert [item["id"] for item in items] == [lesson.id]
+    assert [(student["student_id"], student["will_go"]) for student in items[0]["students"]] == [
+        (first.id, None),
+        (second.id, True),
+    ]
+
+    moved = starts_at + timedelta(days=1)
+    await update_lesson(session, lesson.id, {"starts_at": moved, "ends_at": moved + timedelta(hours=1)})
+    items, _ = await list_parent_lessons(session, parent.id, limit=10, cursor=None)
+    assert len(items) == 1
+    assert items[0]["starts_at"] == moved
+
+
+@pytest.mark.asyncio
+async def test_new_child_only_refreshes_its_groups_feed_rows(session):
+    parent = User(
+        email=f"feed-{uuid.uuid4().hex}@example.com",
+        password_hash=hash_password("password"),
+        user_type="parent",
+    )
+    groups = [Group(name=f"Feed {uuid.uuid4().hex[:6]}", schedule_json=[]) for _ in range(2)]
+    session.add_all([parent, *groups])
+    await session.commit()
+
+    starts_at = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=2)
+    lessons = [
+        await create_lesson(
+            session, group.id, starts_at, starts_at + timedelta(hours=1), "Intro", None, None, None, "scheduled"
+        )
+        for group in groups
+    ]
+    await create_student(session, parent.id, groups[0].id, "Ann", "B", None, None, True)
+    # Marks the first group's row: a full rebuild would overwrite it.
+    await session.execute(
+        update(ParentLessonFeedItem).where(ParentLessonFeedItem.lesson_id == lessons[0].id).values(topic="kept")
+    )
+    await session.commit()
+
+    await create_student(session, parent.id, groups[1].id, "Bob", "C", None, None, True)
+
+    items, _ = await list_parent_lessons(session, parent.id, limit=10, cursor=None)
+    assert {item["id"]: item["topic"] for item in items} == {lessons[0].id: "kept", lessons[1].id: "Intro"}
+
+
+@pytest.mark.asyncio
+async def test_parent_lessons_query_walks_starts_at_index(session):
+    parent = User(
+        email=f"scope-{uuid.uuid4().hex}@example.com",
+        password_hash=hash_password("password"),
+        user_type="parent",
+    )
+    groups = [Group(name=f"Scope {uuid.uuid4().hex[:6]}", schedule_json=[]) for _ in range(2)]
+    session.add_all([parent, *groups])
+    await session.flush()
+    for index, group in enumerate(groups):
+        session.add(Student(parent_user_id=parent.id, group_id=group.id, first_name=f"S{index}", last_name="P"))
+        session.add(Student(parent_user_id=parent.id, group_id=group.id, first_name=f"T{index}", last_name="P"))
+    await session.commit()
+
+    stmt = _lessons_query_for_user(parent).order_by(Lesson.starts_at.desc(), Lesson.id.desc()).limit(20)
+    sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    # Tiny test tables would otherwise favour a seq scan; the point is that a no-sort plan exists at all.
+    await session.execute(text("SET LOCAL enable_seqscan = off"))
+    await session.execute(text("SET LOCAL enable_sort = off"))
+    plan = "\n".join((await session.execute(text(f"EXPLAIN {sql}"))).scalars().all())
+    await session.rollback()
+
+    assert plan.lstrip().startswith("Limit")
+    assert "Index Scan Backward using ix_lessons_starts_at_id" in plan
+    assert "Sort" not in plan
+    assert "Unique" not in plan
+
+
+@pytest.mark.asyncio
+async def test_generate_lessons_advances_group_watermark(session):
+    weekday = date.today().isoweekday()
+    group = Group(
+        name=f"Gen {uuid.uuid4().hex[:6]}",
+        schedule_json=[{"weekday": weekday, "start_time": "09:00", "duration_minutes": 45}],
+    )
+    session.add(group)
+    await session.commit()
+
+    async def lesson_count():
+        result = await session.execute(select(Lesson.id).where(Lesson.group_id == group.id))
+        return len(result.all())
+
+    await generate_lessons(session, days=14)
+    await session.refresh(group)
+    first_count = await lesson_count()
+    first_watermark = group.lessons_generated_until
+    assert first_count >= 2
+    assert first_watermark is not None
+
+    await generate_lessons(session, days=14)
+    assert await lesson_count() == first_count
+
+    await generate_lessons(session, days=28)
+    await session.refresh(group)
+    assert await lesson_count() > first_count
+    assert group.lessons_generated_until > first_watermark
+
+    group.schedule_json = [{"weekday": weekday, "start_time": "11:00", "duration_minutes": 45}]
+    await session.commit()
+    before = await lesson_count()
+    await generate_lessons(session, days=28)
+    assert await lesson_count() > before
+
+
+@pytest.mark.asyncio
+async def test_generate_lessons_copy_method(session, client):
+    group = Group(
+        name=f"Copy {uuid.uuid4().hex[:6]}",
+        schedule_json=[{"weekday": weekday, "start_time": "08:00", "duration_minutes": 30} for weekday in range(1, 8)],
+    )
+    session.add(group)
+    await session.commit()
+
+    resp = await client.post("/admin/jobs/generate-lessons", params={"days": 6, "method": "copy"})
+    assert resp.status_code == 200
+    report = resp.json()
+    assert report["method"] == "copy"
+    assert report["created"] >= 7
+    assert report["rows_per_second"] > 0
+
+    result = await session.execute(select(Lesson.id).where(Lesson.group_id == group.id))
+    assert len(result.all()) == 7
+
+    bad = await client.post("/admin/jobs/generate-lessons", params={"method": "bogus"})
+    assert bad.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bulk_lesson_create_and_update(session, client):
+    group = Group(name=f"Bulk {uuid.uuid4().hex[:6]}", schedule_json=[])
+    session.add(group)
+    await session.commit()
+
+    starts_at = datetime(2031, 3, 1, 9, 0, tzinfo=timezone.utc)
+
+    def item(offset_hours: int, group_id=group.id) -> dict:
+        start = starts_at + timedelta(hours=offset_hours)
+        return {
+            "group_id": str(group_id),
+            "starts_at": start.isoformat(),
+            "ends_at": (start + timedelta(minutes=45)).isoformat(),
+        }
+
+    resp = await client.post(
+        "/lessons/bulk",
+        json={"items": [item(0), item(2), item(0), item(4, group_id=uuid.uuid4())]},
+    )
+    assert resp.status_code == 200
+    results = resp.json()["items"]
+    assert [result["status"] for result in results] == ["created", "created", "error", "error"]
+    assert results[2]["error"]["code"] == "LESSON_TIME_CONFLICT"
+    assert results[3]["error"]["code"] == "GROUP_NOT_FOUND"
+
+    first, second = results[0]["lesson"]["id"], results[1]["lesson"]["id"]
+    moved = starts_at + timedelta(days=1)
+    resp = await client.patch(
+        "/lessons/bulk",
+        json={
+            "items": [
+                {"id": first, "topic": "Moved", "starts_at": moved.isoformat(), "ends_at": (moved + timedelta(hours=1)).isoformat()},
+                {"id": second, "starts_at": moved.isoformat(), "ends_at": (moved + timedelta(hours=1)).isoformat()},
+                {"id": str(uuid.uuid4()), "topic": "Nope"},
+            ]
+        },
+    )
+    assert resp.status_code == 200
+    results = resp.json()["items"]
+    assert [result["status"] for result in results] == ["updated", "error", "error"]
+    assert results[0]["lesson"]["topic"] == "Moved"
+    assert results[1]["error"]["code"] == "LESSON_TIME_CONFLICT"
+    assert results[2]["error"]["code"] == "LESSON_NOT_FOUND"
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_reports_concurrent_slot_takers_and_deletes(session, monkeypatch):
+    group = Group(name=f"Bulk {uuid.uuid4().hex[:6]}", schedule_json=[])
+    session.add(group)
+    await session.flush()
+    starts_at = datetime(2031, 3, 5, 9, 0, tzinfo=timezone.utc)
+    lessons = [
+        Lesson(
+            group_id=group.id,
+            starts_at=starts_at + timedelta(hours=hour),
+            ends_at=starts_at + timedelta(hours=hour, minutes=45),
+        )
+        for hour in range(3)
+    ]
+    session.add_all(lessons)
+    await session.commit()
+    taken = starts_at + timedelta(days=1)
+
+    existing_group_ids = lesson_bulk._existing_group_ids
+
+    async def _between_lookups(session, group_ids):
+        # What concurrent requests could do after bulk_update_lessons read the lessons.
+        session.add(Lesson(group_id=group.id, starts_at=taken, ends_at=taken + timedelta(hours=1)))
+        await session.execute(delete(Lesson).where(Lesson.id == lessons[2].id))
+        return await existing_group_ids(session, group_ids)
+
+    async def _nothing_occupied(session, slots):
+        return {}
+
+    monkeypatch.setattr(lesson_bulk, "_existing_group_ids", _between_lookups)
+    monkeypatch.setattr(lesson_bulk, "_occupied_slots", _nothing_occupied)
+    results = await lesson_bulk.bulk_update_lessons(
+        session,
+        [
+            {"id": lessons[0].id, "starts_at": taken, "ends_at": taken + timedelta(hours=1)},
+            {"id": lessons[1].id, "topic": "Kept"},
+            {"id": lessons[2].id, "topic": "Gone"},
+        ],
+    )
+
+    assert [result["status"] for result in results] == ["error", "updated", "error"]
+    assert results[0]["error"]["code"] == "LESSON_TIME_CONFLICT"
+    assert results[1]["lesson"]["topic"] == "Kept"
+    assert results[2]["error"]["code"] == "LESSON_NOT_FOUND"
+
+
+@pytest.mark.asyncio
+async def test_will_go_batch(session, client):
+    parent = User(
+        email=f"rsvp-{uuid.uuid4().hex}@example.com",
+        password_hash=hash_password("password"),
+        user_type="parent",
+    )
+    group = Group(name=f"RSVP {uuid.uuid4().hex[:6]}", schedule_json=[])
+    session.add_all([parent, group])
+    await session.flush()
+    student = Student(parent_user_id=parent.id, group_id=group.id, first_name="R", last_name="S")
+    session.add(student)
+    starts_at = datetime(2031, 4, 1, 9, 0, tzinfo=timezone.utc)
+    lessons = [
+        Lesson(group_id=group.id, starts_at=starts_at + timedelta(days=7 * week), ends_at=starts_at + timedelta(days=7 * week, hours=1))
+        for week in range(4)
+    ]
+    session.add_all(lessons)
+    await session.commit()
+
+    params = {"user_id": str(parent.id)}
+    items = [
+        {"lesson_id": str(lesson.id), "student_id": str(student.id), "will_go": index % 2 == 0}
+        for index, lesson in enumerate(lessons)
+    ]
+    resp = await client.post("/lessons/will-go/batch", json={"items": items}, params=params)
+    assert resp.status_code == 200
+    assert len(resp.json()["items"]) == 4
+
+    parts = (
+        await session.execute(select(LessonParticipation).where(LessonParticipation.student_id == student.id))
+    ).scalars().all()
+    assert {part.lesson_id: part.will_go for part in parts} == {
+        lesson.id: index % 2 == 0 for index, lesson in enumerate(lessons)
+    }
+
+    stranger = {"lesson_id": str(lessons[0].id), "student_id": str(uuid.uuid4()), "will_go": True}
+    resp = await client.post("/lessons/will-go/batch", json={"items": [stranger]}, params=params)
+    assert resp.status_code == 403
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from app.core import listener as listener_module
+from app.core.listener import PgListener
+
+
+class _SlowConnection:
+    """Connection double whose first LISTEN blocks until released."""
+
+    def __init__(self) -> None:
+        self.channels: list[str] = []
+        self.subscribing = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def add_listener(self, channel, callback) -> None:
+        if not self.channels:
+            self.subscribing.set()
+            await self.release.wait()
+        self.channels.append(channel)
+
+    def add_termination_listener(self, callback) -> None:
+        pass
+
+    async def fetchval(self, query):
+        return 1
+
+    def is_closed(self) -> bool:
+        return False
+
+    async def close(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_channel_added_while_connecting_is_listened(monkeypatch):
+    conn = _SlowConnection()
+
+    async def connect(_dsn):
+        return conn
+
+    monkeypatch.setattr(listener_module.asyncpg, "connect", connect)
+    listener = PgListener()
+    try:
+        await listener.add("first", lambda payload: None)
+        await asyncio.wait_for(conn.subscribing.wait(), timeout=1)
+
+        second = asyncio.create_task(listener.add("second", lambda payload: None))
+        await asyncio.sleep(0)
+        conn.release.set()
+        await asyncio.wait_for(second, timeout=1)
+
+        await asyncio.wait_for(listener.connected.wait(), timeout=1)
+        assert sorted(conn.channels) == ["first", "second"]
+    finally:
+        await listener.close()
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.listener import PgListener
+from app.core.security import hash_password
+from app.core.settings import settings
+from app.models.user import User
+from app.services.notification_stream import RESYNC, NotificationBroker, stream_notifications
+from app.services.notifications import create_notifications
+
+
+@pytest.mark.asyncio
+async def test_broker_delivers_inserted_notifications(session, database_url, monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_URL", database_url)
+    user = User(
+        email=f"stream-{uuid.uuid4().hex}@example.com",
+        password_hash=hash_password("password"),
+        user_type="parent",
+    )
+    other = User(
+        email=f"stream-{uuid.uuid4().hex}@example.com",
+        password_hash=hash_password("password"),
+        user_type="parent",
+    )
+    session.add_all([user, other])
+    await session.commit()
+
+    listener = PgListener()
+    broker = NotificationBroker(listener)
+    try:
+        first = await broker.subscribe(user.id)
+        second = await broker.subscribe(user.id)
+        await asyncio.wait_for(listener.connected.wait(), timeout=5)
+
+        row = {"type": "announcement", "title": "Hi", "body": "News", "dedup_key": None}
+        await create_notifications(session, [{**row, "user_id": other.id}])
+        ids = await create_notifications(session, [{**row, "user_id": user.id}])
+        await session.commit()
+
+        assert await asyncio.wait_for(first.get(), timeout=5) == ids[0]
+        assert await asyncio.wait_for(second.get(), timeout=5) == ids[0]
+        assert first.empty()
+        assert broker.stats()["subscribers"] == 2
+    finally:
+        await listener.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_replays_after_last_event_id_and_after_a_listener_reconnect(session, database_url, monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_URL", database_url)
+    user = User(
+        email=f"stream-{uuid.uuid4().hex}@example.com",
+        password_hash=hash_password("password"),
+        user_type="parent",
+    )
+    session.add(user)
+    await session.commit()
+    row = {"type": "announcement", "title": "Hi", "body": "News", "dedup_key": None, "user_id": user.id}
+    seen = await create_notifications(session, [row])
+    await session.commit()
+    missed = await create_notifications(session, [row])
+    await session.commit()
+
+    session_factory = async_sessionmaker(session.bind, expire_on_commit=False)
+    broker = NotificationBroker(PgListener())
+    stream = stream_notifications(session_factory, user.id, seen[0], broker=broker)
+    try:
+        assert (await stream.__anext__()).startswith("retry:")
+        assert (await asyncio.wait_for(stream.__anext__(), timeout=5)).startswith(f"id: {missed[0]}\n")
+
+        # Created while the listener was down: nothing announces it, the reconnect callback must resync.
+        later = await create_notifications(session, [row])
+        await session.commit()
+        broker._on_notify(None)
+        assert (await asyncio.wait_for(stream.__anext__(), timeout=5)).startswith(f"id: {later[0]}\n")
+
+        # Its NOTIFY arriving after the replay is not sent twice.
+        broker._on_notify(json.dumps({"id": str(later[0]), "user_id": str(user.id)}))
+        newest = await create_notifications(session, [row])
+        await session.commit()
+        broker._on_notify(json.dumps({"id": str(newest[0]), "user_id": str(user.id)}))
+        assert (await asyncio.wait_for(stream.__anext__(), timeout=5)).startswith(f"id: {newest[0]}\n")
+    finally:
+        await stream.aclose()
+        await broker.listener.close()
+
+
+@pytest.mark.asyncio
+async def test_reconnect_and_overflow_queue_a_resync(monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFICATION_STREAM_QUEUE_SIZE", 2)
+    listener = PgListener()
+    broker = NotificationBroker(listener)
+    user_id = uuid.uuid4()
+    try:
+        queue = await broker.subscribe(user_id)
+        for _ in range(3):
+            broker._on_notify(json.dumps({"id": str(uuid.uuid4()), "user_id": str(user_id)}))
+        assert queue.qsize() == 1 and queue.get_nowait() is RESYNC
+        assert broker.stats()["dropped"] == 1
+
+        broker._on_notify(None)
+        assert queue.get_nowait() is RESYNC
+    finally:
+        await listener.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_subscribes_only_while_the_body_runs():
+    listener = PgListener()
+    broker = NotificationBroker(listener)
+    try:
+        stream = stream_notifications(None, uuid.uuid4(), broker=broker)
+        assert broker.stats()["subscribers"] == 0
+
+        assert (await stream.__anext__()).startswith("retry:")
+        assert broker.stats()["subscribers"] == 1
+
+        await stream.aclose()
+        assert broker.stats()["subscribers"] == 0
+    finally:
+        await listener.close()
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta, timezone
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.core.security import hash_password
+from app.models.group import Group
+from app.models.lesson import Lesson
+from app.models.notification import Notification
+from app.models.student import Student
+from app.models.user import User
+from app.services.notifications import create_notifications, enqueue_lesson_reminders
+
+
+async def _parent_with_lesson_tomorrow(session, children: int = 1):
+    parent = User(
+        email=f"remind-{uuid.uuid4().hex}@example.com",
+        password_hash=hash_password("password"),
+        user_type="parent",
+    )
+    session.add(parent)
+    group = Group(name=f"Remind {uuid.uuid4().hex[:6]}", schedule_json=[])
+    session.add(group)
+    await session.flush()
+
+    for index in range(children):
+        session.add(Student(parent_user_id=parent.id, group_id=group.id, first_name=f"C{index}", last_name="D"))
+
+    starts_at = datetime.now(timezone.utc) + timedelta(hours=24)
+    lesson = Lesson(group_id=group.id, starts_at=starts_at, ends_at=starts_at + timedelta(hours=1))
+    session.add(lesson)
+    await session.commit()
+    return parent, lesson
+
+
+@pytest.mark.asyncio
+async def test_enqueue_lesson_reminders_is_idempotent(session):
+    parent, lesson = await _parent_with_lesson_tomorrow(session, children=2)
+
+    created = await enqueue_lesson_reminders(session)
+    assert created >= 1
+    assert await enqueue_lesson_reminders(session) == 0
+
+    reminders = (
+        await session.execute(select(Notification).where(Notification.user_id == parent.id))
+    ).scalars().all()
+    assert len(reminders) == 1
+    assert reminders[0].type == "lesson_reminder"
+    assert reminders[0].status == "queued"
+    assert reminders[0].payload == {"lesson_id": str(lesson.id), "group_id": str(lesson.group_id)}
+    assert reminders[0].dedup_key == str(lesson.id)
+
+
+@pytest.mark.asyncio
+async def test_create_notifications_skips_existing_dedup_keys(session):
+    parent, _ = await _parent_with_lesson_tomorrow(session)
+    row = {"user_id": parent.id, "type": "announcement", "title": "Hi", "body": "News", "dedup_key": "news-1"}
+
+    first = await create_notifications(session, [row, {**row, "dedup_key": None}])
+    second = await create_notifications(session, [row, {**row, "dedup_key": None}])
+    await session.commit()
+
+    assert len(first) == 2
+    assert len(second) == 1
+
+
+@pytest.mark.asyncio
+async def test_unread_counter_follows_reads(session, client):
+    parent, _ = await _parent_with_lesson_tomorrow(session)
+    await enqueue_lesson_reminders(session)
+    await create_notifications(
+        session,
+        [{"user_id": parent.id, "type": "announcement", "title": "Hi", "body": "News", "dedup_key": None}],
+    )
+    await session.commit()
+
+    params = {"user_id": str(parent.id)}
+    resp = await client.get("/notifications/unread-count", params=params)
+    assert resp.json() == {"unread": 2}
+
+    reminder = (
+        await session.execute(
+            select(Notification).where(Notification.user_id == parent.id, Notification.type == "lesson_reminder")
+        )
+    ).scalar_one()
+    for _ in range(2):
+        resp = await client.post(f"/notifications/{reminder.id}/read", params=params)
+        assert resp.status_code == 200
+    assert (await client.get("/notifications/unread-count", params=params)).json() == {"unread": 1}
+
+    resp = await client.post("/notifications/read-all", params=params)
+    assert resp.json() == {"marked": 1, "unread": 0}
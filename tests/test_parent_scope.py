@@ -0,0 +1,102 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import uuid
+
+import pytest
+from sqlalchemy import update
+
+from app.core.errors import Forbidden
+from app.core.listener import PgListener
+from app.core.security import hash_password
+from app.core.settings import settings
+from app.models.group import Group
+from app.models.lesson import Lesson
+from app.models.student import Student
+from app.models.user import User
+from app.services.lessons import upsert_will_go, upsert_will_go_batch
+from app.services.parent_scope import ParentMembershipCache, parent_memberships
+from app.services.students import create_student
+
+
+async def _parent_with_groups(session, count: int):
+    parent = User(
+        email=f"members-{uuid.uuid4().hex}@example.com",
+        password_hash=hash_password("password"),
+        user_type="parent",
+    )
+    groups = [Group(name=f"Members {uuid.uuid4().hex[:6]}", schedule_json=[]) for _ in range(count)]
+    session.add_all([parent, *groups])
+    await session.commit()
+    return parent, groups
+
+
+@pytest.mark.asyncio
+async def test_membership_cache_is_invalidated_by_student_changes(session, database_url, monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_URL", database_url)
+    parent, groups = await _parent_with_groups(session, 2)
+    student = Student(parent_user_id=parent.id, group_id=groups[0].id, first_name="A", last_name="B")
+    session.add(student)
+    await session.commit()
+
+    listener = PgListener()
+    memberships = ParentMembershipCache(listener, max_entries=10, ttl_seconds=60)
+    try:
+        await memberships.get(session, parent.id)
+        await asyncio.wait_for(listener.connected.wait(), timeout=5)
+        membership = await memberships.get(session, parent.id)
+        assert membership.students == {student.id: groups[0].id}
+        assert await memberships.get(session, parent.id) is membership
+
+        student.group_id = groups[1].id
+        await session.commit()
+
+        async def _invalidated():
+            while memberships.stats()["entries"]:
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(_invalidated(), timeout=5)
+        assert (await memberships.get(session, parent.id)).group_ids == {groups[1].id}
+    finally:
+        await listener.close()
+
+
+@pytest.mark.asyncio
+async def test_create_student_invalidates_local_membership(session):
+    parent, groups = await _parent_with_groups(session, 1)
+    assert (await parent_memberships.get(session, parent.id)).group_ids == frozenset()
+
+    student = await create_student(session, parent.id, groups[0].id, "Ann", "B", None, None, True)
+
+    membership = await parent_memberships.get(session, parent.id)
+    assert membership.students == {student.id: groups[0].id}
+    with pytest.raises(TypeError):
+        membership.students[student.id] = None
+
+
+@pytest.mark.asyncio
+async def test_will_go_rechecks_ownership_behind_a_stale_membership(session):
+    parent, groups = await _parent_with_groups(session, 1)
+    other, _ = await _parent_with_groups(session, 0)
+    starts_at = datetime.now(timezone.utc) + timedelta(days=1)
+    lesson = Lesson(group_id=groups[0].id, starts_at=starts_at, ends_at=starts_at + timedelta(hours=1))
+    session.add(lesson)
+    await session.commit()
+    assert (await parent_memberships.get(session, parent.id)).students == {}
+
+    # Added without create_student, so this process's cached entry is not dropped.
+    student = Student(parent_user_id=parent.id, group_id=groups[0].id, first_name="A", last_name="B")
+    session.add(student)
+    await session.commit()
+    participation = await upsert_will_go(session, parent.id, lesson.id, student.id, True)
+    assert participation.will_go is True
+
+    # Moved to another parent behind this process's back: the write must not trust the cached entry.
+    assert student.id in (await parent_memberships.get(session, parent.id)).students
+    await session.execute(update(Student).where(Student.id == student.id).values(parent_user_id=other.id))
+    await session.commit()
+    with pytest.raises(Forbidden):
+        await upsert_will_go(session, parent.id, lesson.id, student.id, False)
+    with pytest.raises(Forbidden):
+        await upsert_will_go_batch(
+            session, parent.id, [{"lesson_id": lesson.id, "student_id": student.id, "will_go": False}]
+        )
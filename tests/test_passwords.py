@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import uuid
+
+from passlib.hash import pbkdf2_sha256
+import pytest
+
+from app.core.errors import ServiceUnavailable
+from app.core.passwords import PasswordHasher
+from app.core.security import PASSWORD_PROFILES, build_password_context
+from app.core.settings import settings
+from app.models.user import User
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_run_off_the_event_loop():
+    hasher = PasswordHasher(workers=2, queue_size=2)
+    try:
+        password_hash = await hasher.hash("secret")
+        assert await hasher.verify("secret", password_hash)
+        assert not await hasher.verify("wrong", password_hash)
+        await asyncio.sleep(0)
+        assert hasher.stats()["completed"] == 3
+        assert hasher.stats()["in_flight"] == 0
+    finally:
+        hasher.close()
+
+
+@pytest.mark.asyncio
+async def test_saturated_hasher_rejects_with_503():
+    hasher = PasswordHasher(workers=1, queue_size=1)
+    release = threading.Event()
+    try:
+        running = [asyncio.create_task(hasher.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(ServiceUnavailable) as exc_info:
+            await hasher.run(release.wait)
+        assert exc_info.value.status_code == 503
+        stats = hasher.stats()
+        assert stats["in_flight"] == 2
+        assert stats["queued"] == 1
+        assert stats["rejected"] == 1
+
+        release.set()
+        assert await asyncio.gather(*running) == [True, True]
+        await asyncio.sleep(0)
+        assert hasher.stats()["in_flight"] == 0
+        assert await hasher.run(release.wait) is True
+    finally:
+        release.set()
+        hasher.close()
+
+
+@pytest.mark.asyncio
+async def test_verify_and_update_only_rehashes_outdated_hashes():
+    hasher = PasswordHasher(workers=1, queue_size=0)
+    try:
+        current = await hasher.hash("secret")
+        assert await hasher.verify_and_update("secret", current) == (True, None)
+
+        other_profile = build_password_context("balanced").hash("secret")
+        valid, new_hash = await hasher.verify_and_update("secret", other_profile)
+        assert valid
+        rounds = PASSWORD_PROFILES[settings.PASSWORD_PROFILE]
+        assert new_hash is not None and new_hash.startswith(f"$pbkdf2-sha256${rounds}$")
+
+        assert await hasher.verify_and_update("wrong", other_profile) == (False, None)
+    finally:
+        hasher.close()
+
+
+@pytest.mark.asyncio
+async def test_login_upgrades_password_hash(session, client):
+    email = f"rehash-{uuid.uuid4().hex}@example.com"
+    old_hash = pbkdf2_sha256.using(rounds=1000).hash("password")
+    user = User(email=email, password_hash=old_hash, user_type="parent")
+    session.add(user)
+    await session.commit()
+
+    resp = await client.post("/auth/login", json={"email": email, "password": "password"})
+    assert resp.status_code == 200
+    await session.refresh(user)
+    assert user.password_hash != old_hash
+    upgraded = user.password_hash
+
+    resp = await client.post("/auth/login", json={"email": email, "password": "password"})
+    assert resp.status_code == 200
+    await session.refresh(user)
+    assert user.password_hash == upgraded
@@ -0,0 +1,57 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import update
+
+from app.core.listener import PgListener
+from app.core.security import hash_password
+from app.core.settings import settings
+from app.models.user import User
+from app.services.user_identity import UserIdentityCache
+
+
+async def _wait_for(predicate, timeout: float = 5) -> None:
+    async def _poll():
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(_poll(), timeout=timeout)
+
+
+@pytest.mark.asyncio
+async def test_identity_cache_is_invalidated_by_user_updates(session, database_url, monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_URL", database_url)
+    user = User(
+        email=f"identity-{uuid.uuid4().hex}@example.com",
+        password_hash=hash_password("password"),
+        user_type="parent",
+        timezone="Europe/Vienna",
+    )
+    session.add(user)
+    await session.commit()
+
+    listener = PgListener()
+    identities = UserIdentityCache(listener, max_entries=10, ttl_seconds=60)
+    try:
+        first = await identities.get(session, user.id)
+        await asyncio.wait_for(listener.connected.wait(), timeout=5)
+        # Connecting clears the cache, so load again once the listener is up.
+        first = await identities.get(session, user.id)
+        assert first.user_type == "parent"
+        assert await identities.get(session, user.id) is first
+        assert identities.stats()["hits"] == 1
+
+        await session.execute(update(User).where(User.id == user.id).values(updated_at=user.updated_at))
+        await session.commit()
+        await asyncio.sleep(0.2)
+        assert identities.stats()["entries"] == 1
+
+        await session.execute(update(User).where(User.id == user.id).values(timezone="UTC"))
+        await session.commit()
+        await _wait_for(lambda: identities.stats()["entries"] == 0)
+
+        assert (await identities.get(session, user.id)).timezone == "UTC"
+        assert await identities.get(session, uuid.uuid4()) is None
+    finally:
+        await listener.close()